@@ -1,19 +1,27 @@
+import os
+import sys
 from mcp.server.fastmcp import FastMCP
+# Modules shared by every app live in ../common
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common.instrumentation import ToolStats
+from common.session_store import SessionStore
 
 # Create FastMCP server instance with a friendly name
 mcp = FastMCP("Interactive Chat Server")
+stats = ToolStats(mcp)
 
-# Simple in-memory conversation history (per server instance)
-conversation_history = []
+# Bounded in-memory conversation history per session (see common/session_store.py)
+sessions = SessionStore.from_env()
 
 @mcp.tool()
-def chat(message: str) -> str:
+@stats.instrument
+def chat(message: str, session_id: str = "") -> str:
     """
     A simple chat tool that echoes user messages and keeps conversation history.
     """
-    conversation_history.append(f"User: {message}")
-    response = f"Echo ({len(conversation_history)}): {message}"
-    conversation_history.append(f"Assistant: {response}")
+    count = sessions.append(session_id, f"User: {message}")
+    response = f"Echo ({count}): {message}"
+    sessions.append(session_id, f"Assistant: {response}")
     return response
 
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+"""
+Micro-benchmark: the old chat command parsing (one `re.match` per arithmetic
+command, then the weather pattern) against the single-alternation
+`IntentRouter.match`, in messages per second over a generated mix of
+commands and free text.
+
+    python bench_intents.py --messages 20000
+"""
+
+import argparse
+import random
+import re
+import timeit
+
+from intents import ARITHMETIC_COMMANDS, command_router
+
+TEXT = ["hello there", "how are you?", "tell me a joke", "what's new", "thanks, bye"]
+CITIES = ["Paris", "New York", "Lagos", "Tokyo"]
+
+
+def corpus(size, seed=0):
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(size):
+        kind = rng.random()
+        if kind < 0.4:
+            messages.append(f"{rng.choice(ARITHMETIC_COMMANDS)} {rng.randint(0, 999)} and {rng.randint(0, 999)}")
+        elif kind < 0.6:
+            messages.append(f"weather in {rng.choice(CITIES)}")
+        else:
+            messages.append(rng.choice(TEXT))
+    return messages
+
+
+def old_parse(message):
+    for cmd in ARITHMETIC_COMMANDS:
+        m = re.match(rf"{cmd} (\d+) and (\d+)", message.lower())
+        if m:
+            return cmd, m.groups()
+    m = re.match(r"weather in ([a-zA-Z\s]+)", message.lower())
+    if m:
+        return "weather", m.groups()
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="per-command regexes vs one intent router")
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    messages = corpus(args.messages)
+    router = command_router()
+    for label, parse in [("re.match per command", old_parse), ("IntentRouter.match", router.match)]:
+        seconds = min(timeit.repeat(lambda: [parse(m) for m in messages], number=1, repeat=5))
+        print(f"{label:<24}{len(messages) / seconds:>14,.0f} messages/s")
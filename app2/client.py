@@ -1,17 +1,47 @@
 import asyncio
-import re
+from intents import ARITHMETIC_COMMANDS, command_router
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+import mcp.types as types
 
-async def display_tool_result(result):
+def progress_printer():
+    """
+    Progress callback for `call_tool` that prints each partial chunk a tool
+    reports as soon as it arrives; `chunks` keeps what was shown.
+    """
+    chunks = []
+
+    async def on_progress(progress, total, message):
+        if not message:
+            return
+        if not chunks:
+            print("\n--- Human-readable output ---")
+        chunks.append(message)
+        print(message, flush=True)
+
+    on_progress.chunks = chunks
+    return on_progress
+
+async def display_tool_result(result, streamed=()):
+    # Text already printed from progress notifications is not repeated
     if isinstance(result, tuple) and len(result) == 2:
         content_blocks, structured_data = result
-        print("\n--- Human-readable output ---")
-        for block in content_blocks:
-            if hasattr(block, "text"):
-                print(block.text)
+        if not streamed:
+            print("\n--- Human-readable output ---")
+            for block in content_blocks:
+                if hasattr(block, "text"):
+                    print(block.text)
         print("\n--- Structured data ---")
         print(structured_data)
+    elif isinstance(result, types.CallToolResult):
+        if not streamed:
+            print("\n--- Human-readable output ---")
+            for block in result.content:
+                if hasattr(block, "text"):
+                    print(block.text)
+        if result.structuredContent is not None:
+            print("\n--- Structured data ---")
+            print(result.structuredContent)
     else:
         print("Result:", result)
 
@@ -19,6 +49,22 @@ async def chat_loop(session: ClientSession):
     print("Chat session started. Type 'exit' or 'quit' to end.")
     session_id = "user-session-1"  # simple static session id for demo
 
+    # Client-side parsing for some commands to call dedicated tools
+    on_progress = None
+
+    def call(name, arguments):
+        return session.call_tool(name, arguments, progress_callback=on_progress)
+
+    router = command_router()
+    for command in ARITHMETIC_COMMANDS:
+        router.bind(command, lambda a, b, command=command: call(command, {"a": int(a), "b": int(b)}))
+    router.bind("weather", lambda location: call("weather", {"location": location.strip()}))
+    router.register("count", r"count to (?P<to>\d+)", lambda to: call("stream_count", {"to": int(to)}))
+
+    def send_to_chat(message):
+        # Fallback: send to chat tool with session_id for context
+        return call("chat", {"message": message, "session_id": session_id})
+
     while True:
         user_input = input("\nYou: ").strip()
         if user_input.lower() in ("exit", "quit"):
@@ -27,27 +73,9 @@ async def chat_loop(session: ClientSession):
         if not user_input:
             continue
 
-        # Client-side parsing for some commands to call dedicated tools
-        # Arithmetic commands
-        for cmd in ["add", "subtract", "multiply", "divide"]:
-            pattern = rf"{cmd} (\d+) and (\d+)"
-            match = re.match(pattern, user_input.lower())
-            if match:
-                a, b = int(match.group(1)), int(match.group(2))
-                result = await session.call_tool(cmd, {"a": a, "b": b})
-                await display_tool_result(result)
-                break
-        else:
-            # Weather command
-            match_weather = re.match(r"weather in ([a-zA-Z\s]+)", user_input.lower())
-            if match_weather:
-                location = match_weather.group(1).strip()
-                result = await session.call_tool("weather", {"location": location})
-                await display_tool_result(result)
-            else:
-                # Fallback: send to chat tool with session_id for context
-                response = await session.call_tool("chat", {"message": user_input, "session_id": session_id})
-                await display_tool_result(response)
+        on_progress = progress_printer()
+        result = await router.dispatch(user_input, default=send_to_chat)
+        await display_tool_result(result, on_progress.chunks)
 
 async def main():
     server_params = StdioServerParameters(
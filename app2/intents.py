@@ -0,0 +1,97 @@
+"""
+Command intents shared by the chat tool (server.py) and the chat loop (client.py).
+
+Every registered pattern is compiled into one regex alternation, with one
+named group per intent, so a message is matched against all intents in a
+single pass and `lastgroup` says which one fired. Patterns are tried in
+registration order and matched at the start of the lower-cased message.
+
+    router = command_router()                     # add/subtract/multiply/divide/weather
+    router.bind("weather", lambda location: ...)  # attach a handler
+    router.register("greet", r"(?:hi|hello)\\b", lambda: "Hello!")  # new intent
+    result = await router.dispatch("add 2 and 3", default=echo)
+"""
+
+import inspect
+import re
+
+ARITHMETIC_COMMANDS = ("add", "subtract", "multiply", "divide")
+
+_GROUP = re.compile(r"\(\?P<(\w+)>")
+
+
+class IntentMatch:
+    def __init__(self, name, args, handler):
+        self.name = name
+        self.args = args
+        self.handler = handler
+
+    def __repr__(self):
+        return f"IntentMatch({self.name!r}, {self.args!r})"
+
+
+class IntentRouter:
+    def __init__(self, flags=0):
+        self.flags = flags
+        self._intents = {}  # name -> [pattern, handler]
+        self._regex = None
+
+    def register(self, name, pattern, handler=None):
+        """Add an intent; `pattern` may capture arguments with named groups."""
+        if not name.isidentifier() or "__" in name:
+            raise ValueError(f"Invalid intent name: {name!r}")
+        self._intents[name] = [pattern, handler]
+        self._regex = None
+
+    def bind(self, name, handler):
+        self._intents[name][1] = handler
+
+    def on(self, name, pattern):
+        """Decorator form of `register`."""
+        def decorator(handler):
+            self.register(name, pattern, handler)
+            return handler
+        return decorator
+
+    def _compile(self):
+        alternatives = []
+        for name, (pattern, _) in self._intents.items():
+            # prefix argument groups with the intent name so they stay unique
+            pattern = _GROUP.sub(lambda group: f"(?P<{name}__{group.group(1)}>", pattern)
+            alternatives.append(f"(?P<{name}>{pattern})")
+        self._regex = re.compile("|".join(alternatives), self.flags)
+        return self._regex
+
+    def match(self, message):
+        regex = self._regex or self._compile()
+        found = regex.match(message.lower())
+        if found is None:
+            return None
+        name = found.lastgroup  # the intent's group encloses its arguments, so it closes last
+        prefix = f"{name}__"
+        args = {key[len(prefix):]: value for key, value in found.groupdict().items()
+                if key.startswith(prefix) and value is not None}
+        return IntentMatch(name, args, self._intents[name][1])
+
+    async def dispatch(self, message, default=None):
+        """
+        Run the handler of the first intent matching `message` with its captured
+        arguments (awaiting it if needed); otherwise `default(message)`.
+        """
+        found = self.match(message)
+        if found is None or found.handler is None:
+            result = default(message) if default is not None else None
+        else:
+            result = found.handler(**found.args)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+
+def command_router():
+    """The commands both sides understand: 'add 2 and 3', 'weather in Paris', ..."""
+    router = IntentRouter()
+    for command in ARITHMETIC_COMMANDS:
+        router.register(command, rf"{command} (?P<a>\d+) and (?P<b>\d+)")
+    router.register("weather", r"weather in (?P<location>[a-zA-Z\s]+)")
+    return router
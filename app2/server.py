@@ -1,50 +1,61 @@
-from fastmcp import FastMCP
+import os
+import sys
+from fastmcp import FastMCP, Context
+# Modules shared by every app live in ../common
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common.instrumentation import ToolStats
+from common.session_store import SessionStore
+from intents import ARITHMETIC_COMMANDS, command_router
 import mcp.types as types
-import re
 import asyncio
-from typing import List
+import operator
 
 mcp = FastMCP("Enhanced MCP Server")
+stats = ToolStats(mcp)
 
-# In-memory session storage for chat history keyed by session id
-session_histories = {}
+# Bounded chat history keyed by session id (see common/session_store.py for the limits)
+sessions = SessionStore.from_env()
 
-# Helper: get or create chat history list for session
-def get_history(session_id: str) -> List[str]:
-    return session_histories.setdefault(session_id, [])
+# Arithmetic shared by the tools and the chat command handlers
+OPERATIONS = {
+    "add": ("+", operator.add),
+    "subtract": ("-", operator.sub),
+    "multiply": ("*", operator.mul),
+    "divide": ("/", operator.truediv),
+}
+
+def arithmetic(op: str, a: int, b: int) -> tuple[list[types.Content], dict]:
+    if op == "divide" and b == 0:
+        content = [types.TextContent(type="text", text="Error: Division by zero.")]
+        structured = {"error": "division_by_zero"}
+        return content, structured
+    symbol, func = OPERATIONS[op]
+    result = func(a, b)
+    text = f"{a} {symbol} {b} = {result:.4f}" if op == "divide" else f"{a} {symbol} {b} = {result}"
+    content = [types.TextContent(type="text", text=text)]
+    structured = {"a": a, "b": b, "result": result}
+    return content, structured
 
 # Tools for arithmetic operations
 @mcp.tool()
+@stats.instrument
 def add(a: int, b: int) -> tuple[list[types.Content], dict]:
-    result = a + b
-    content = [types.TextContent(type="text", text=f"{a} + {b} = {result}")]
-    structured = {"a": a, "b": b, "result": result}
-    return content, structured
+    return arithmetic("add", a, b)
 
 @mcp.tool()
+@stats.instrument
 def subtract(a: int, b: int) -> tuple[list[types.Content], dict]:
-    result = a - b
-    content = [types.TextContent(type="text", text=f"{a} - {b} = {result}")]
-    structured = {"a": a, "b": b, "result": result}
-    return content, structured
+    return arithmetic("subtract", a, b)
 
 @mcp.tool()
+@stats.instrument
 def multiply(a: int, b: int) -> tuple[list[types.Content], dict]:
-    result = a * b
-    content = [types.TextContent(type="text", text=f"{a} * {b} = {result}")]
-    structured = {"a": a, "b": b, "result": result}
-    return content, structured
+    return arithmetic("multiply", a, b)
 
 @mcp.tool()
+@stats.instrument
 def divide(a: int, b: int) -> tuple[list[types.Content], dict]:
-    if b == 0:
-        content = [types.TextContent(type="text", text="Error: Division by zero.")]
-        structured = {"error": "division_by_zero"}
-        return content, structured
-    result = a / b
-    content = [types.TextContent(type="text", text=f"{a} / {b} = {result:.4f}")]
-    structured = {"a": a, "b": b, "result": result}
-    return content, structured
+    return arithmetic("divide", a, b)
 
 # Simulated external API call (async)
 async def fetch_weather(location: str) -> str:
@@ -52,55 +63,58 @@ async def fetch_weather(location: str) -> str:
     await asyncio.sleep(1)
     return f"The weather in {location} is sunny, 25°C."
 
+# Long-running tools report each chunk as an MCP progress notification as soon
+# as it is produced, so clients can show it before the final result arrives
 @mcp.tool()
-async def weather(location: str) -> tuple[list[types.Content], dict]:
+@stats.instrument
+async def weather(location: str, ctx: Context) -> tuple[list[types.Content], dict]:
+    await ctx.report_progress(1, 2, f"Fetching the weather for {location}...")
     report = await fetch_weather(location)
+    await ctx.report_progress(2, 2, report)
     content = [types.TextContent(type="text", text=report)]
     structured = {"location": location, "report": report}
     return content, structured
 
 # Async streaming example (simulate streaming chunks)
 @mcp.tool()
-async def stream_count(to: int) -> tuple[list[types.Content], dict]:
+@stats.instrument
+async def stream_count(to: int, ctx: Context) -> tuple[list[types.Content], dict]:
     content = []
     for i in range(1, to + 1):
-        content.append(types.TextContent(type="text", text=f"Count: {i}"))
-        await asyncio.sleep(0.2)  # simulate streaming delay
+        chunk = f"Count: {i}"
+        content.append(types.TextContent(type="text", text=chunk))
+        await ctx.report_progress(i, to, chunk)
+        if i < to:
+            await asyncio.sleep(0.2)  # simulate streaming delay
     structured = {"counted_to": to}
     return content, structured
 
-# Chat tool with session context and fallback command parsing
-@mcp.tool()
-async def chat(message: str, session_id: str = "") -> tuple[list[types.Content], dict]:
-    history = get_history(session_id)
-    history.append(f"User: {message}")
-
-    # Parse commands client might miss
-    # Arithmetic commands
-    for cmd, func in [("add", add), ("subtract", subtract), ("multiply", multiply), ("divide", divide)]:
-        match = re.match(rf"{cmd} (\d+) and (\d+)", message.lower())
-        if match:
-            a, b = int(match.group(1)), int(match.group(2))
-            # Call the corresponding tool function directly
-            content, structured = func(a, b)
-            history.append(f"Assistant: {content[0].text}")
-            return content, structured
-
-    # Weather command
-    match_weather = re.match(r"weather in ([a-zA-Z\s]+)", message.lower())
-    if match_weather:
-        location = match_weather.group(1).strip()
-        report = await fetch_weather(location)
-        content = [types.TextContent(type="text", text=report)]
-        structured = {"location": location, "report": report}
-        history.append(f"Assistant: {report}")
-        return content, structured
+async def weather_reply(location: str) -> tuple[list[types.Content], dict]:
+    location = location.strip()
+    report = await fetch_weather(location)
+    content = [types.TextContent(type="text", text=report)]
+    structured = {"location": location, "report": report}
+    return content, structured
 
-    # Default echo
+def echo_reply(message: str) -> tuple[list[types.Content], dict]:
     response = f"Echo: {message}"
     content = [types.TextContent(type="text", text=response)]
     structured = {"message": message}
-    history.append(f"Assistant: {response}")
+    return content, structured
+
+# Commands the chat tool understands, matched in one pass; register more on `router`
+router = command_router()
+for command in ARITHMETIC_COMMANDS:
+    router.bind(command, lambda a, b, command=command: arithmetic(command, int(a), int(b)))
+router.bind("weather", weather_reply)
+
+# Chat tool with session context and fallback command parsing
+@mcp.tool()
+@stats.instrument
+async def chat(message: str, session_id: str = "") -> tuple[list[types.Content], dict]:
+    # Parse commands client might miss, else echo
+    content, structured = await router.dispatch(message, default=echo_reply)
+    sessions.append(session_id, f"User: {message}", f"Assistant: {content[0].text}")
     return content, structured
 
 if __name__ == "__main__":
@@ -1,8 +1,14 @@
+import os
+import sys
+
 from flask import Flask, request, jsonify
 from flask_sqlalchemy import SQLAlchemy
+# Modules shared by every app live in ../common
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common.pagination import page_response, parse_list_args
 
 app = Flask(__name__)
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///todos.db"
+app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("TODO_DATABASE_URI", "sqlite:///todos.db")
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 db = SQLAlchemy(app)
 
@@ -16,10 +22,14 @@ class Todo(db.Model):
         return {"id": self.id, "task": self.task, "done": self.done}
 
 
+# GET /tasks is paginated with keyset cursors, see common/pagination.py
 @app.route("/tasks", methods=["GET"])
 def get_tasks():
-    todos = Todo.query.all()
-    return jsonify([todo.to_dict() for todo in todos])
+    try:
+        page = parse_list_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return page_response(Todo.query, Todo, *page)
 
 
 @app.route("/tasks", methods=["POST"])
@@ -1,54 +1,82 @@
-import asyncio
-import requests
+import argparse
+import os
+import sys
+
 from mcp.server.fastmcp import FastMCP
+# Modules shared by every app live in ../common
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common.http_api import APIClient
+from common.instrumentation import ToolStats
 import mcp.types as types
 
-mcp = FastMCP("TodoMCPServer")
+FLASK_API_URL = os.environ.get("FLASK_API_URL", "http://localhost:5001/tasks")
+
+# Pooled keep-alive connections to the Flask API, closed with the last session
+api = APIClient(FLASK_API_URL)
 
-FLASK_API_URL = "http://localhost:5001/tasks"
+mcp = FastMCP("TodoMCPServer", lifespan=api.lifespan)
+stats = ToolStats(mcp)
 
 
 # MCP tool: list tasks by calling Flask API
 @mcp.tool()
-async def list_todos():
-    def fetch():
-        resp = requests.get(FLASK_API_URL)
-        resp.raise_for_status()
-        return resp.json()
-
-    return await asyncio.to_thread(fetch)
+@stats.instrument
+async def list_todos(limit: int = 50, cursor: str = None, done: bool = None, fields: list[str] = None):
+    """
+    List tasks one page at a time, ordered by id. Pass the returned
+    `next_cursor` back as `cursor` to get the next page (it is null on the
+    last page). `limit` is capped at 200; `done` filters by status and
+    `fields` picks which of id, task, done to return (id is always included).
+    """
+    params = {"limit": limit}
+    if cursor:
+        params["cursor"] = cursor
+    if done is not None:
+        params["done"] = "true" if done else "false"
+    if fields:
+        params["fields"] = ",".join(fields)
+    return await api.request("GET", params=params)
 
 
 @mcp.tool()
+@stats.instrument
 async def add_todo(task: str):
-    def post():
-        resp = requests.post(FLASK_API_URL, json={"task": task})
-        resp.raise_for_status()
-        return resp.json()
-
-    return await asyncio.to_thread(post)
+    return await api.request("POST", json={"task": task})
 
 
 # MCP tool: update a task
 @mcp.tool()
-def update_todo(task_id: int, task: str = None, done: bool = None):
+@stats.instrument
+async def update_todo(task_id: int, task: str = None, done: bool = None):
     data = {}
     if task is not None:
         data["task"] = task
     if done is not None:
         data["done"] = done
-    resp = requests.put(f"{FLASK_API_URL}/{task_id}", json=data)
-    resp.raise_for_status()
-    return resp.json()
+    return await api.request("PUT", f"/{task_id}", json=data)
 
 
 # MCP tool: delete a task
 @mcp.tool()
-def delete_todo(task_id: int):
-    resp = requests.delete(f"{FLASK_API_URL}/{task_id}")
-    resp.raise_for_status()
+@stats.instrument
+async def delete_todo(task_id: int):
+    await api.request("DELETE", f"/{task_id}")
     return {"result": "Task deleted"}
 
 
 if __name__ == "__main__":
-    asyncio.run(mcp.run(transport="stdio"))
+    # stdio gives every client a private server process; the HTTP transports
+    # let several Flask workers share one server over persistent connections.
+    parser = argparse.ArgumentParser(description="Todo MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "streamable-http", "sse"],
+        default=os.environ.get("MCP_TRANSPORT", "stdio"),
+    )
+    parser.add_argument("--host", default=os.environ.get("MCP_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("MCP_PORT", 8000)))
+    args = parser.parse_args()
+
+    mcp.settings.host = args.host
+    mcp.settings.port = args.port
+    mcp.run(transport=args.transport)
@@ -0,0 +1,60 @@
+"""
+Micro-benchmark: the old `eval(expression, {"__builtins__": None})` path of
+`calculate` against the cached safe evaluator, cold (parse + validate +
+compile) and warm (cache hit), plus `evaluate_many` over a list of inputs
+against evaluating a formatted expression per input.
+
+    python bench_calculate.py --number 20000 --rows 10000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+# Modules shared by every app live in ../common
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import safe_eval
+from common.safe_eval import evaluate, evaluate_many
+
+EXPRESSIONS = [
+    "2 + 2",
+    "(3.5 * 4 - 1) / 7",
+    "2 * (3 + 4) ** 2 - 18 // 4",
+    "((1 + 2) * (3 + 4) * (5 + 6) - (7 - 8) / 9) % 10",
+]
+
+
+def per_call_us(stmt, number):
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="eval vs cached safe evaluator")
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{'expression':<52}{'eval us':>10}{'cold us':>10}{'warm us':>10}")
+    for expression in EXPRESSIONS:
+        old = per_call_us(lambda: eval(expression, {"__builtins__": None}), args.number)
+
+        def cold():
+            safe_eval._compile.cache_clear()
+            evaluate(expression)
+
+        cold_us = per_call_us(cold, max(args.number // 10, 1))
+        warm = per_call_us(lambda: evaluate(expression), args.number)
+        print(f"{expression:<52}{old:>10.2f}{cold_us:>10.2f}{warm:>10.2f}")
+
+    template = "p * (1 + r) ** n"
+    p = [1000.0 + i for i in range(args.rows)]
+    r = [0.01 + (i % 10) / 100 for i in range(args.rows)]
+    n = [float(1 + i % 30) for i in range(args.rows)]
+    loop = min(timeit.repeat(
+        lambda: [eval(f"{a} * (1 + {b}) ** {c}", {"__builtins__": None}) for a, b, c in zip(p, r, n)],
+        number=1, repeat=3,
+    ))
+    vectorized = min(timeit.repeat(lambda: evaluate_many(template, p=p, r=r, n=n), number=1, repeat=3))
+    print(f"\n{args.rows} rows of '{template}': eval per row {loop * 1000:.1f} ms, "
+          f"evaluate_many {vectorized * 1000:.2f} ms ({loop / vectorized:.0f}x)")
@@ -1,23 +1,50 @@
+import os
+import sys
 from mcp.server.fastmcp import FastMCP
+# Modules shared by every app live in ../common
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common.instrumentation import ToolStats
+from common.offload import Offloader
+from common.safe_eval import evaluate, evaluate_many
 
 mcp = FastMCP(name="Interactive Chat Server")
+stats = ToolStats(mcp)
+offload = Offloader(mcp)
 
 @mcp.tool()
+@stats.instrument
 def chat(message: str) -> str:
     # Your chat logic here
     return f"You said: {message}"
 
 @mcp.tool()
+@stats.instrument
 def weather(city: str) -> str:
     return f"The weather in {city} is sunny with 25°C."
 
 @mcp.tool()
+@stats.instrument
+@offload.tool()
 def calculate(expression: str) -> str:
     try:
-        result = eval(expression, {"__builtins__": None})
+        result = evaluate(expression)
         return f"Result: {result}"
     except Exception as e:
         return f"Error: {e}"
 
+@mcp.tool()
+@stats.instrument
+@offload.tool(limit=4)
+def calculate_many(expression: str, variables: dict[str, list[float]]) -> str:
+    """
+    Evaluate one expression over lists of inputs, e.g. expression "p * (1 + r) ** n"
+    with variables {"p": [100, 200], "r": [0.05, 0.05], "n": [10, 20]}.
+    """
+    try:
+        results = evaluate_many(expression, **variables)
+        return f"Results: {results}"
+    except Exception as e:
+        return f"Error: {e}"
+
 if __name__ == "__main__":
     mcp.run()
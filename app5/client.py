@@ -22,10 +22,15 @@ TOOL_SELECTION_PROMPT = """
 You are a financial AI assistant that can call these tools:
 - chat(message)
 - calculate_interest(principal, rate, years)
+- compound_interest(principal, rate, years, contribution)
+- amortization_schedule(principal, rate, years)
 - get_stock_price(ticker)
+- get_stock_prices(tickers)
 - retrieve_compliance_docs(query)
 - compare_stock(ticker1, ticker2)
 - historical_data(ticker, period)
+- indicators(ticker, period, metrics)
+- portfolio_risk(holdings, period)
 
 Given the user input, decide which tool to call and with what arguments.
 Respond with a JSON object ONLY, with this exact format (no extra text):
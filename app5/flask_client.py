@@ -1,5 +1,4 @@
 from flask import Flask, request, render_template_string
-import asyncio
 import json
 import re
 from os.path import expanduser
@@ -8,8 +7,8 @@ from langchain_community.llms import LlamaCpp
 from sentence_transformers import SentenceTransformer
 
 from milvus_client import MilvusClient  # Your Milvus wrapper
-from mcp.client.stdio import stdio_client, StdioServerParameters
-from mcp import ClientSession
+from mcp import StdioServerParameters
+from mcp_supervisor import MCPSessionSupervisor
 
 app = Flask(__name__)
 
@@ -71,19 +70,11 @@ embedder = SentenceTransformer("all-MiniLM-L6-v2")
 milvus_client = MilvusClient("finance_rag_db.db")
 server_params = StdioServerParameters(command="python", args=["finance_server.py"])
 
-# We'll keep MCP session global and initialize on first request
-mcp_session = None
-
-async def init_mcp_session():
-    global mcp_session
-    if mcp_session is None:
-        reader, writer = await stdio_client(server_params)
-        mcp_session = await ClientSession(reader, writer).__aenter__()
-        await mcp_session.initialize()
-
-async def process_query(user_input):
-    await init_mcp_session()
+# One MCP session for the life of the process, reconnected if the server dies
+mcp_supervisor = MCPSessionSupervisor(server_params)
+mcp_supervisor.start()
 
+def process_query(user_input):
     tool_prompt = TOOL_SELECTION_PROMPT.format(input=user_input)
     tool_response = llm(tool_prompt)
     tool_call = extract_json_from_text(tool_response)
@@ -108,7 +99,7 @@ async def process_query(user_input):
         return answer
     else:
         try:
-            response = await mcp_session.call_tool(tool_name, args)
+            response = mcp_supervisor.call_tool(tool_name, args)
             return extract_result_content(response)
         except Exception as e:
             return f"Error calling tool '{tool_name}': {e}"
@@ -121,8 +112,7 @@ def index():
         if user_input.strip() == "":
             return render_template_string(TEMPLATE, response="Please enter a query.", query=user_input)
 
-        # Run the async MCP processing in event loop
-        response = asyncio.run(process_query(user_input))
+        response = process_query(user_input)
         return render_template_string(TEMPLATE, response=response, query=user_input)
 
     return render_template_string(TEMPLATE, response=None, query="")
@@ -0,0 +1,148 @@
+"""
+Technical indicators over a daily price history, computed on whole NumPy
+arrays (cumulative sums for rolling windows, pandas' ewm for the exponential
+ones) and summarized as a handful of numbers per metric.
+
+    compute_indicators(hist, ["returns", "rsi"])
+    -> {"bars": 251, "start": "...", "end": "...", "last_close": ...,
+        "returns": {...}, "rsi": {...}}
+"""
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+METRICS = ("returns", "volatility", "sma", "ema", "rsi", "drawdown")
+SMA_WINDOWS = (20, 50, 200)
+EMA_SPANS = (12, 26)
+RSI_PERIOD = 14
+
+
+def _num(value, digits=4):
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
+
+
+def rolling_mean(values, window):
+    """Mean of every full `window`; aligned so result[i] covers values[i:i + window]."""
+    if len(values) < window:
+        return np.empty(0)
+    sums = np.cumsum(np.insert(values, 0, 0.0))
+    return (sums[window:] - sums[:-window]) / window
+
+
+def rolling_std(values, window):
+    mean = rolling_mean(values, window)
+    if not len(mean):
+        return mean
+    mean_sq = rolling_mean(values * values, window)
+    return np.sqrt(np.maximum(mean_sq - mean * mean, 0.0) * window / (window - 1))
+
+
+def _returns(close, dates):
+    daily = close[1:] / close[:-1] - 1
+    years = (dates[-1] - dates[0]).days / 365.25
+    total = close[-1] / close[0] - 1
+    return {
+        "total_pct": _num(total * 100),
+        "annualized_pct": _num(((1 + total) ** (1 / years) - 1) * 100) if years > 0 else None,
+        "last_day_pct": _num(daily[-1] * 100),
+        "mean_daily_pct": _num(daily.mean() * 100),
+        "best_day_pct": _num(daily.max() * 100),
+        "worst_day_pct": _num(daily.min() * 100),
+    }
+
+
+def _volatility(close, window):
+    log_returns = np.diff(np.log(close))
+    annualize = np.sqrt(TRADING_DAYS) * 100
+    rolling = rolling_std(log_returns, window) * annualize
+    return {
+        "window": window,
+        "annualized_pct": _num(log_returns.std(ddof=1) * annualize),
+        "rolling_latest_pct": _num(rolling[-1]) if len(rolling) else None,
+        "rolling_min_pct": _num(rolling.min()) if len(rolling) else None,
+        "rolling_max_pct": _num(rolling.max()) if len(rolling) else None,
+    }
+
+
+def _sma(close):
+    result = {}
+    for window in SMA_WINDOWS:
+        sma = rolling_mean(close, window)
+        if len(sma):
+            result[f"sma_{window}"] = _num(sma[-1])
+            result[f"close_vs_sma_{window}_pct"] = _num((close[-1] / sma[-1] - 1) * 100)
+    return result
+
+
+def _ema(series):
+    emas = {span: series.ewm(span=span, adjust=False).mean().to_numpy() for span in EMA_SPANS}
+    result = {f"ema_{span}": _num(values[-1]) for span, values in emas.items()}
+    if 12 in emas and 26 in emas:
+        macd = pd.Series(emas[12] - emas[26])
+        signal = macd.ewm(span=9, adjust=False).mean()
+        result["macd"] = _num(macd.iloc[-1])
+        result["macd_signal"] = _num(signal.iloc[-1])
+    return result
+
+
+def _rsi(series):
+    # Wilder's smoothing is an exponential average with alpha = 1 / period
+    delta = series.diff().iloc[1:]
+    gain = delta.clip(lower=0).ewm(alpha=1 / RSI_PERIOD, adjust=False, min_periods=RSI_PERIOD).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / RSI_PERIOD, adjust=False, min_periods=RSI_PERIOD).mean()
+    rsi = (100 - 100 / (1 + gain / loss)).to_numpy()
+    rsi = np.where(loss.to_numpy() == 0, 100.0, rsi)
+    latest = rsi[-1] if len(rsi) else np.nan
+    state = "overbought" if latest > 70 else "oversold" if latest < 30 else "neutral"
+    return {"period": RSI_PERIOD, "latest": _num(latest, 2), "state": None if np.isnan(latest) else state}
+
+
+def _drawdown(close, dates):
+    peaks = np.maximum.accumulate(close)
+    drawdown = close / peaks - 1
+    trough = int(drawdown.argmin())
+    peak = int(close[:trough + 1].argmax())
+    return {
+        "max_pct": _num(drawdown[trough] * 100),
+        "peak_date": dates[peak].strftime("%Y-%m-%d"),
+        "trough_date": dates[trough].strftime("%Y-%m-%d"),
+        "current_pct": _num(drawdown[-1] * 100),
+    }
+
+
+def compute_indicators(hist, metrics=None, window=20):
+    """
+    Summarize `metrics` (default: all of METRICS) over the Close column of
+    `hist`; `window` is the rolling volatility window in days (at least 2).
+    """
+    metrics = list(METRICS if not metrics else metrics)
+    unknown = [metric for metric in metrics if metric not in METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(unknown)}; choose from {', '.join(METRICS)}")
+    if window < 2:
+        raise ValueError(f"window must be at least 2 days, got {window}")
+    series = hist["Close"].dropna().astype(np.float64)
+    if len(series) < 2:
+        raise ValueError("At least two bars are needed")
+    close = series.to_numpy()
+    dates = series.index
+
+    result = {
+        "bars": len(close),
+        "start": dates[0].strftime("%Y-%m-%d"),
+        "end": dates[-1].strftime("%Y-%m-%d"),
+        "last_close": _num(close[-1]),
+    }
+    compute = {
+        "returns": lambda: _returns(close, dates),
+        "volatility": lambda: _volatility(close, window),
+        "sma": lambda: _sma(close),
+        "ema": lambda: _ema(series),
+        "rsi": lambda: _rsi(series),
+        "drawdown": lambda: _drawdown(close, dates),
+    }
+    for metric in metrics:
+        result[metric] = compute[metric]()
+    return result
@@ -0,0 +1,127 @@
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+from mcp import ClientSession
+from mcp.client.stdio import stdio_client
+
+logger = logging.getLogger(__name__)
+
+
+class MCPSessionSupervisor:
+    """
+    Owns one event loop thread and one MCP session for the life of the process.
+
+    Request handlers call `call_tool` synchronously; the call runs on the
+    supervisor's loop against the current session. A health-check ping runs
+    every `health_check_interval` seconds, and when the server process dies the
+    session is torn down and reopened with exponential backoff.
+    """
+
+    def __init__(self, server_params, health_check_interval=15, call_timeout=60,
+                 initial_backoff=0.5, max_backoff=30):
+        self.server_params = server_params
+        self.health_check_interval = health_check_interval
+        self.call_timeout = call_timeout
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._connected = None
+        self._stopping = None
+        self._task = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="mcp-supervisor", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    async def _start(self):
+        self._connected = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._supervise())
+
+    async def _wait_stopping(self, timeout):
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    @asynccontextmanager
+    async def _open_session(self):
+        """Start the server process and yield an initialized session."""
+        read_timeout = timedelta(seconds=self.call_timeout)
+        async with stdio_client(self.server_params) as (reader, writer):
+            async with ClientSession(reader, writer, read_timeout_seconds=read_timeout) as session:
+                await session.initialize()
+                yield session
+
+    async def _run_session(self):
+        async with self._open_session() as session:
+            self._session = session
+            self._connected.set()
+            logger.info("MCP session connected")
+            while not self._stopping.is_set():
+                await self._wait_stopping(self.health_check_interval)
+                if not self._stopping.is_set():
+                    await asyncio.wait_for(session.send_ping(), self.call_timeout)
+
+    async def _supervise(self):
+        backoff = self.initial_backoff
+        while not self._stopping.is_set():
+            try:
+                await self._run_session()
+            except Exception as e:
+                logger.warning(f"MCP session lost: {e}")
+            finally:
+                was_connected = self._connected.is_set()
+                self._connected.clear()
+                self._session = None
+            if self._stopping.is_set():
+                break
+            if was_connected:
+                backoff = self.initial_backoff
+            logger.info(f"Reconnecting to MCP server in {backoff:.1f}s")
+            await self._wait_stopping(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def _call_tool(self, tool_name, args):
+        while True:
+            if self._stopping.is_set():
+                raise RuntimeError("MCPSessionSupervisor is stopping.")
+            await self._connected.wait()
+            session = self._session
+            if session is not None:
+                return await session.call_tool(tool_name, args)
+            # the session dropped after the wakeup; wait for the reconnect
+            await asyncio.sleep(0)
+
+    def call_tool(self, tool_name, args=None, timeout=None):
+        """Call a tool from synchronous code, waiting for a live session if needed."""
+        if self._thread is None:
+            raise RuntimeError("MCPSessionSupervisor is not started.")
+        future = asyncio.run_coroutine_threadsafe(self._call_tool(tool_name, args or {}), self._loop)
+        try:
+            return future.result(timeout or self.call_timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    async def _stop(self):
+        self._stopping.set()
+        await self._task
+
+    def stop(self):
+        if self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._stop(), self._loop).result(self.call_timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._thread = None
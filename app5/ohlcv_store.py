@@ -0,0 +1,238 @@
+"""
+On-disk columnar store of daily OHLCV bars, one directory per ticker.
+
+    store = OHLCVStore("ohlcv_data", YFinanceSource())
+    hist = store.history("AAPL", "5y")          # same interface as a quote source
+    hist = store.read("AAPL", start="2020-01-01", end="2020-12-31")
+
+Each ticker directory holds one flat binary file per column (dates as int64
+days since the epoch, prices and volume as float64) plus `meta.json` with the
+row count, the earliest date the data is complete from and the last refresh
+time. Reads memory-map the files and binary-search the date column, so only
+the requested range is materialized.
+
+The first request for a ticker downloads its period. After that, once
+`refresh_after` seconds have passed, only the bars since the last stored date
+are fetched: the last row is rewritten (it may have been a partial day) and
+newer bars are appended. A request reaching further back than the stored data
+downloads that period once and rewrites the files.
+
+Bars are stored as the source returned them; split/dividend adjustments made
+upstream after a bar was stored are not applied retroactively.
+"""
+
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from quotes import OHLCV_COLUMNS, period_start, split_download
+
+DATE_FILE = "date.i8"
+COLUMN_FILES = {column: f"{column.lower()}.f8" for column in OHLCV_COLUMNS}
+META_FILE = "meta.json"
+
+
+def _days(index):
+    """DatetimeIndex (naive or tz-aware) -> int64 days since the epoch."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize().values.astype("datetime64[D]").astype(np.int64)
+
+
+def _day(date):
+    return int(np.datetime64(pd.Timestamp(date).date(), "D").astype(np.int64))
+
+
+class OHLCVStore:
+    def __init__(self, root, upstream, refresh_after=60, clock=time.time):
+        self.root = root
+        self.upstream = upstream
+        self.refresh_after = refresh_after
+        self._clock = clock
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock(self, ticker):
+        with self._locks_lock:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _dir(self, ticker):
+        return os.path.join(self.root, ticker.upper())
+
+    def _meta(self, ticker):
+        try:
+            with open(os.path.join(self._dir(ticker), META_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_meta(self, ticker, meta):
+        # write-then-rename, so readers only ever see a complete meta.json
+        path = os.path.join(self._dir(ticker), META_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+
+    def _columns(self, hist):
+        hist = hist.dropna(subset=["Close"])
+        columns = {DATE_FILE: _days(hist.index)}
+        for column, filename in COLUMN_FILES.items():
+            if column in hist:
+                columns[filename] = hist[column].to_numpy(np.float64)
+            else:
+                columns[filename] = np.full(len(hist), np.nan)
+        return columns
+
+    def _rewrite(self, ticker, hist, complete_from):
+        os.makedirs(self._dir(ticker), exist_ok=True)
+        columns = self._columns(hist)
+        for filename, values in columns.items():
+            values.tofile(os.path.join(self._dir(ticker), filename))
+        self._write_meta(ticker, {
+            "rows": len(columns[DATE_FILE]),
+            "complete_from": complete_from,
+            "refreshed_at": self._clock(),
+        })
+
+    def _append(self, ticker, meta, hist):
+        """Merge bars dated on or after the last stored bar into the files."""
+        rows = meta["rows"]
+        dates = self._memmap(ticker, DATE_FILE, np.int64, rows)
+        last_day = int(dates[-1]) if rows else None
+        del dates
+        columns = self._columns(hist)
+        keep = columns[DATE_FILE] >= last_day if last_day is not None else slice(None)
+        columns = {filename: values[keep] for filename, values in columns.items()}
+        start = rows - 1 if rows and len(columns[DATE_FILE]) and columns[DATE_FILE][0] == last_day else rows
+        for filename, values in columns.items():
+            with open(os.path.join(self._dir(ticker), filename), "r+b") as f:
+                f.seek(start * 8)
+                values.tofile(f)
+        meta = dict(meta, rows=start + len(columns[DATE_FILE]), refreshed_at=self._clock())
+        self._write_meta(ticker, meta)
+        return meta
+
+    def _memmap(self, ticker, filename, dtype, rows):
+        if not rows:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self._dir(ticker), filename), dtype=dtype, mode="r", shape=(rows,))
+
+    def _covers(self, ticker, meta, period, start=None):
+        if meta is None or not meta["rows"]:
+            return False
+        if meta["complete_from"] is None:  # holds everything ('max')
+            return True
+        if start is not None:
+            return meta["complete_from"] <= pd.Timestamp(start).isoformat()
+        if period == "max":
+            return False
+        if period.endswith("d") and period[:-1].isdigit():
+            return meta["rows"] >= int(period[:-1])
+        # counted back from the last stored bar, as `_read_period` slices it
+        return meta["complete_from"] <= period_start(self._last_date(ticker, meta), period).isoformat()
+
+    def _stale(self, meta):
+        return self._clock() - meta["refreshed_at"] >= self.refresh_after
+
+    def _complete_from(self, period, start, hist):
+        """Earliest date the fetched bars are complete from; None means everything."""
+        if start is not None:
+            return pd.Timestamp(start).isoformat()
+        if period == "max":
+            return None
+        if period.endswith("d") and period[:-1].isdigit():
+            first = hist.index[0] if not hist.empty else pd.Timestamp.now()
+            return pd.Timestamp(first).tz_localize(None).normalize().isoformat()
+        # the period ends at the last bar fetched, which may be well before today
+        last = hist.index[-1] if not hist.empty else pd.Timestamp.now()
+        return period_start(pd.Timestamp(last).tz_localize(None), period).isoformat()
+
+    def _last_date(self, ticker, meta):
+        dates = self._memmap(ticker, DATE_FILE, np.int64, meta["rows"])
+        return pd.Timestamp(np.datetime64(int(dates[-1]), "D"))
+
+    def _ensure(self, ticker, period, start=None, fetched=None):
+        """Bring the store up to date for the request; `fetched` is a prefetched (kind, frame)."""
+        meta = self._meta(ticker)
+        if not self._covers(ticker, meta, period, start):
+            if fetched and fetched[0] == "full":
+                hist = fetched[1]
+            else:
+                hist = self.upstream.history(ticker, period, start=start)
+            self._rewrite(ticker, hist, self._complete_from(period, start, hist))
+        elif self._stale(meta):
+            if fetched and fetched[0] == "since":
+                hist = fetched[1]
+            else:
+                hist = self.upstream.history(ticker, start=self._last_date(ticker, meta).date())
+            self._append(ticker, meta, hist)
+
+    def read(self, ticker, start=None, end=None):
+        """Stored bars for `ticker` between `start` and `end` (inclusive dates)."""
+        meta = self._meta(ticker)
+        rows = meta["rows"] if meta else 0
+        dates = self._memmap(ticker, DATE_FILE, np.int64, rows)
+        lo = np.searchsorted(dates, _day(start), side="left") if start is not None else 0
+        hi = np.searchsorted(dates, _day(end), side="right") if end is not None else rows
+        return self._frame(ticker, rows, dates, lo, hi)
+
+    def _frame(self, ticker, rows, dates, lo, hi):
+        index = pd.DatetimeIndex(np.asarray(dates[lo:hi]).astype("datetime64[D]"), name="Date")
+        data = {
+            column: np.array(self._memmap(ticker, filename, np.float64, rows)[lo:hi])
+            for column, filename in COLUMN_FILES.items()
+        }
+        return pd.DataFrame(data, index=index, columns=OHLCV_COLUMNS)
+
+    def _read_period(self, ticker, period):
+        meta = self._meta(ticker)
+        rows = meta["rows"] if meta else 0
+        dates = self._memmap(ticker, DATE_FILE, np.int64, rows)
+        if not rows or period == "max":
+            lo = 0
+        elif period.endswith("d") and period[:-1].isdigit():
+            lo = max(rows - int(period[:-1]), 0)
+        else:
+            last = pd.Timestamp(np.datetime64(int(dates[-1]), "D"))
+            lo = np.searchsorted(dates, _day(period_start(last, period)), side="left")
+        return self._frame(ticker, rows, dates, lo, rows)
+
+    def _read_request(self, ticker, period, start):
+        if start is not None:
+            return self.read(ticker, start=start)
+        return self._read_period(ticker, period)
+
+    def history(self, ticker, period="1mo", start=None):
+        ticker = ticker.upper()
+        with self._lock(ticker):
+            self._ensure(ticker, period, start)
+            return self._read_request(ticker, period, start)
+
+    def download(self, tickers, period="1mo", start=None):
+        """
+        Batched `history`: tickers without enough stored data are fetched in one
+        upstream download, stale ones in another (from the oldest last date).
+        """
+        tickers = [ticker.upper() for ticker in tickers]
+        metas = {ticker: self._meta(ticker) for ticker in tickers}
+        missing = [ticker for ticker in tickers if not self._covers(ticker, metas[ticker], period, start)]
+        stale = [ticker for ticker in tickers if ticker not in missing and self._stale(metas[ticker])]
+        fetched = {}
+        if missing:
+            data = self.upstream.download(missing, period, start=start)
+            fetched.update({ticker: ("full", split_download(data, ticker)) for ticker in missing})
+        if stale:
+            since = min(self._last_date(ticker, metas[ticker]) for ticker in stale)
+            data = self.upstream.download(stale, start=since.date())
+            fetched.update({ticker: ("since", split_download(data, ticker)) for ticker in stale})
+        frames = {}
+        for ticker in tickers:
+            with self._lock(ticker):
+                self._ensure(ticker, period, start, fetched.get(ticker))
+                frames[ticker] = self._read_request(ticker, period, start)
+        return pd.concat(frames, axis=1).swaplevel(axis=1).sort_index(axis=1)
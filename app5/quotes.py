@@ -0,0 +1,260 @@
+"""
+Quote and price-history cache for the finance MCP server.
+
+    quotes = QuoteCache(YFinanceSource())
+    hist = await quotes.history("AAPL", "1mo")
+    price = await quotes.latest_close("AAPL")
+
+Results are kept per (ticker, period) for a TTL that depends on the period:
+short windows go stale quickly, multi-year ones barely move. Concurrent
+requests for the same key share one upstream fetch (single flight), and
+fetches run in worker threads so independent ones overlap.
+
+A source is any object with `history(ticker, period, start=None) -> DataFrame`
+returning daily OHLCV bars indexed by date (from `start` when given, else over
+`period`), and `download(tickers, period, start=None)` returning the same bars
+for many tickers in one frame with (field, ticker) columns, so a local
+stand-in (e.g. `CSVSource`) or the on-disk `OHLCVStore` can replace Yahoo.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+# Seconds a history result stays fresh, by period
+HISTORY_TTLS = {
+    "1d": 60,
+    "5d": 300,
+    "1mo": 900,
+    "3mo": 1800,
+    "6mo": 3600,
+    "ytd": 3600,
+    "1y": 3600,
+    "2y": 6 * 3600,
+    "5y": 6 * 3600,
+    "10y": 12 * 3600,
+    "max": 12 * 3600,
+}
+DEFAULT_TTL = 900
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+PERIOD_OFFSETS = {
+    "mo": lambda n: pd.DateOffset(months=n),
+    "y": lambda n: pd.DateOffset(years=n),
+}
+
+
+def period_start(end, period):
+    """First calendar date of a 'ytd', 'Nmo' or 'Ny' period ending at `end`."""
+    end = pd.Timestamp(end)
+    if period == "ytd":
+        return end.replace(month=1, day=1).normalize()
+    for suffix, offset in PERIOD_OFFSETS.items():
+        count = period[:-len(suffix)]
+        if period.endswith(suffix) and count.isdigit():
+            return (end - offset(int(count))).normalize()
+    raise ValueError(f"Unsupported period '{period}'")
+
+
+def slice_period(hist, period):
+    """Cut a daily history down to `period`, counting back from its last bar."""
+    if hist.empty or period == "max":
+        return hist
+    if period.endswith("d") and period[:-1].isdigit():
+        return hist.iloc[-int(period[:-1]):]  # trading days, like Yahoo
+    return hist[hist.index >= period_start(hist.index[-1], period)]
+
+
+class YFinanceSource:
+    """Daily bars from Yahoo Finance."""
+
+    def history(self, ticker, period="1mo", start=None):
+        import yfinance as yf
+
+        if start is not None:
+            return yf.Ticker(ticker).history(start=start)
+        return yf.Ticker(ticker).history(period=period)
+
+    def download(self, tickers, period="1mo", start=None):
+        import yfinance as yf
+
+        window = {"start": start} if start is not None else {"period": period}
+        return yf.download(
+            list(tickers), group_by="column", auto_adjust=True,
+            progress=False, threads=True, multi_level_index=True, **window,
+        )
+
+
+class CSVSource:
+    """
+    Daily bars from `<directory>/<TICKER>.csv` files with a Date column and
+    Open/High/Low/Close/Volume columns; an offline stand-in for Yahoo Finance.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def history(self, ticker, period="1mo", start=None):
+        path = os.path.join(self.directory, f"{ticker.upper()}.csv")
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        hist = pd.read_csv(path, index_col="Date", parse_dates=True).sort_index()
+        if start is not None:
+            return hist[hist.index >= pd.Timestamp(start)]
+        return slice_period(hist, period)
+
+    def download(self, tickers, period="1mo", start=None):
+        frames = {ticker: self.history(ticker, period, start) for ticker in tickers}
+        return pd.concat(frames, axis=1).swaplevel(axis=1).sort_index(axis=1)
+
+
+def split_download(data, ticker):
+    """One ticker's bars out of a batched (field, ticker) frame."""
+    if data is None or data.empty or ticker not in data.columns.get_level_values(1):
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    return data.xs(ticker, axis=1, level=1).dropna(how="all")
+
+
+def quote_summary(frames):
+    """
+    Latest bar per ticker from a {TICKER: DataFrame} dict, computed over one
+    wide frame: price, previous close, change, change %, high, low, volume and
+    date. Tickers with no bars are left out.
+    """
+    frames = {ticker: hist for ticker, hist in frames.items() if not hist.empty}
+    if not frames:
+        return pd.DataFrame(columns=["price", "previous_close", "change", "change_pct", "high", "low", "volume", "date"])
+    wide = pd.concat(frames, axis=1)  # (ticker, field) columns over the union of dates
+    closes = wide.xs("Close", axis=1, level=1)
+    valid = closes.notna()
+    from_end = valid[::-1].cumsum()[::-1].where(valid)  # 1 on each ticker's last bar, 2 on the one before
+
+    def at(field, n):
+        return wide.xs(field, axis=1, level=1).where(from_end == n).max()
+
+    price = at("Close", 1)
+    previous = at("Close", 2)
+    summary = pd.DataFrame({
+        "price": price,
+        "previous_close": previous,
+        "change": price - previous,
+        "change_pct": (price - previous) / previous * 100,
+        "high": at("High", 1),
+        "low": at("Low", 1),
+        "volume": at("Volume", 1),
+        "date": (from_end == 1).idxmax().map(lambda ts: ts.strftime("%Y-%m-%d")),
+    })
+    return summary
+
+
+class QuoteCache:
+    def __init__(self, source=None, ttls=None, default_ttl=DEFAULT_TTL, max_entries=256, clock=time.monotonic):
+        self.source = source or YFinanceSource()
+        self.ttls = dict(HISTORY_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()  # (ticker, period) -> (expires_at, DataFrame)
+        self._inflight = {}  # (ticker, period) -> Task or Future
+        self._batches = set()
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _put(self, key, hist):
+        self._entries[key] = (self._clock() + self.ttls.get(key[1], self.default_ttl), hist)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _fetch(self, key):
+        self.fetches += 1
+        hist = await asyncio.to_thread(self.source.history, *key)
+        self._put(key, hist)
+        return hist
+
+    async def history(self, ticker, period="1mo"):
+        """Daily OHLCV bars for `ticker` over `period`; do not mutate the result."""
+        key = (ticker.upper(), period)
+        hist = self._get(key)
+        if hist is not None:
+            self.hits += 1
+            return hist
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: a cancelled caller must not cancel the fetch others wait on
+        return await asyncio.shield(task)
+
+    async def _fetch_many(self, tickers, period, futures):
+        self.fetches += 1
+        try:
+            data = await asyncio.to_thread(self.source.download, tickers, period)
+        except Exception as e:
+            for future in futures.values():
+                future.set_exception(e)
+            return
+        for ticker, future in futures.items():
+            hist = split_download(data, ticker)
+            self._put((ticker, period), hist)
+            future.set_result(hist)
+
+    async def histories(self, tickers, period="1mo"):
+        """
+        `history` for many tickers as a {TICKER: DataFrame} dict. Cached and
+        in-flight tickers are reused; all the others are fetched in one batched
+        download and cached individually.
+        """
+        tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        pending = {}
+        to_fetch = {}
+        for ticker in tickers:
+            key = (ticker, period)
+            hist = self._get(key)
+            if hist is not None:
+                self.hits += 1
+                pending[ticker] = hist
+                continue
+            self.misses += 1
+            future = self._inflight.get(key)
+            if future is None:
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[key] = future
+                future.add_done_callback(lambda _, key=key: self._inflight.pop(key, None))
+                to_fetch[ticker] = future
+            pending[ticker] = future
+        if to_fetch:
+            batch = asyncio.ensure_future(self._fetch_many(list(to_fetch), period, to_fetch))
+            self._batches.add(batch)
+            batch.add_done_callback(self._batches.discard)
+        waiting = {ticker: value for ticker, value in pending.items() if asyncio.isfuture(value)}
+        results = await asyncio.gather(*(asyncio.shield(future) for future in waiting.values()))
+        pending.update(zip(waiting, results))
+        return pending
+
+    async def latest_close(self, ticker):
+        hist = await self.history(ticker, "1d")
+        if hist.empty:
+            raise LookupError(f"No price data for {ticker.upper()}")
+        return float(hist["Close"].iloc[-1])
+
+    def invalidate(self, ticker=None):
+        for key in [key for key in self._entries if ticker is None or key[0] == ticker.upper()]:
+            del self._entries[key]
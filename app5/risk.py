@@ -0,0 +1,108 @@
+"""
+Portfolio risk from daily closes: covariance, volatility, Value at Risk and
+per-asset risk contributions, all as matrix operations over one aligned
+returns matrix (dates x assets).
+
+    portfolio_risk_report({"AAPL": frame, "MSFT": frame}, {"AAPL": 6000, "MSFT": 4000})
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def _num(value, digits=4):
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
+
+
+def aligned_returns(frames):
+    """Simple daily returns on the dates every asset traded, as (dates, tickers, matrix)."""
+    closes = pd.concat({ticker: hist["Close"] for ticker, hist in frames.items()}, axis=1).dropna()
+    prices = closes.to_numpy(np.float64)
+    return closes.index[1:], list(closes.columns), prices[1:] / prices[:-1] - 1
+
+
+def portfolio_risk_report(frames, holdings, confidence=0.95, horizon_days=1):
+    """
+    `holdings` maps ticker to position value (negative for shorts); weights are
+    values over the net total. VaR and expected shortfall are losses over
+    `horizon_days` (at least 1) at `confidence` (between 0 and 1), in currency
+    and as a % of the portfolio.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
+    if horizon_days < 1:
+        raise ValueError(f"horizon_days must be at least 1, got {horizon_days}")
+    dates, tickers, returns = aligned_returns(frames)
+    # the historical VaR needs at least two (overlapping) horizon-day returns
+    if len(returns) < max(2, horizon_days + 1):
+        raise ValueError(
+            f"Not enough overlapping price history for these holdings: {len(returns)} daily returns "
+            f"for a {horizon_days}-day horizon"
+        )
+    values = np.array([holdings[ticker] for ticker in tickers], dtype=np.float64)
+    total = values.sum()
+    if total <= 0:
+        raise ValueError("Holdings must have a positive net value")
+    weights = values / total
+
+    cov = np.cov(returns, rowvar=False, ddof=1).reshape(len(tickers), len(tickers))
+    asset_vol = np.sqrt(np.diag(cov))
+    corr = cov / np.outer(asset_vol, asset_vol)
+    port_var = weights @ cov @ weights
+    port_vol = np.sqrt(port_var)
+    marginal = cov @ weights / port_vol  # d(vol)/d(weight)
+    contribution = weights * marginal  # sums to port_vol
+
+    port_returns = returns @ weights
+    scale = np.sqrt(horizon_days)
+    tail = 1 - confidence
+    # historical: overlapping horizon-day compounded returns when horizon > 1
+    if horizon_days > 1:
+        growth = np.cumprod(np.insert(1 + port_returns, 0, 1.0))
+        horizon_returns = growth[horizon_days:] / growth[:-horizon_days] - 1
+    else:
+        horizon_returns = port_returns
+    hist_cutoff = np.quantile(horizon_returns, tail)
+    hist_var = -hist_cutoff
+    hist_es = -horizon_returns[horizon_returns <= hist_cutoff].mean()
+    z = NormalDist().inv_cdf(tail)
+    mu, sigma = port_returns.mean() * horizon_days, port_vol * scale
+    param_var = -(mu + z * sigma)
+    param_es = -(mu - sigma * NormalDist().pdf(z) / tail)
+
+    annualize = np.sqrt(TRADING_DAYS) * 100
+    off_diagonal = corr[~np.eye(len(tickers), dtype=bool)]
+
+    def loss(fraction):
+        return {"pct": _num(fraction * 100), "amount": _num(fraction * total, 2)}
+
+    return {
+        "start": dates[0].strftime("%Y-%m-%d"),
+        "end": dates[-1].strftime("%Y-%m-%d"),
+        "observations": len(returns),
+        "total_value": _num(total, 2),
+        "confidence": confidence,
+        "horizon_days": horizon_days,
+        "volatility_annual_pct": _num(port_vol * annualize),
+        "historical_var": loss(hist_var),
+        "historical_es": loss(hist_es),
+        "parametric_var": loss(param_var),
+        "parametric_es": loss(param_es),
+        "average_correlation": _num(off_diagonal.mean()) if len(off_diagonal) else None,
+        "diversification_ratio": _num((np.abs(weights) @ asset_vol) / port_vol),
+        "assets": [
+            {
+                "ticker": ticker,
+                "weight": _num(weights[i]),
+                "volatility_annual_pct": _num(asset_vol[i] * annualize),
+                "beta_to_portfolio": _num(marginal[i] / port_vol),
+                "risk_contribution_pct": _num(contribution[i] / port_vol * 100),
+            }
+            for i, ticker in enumerate(tickers)
+        ],
+    }
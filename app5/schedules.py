@@ -0,0 +1,156 @@
+"""
+Loan amortization and compound-interest schedules, computed with NumPy for
+every scenario at once: a grid of rates x terms becomes a (scenarios x
+periods) array, shorter terms are masked, and closed-form balances replace the
+period-by-period loop.
+
+Results are summarized per scenario straight from the closed forms, without
+building any schedule; one scenario's schedule can be returned per period or
+per year, a page at a time, so a 30-year monthly schedule does not have to be
+sent whole. Grids are capped at MAX_SCENARIOS scenarios and terms at
+MAX_PERIODS periods.
+"""
+
+import itertools
+
+import numpy as np
+
+DETAILS = ("summary", "yearly", "periods")
+MAX_SCENARIOS = 400
+MAX_PERIODS = 20_000  # e.g. 50 years compounded daily
+
+
+def _money(values):
+    return np.round(np.asarray(values, dtype=np.float64), 2).tolist()
+
+
+def scenarios(rates, years):
+    """(rates, years) arrays for every combination of the given values."""
+    if len(rates) * len(years) > MAX_SCENARIOS:
+        raise ValueError(f"{len(rates)} rates x {len(years)} terms is more than {MAX_SCENARIOS} scenarios")
+    grid = list(itertools.product(rates, years))
+    return np.array([rate for rate, _ in grid], dtype=np.float64), np.array([term for _, term in grid], dtype=np.float64)
+
+
+def _periods(years, per_year):
+    if per_year < 1:
+        raise ValueError("There must be at least one period per year")
+    periods = years * per_year
+    if not np.isfinite(periods).all() or (periods > MAX_PERIODS).any():
+        raise ValueError(f"A term can cover at most {MAX_PERIODS} periods (years x periods per year)")
+    periods = np.rint(periods).astype(np.int64)
+    if (periods < 1).any():
+        raise ValueError("Every term must cover at least one period")
+    return periods
+
+
+def _annuity(r, k):
+    """Value after k periods of 1 paid at the end of each period: ((1 + r)^k - 1) / r."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(r == 0, k, ((1 + r) ** k - 1) / r)
+
+
+def _payment(principal, r, n):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(r == 0, principal / n, principal * (1 + r) ** n / _annuity(r, n))
+
+
+def amortization(principal, rates, years, per_year=12):
+    """
+    Level-payment loan schedules. `rates` are annual % and `years` terms, one
+    per scenario. Returns per-scenario payments and (scenario x period)
+    interest, principal and balance arrays (NaN past each term).
+    """
+    r = rates / 100 / per_year
+    n = _periods(years, per_year)
+    payment = _payment(principal, r, n)
+
+    k = np.arange(1, n.max() + 1)
+    balance = principal * (1 + r[:, None]) ** k - payment[:, None] * _annuity(r[:, None], k)
+    balance = np.where(np.abs(balance) < 1e-6, 0.0, balance)
+    previous = np.hstack([np.full((len(r), 1), float(principal)), balance[:, :-1]])
+    interest = previous * r[:, None]
+    principal_paid = payment[:, None] - interest
+
+    active = k[None, :] <= n[:, None]
+    return {
+        "periods": n,
+        "payment": payment,
+        "interest": np.where(active, interest, np.nan),
+        "principal": np.where(active, principal_paid, np.nan),
+        "balance": np.where(active, balance, np.nan),
+    }
+
+
+def compound(principal, rates, years, per_year=12, contribution=0.0):
+    """
+    Balances of a deposit compounding `per_year` times a year with an optional
+    contribution at the end of every period, for every scenario.
+    """
+    r = rates / 100 / per_year
+    n = _periods(years, per_year)
+    k = np.arange(1, n.max() + 1)
+    balance = principal * (1 + r[:, None]) ** k + contribution * _annuity(r[:, None], k)
+    contributed = principal + contribution * k
+    active = k[None, :] <= n[:, None]
+    return {
+        "periods": n,
+        "balance": np.where(active, balance, np.nan),
+        "contributed": np.where(active, np.broadcast_to(contributed, balance.shape), np.nan),
+    }
+
+
+def amortization_summary(principal, rates, years, per_year=12):
+    """Payment and totals per scenario, without building the schedules."""
+    n = _periods(years, per_year)
+    payment = _payment(principal, rates / 100 / per_year, n)
+    total_paid = payment * n
+    return [
+        {"rate": rate, "years": term, "payment": payment, "total_interest": interest, "total_paid": paid}
+        for rate, term, payment, interest, paid in zip(
+            rates.tolist(), years.tolist(), _money(payment),
+            _money(total_paid - principal), _money(total_paid),
+        )
+    ]
+
+
+def compound_summary(principal, rates, years, per_year=12, contribution=0.0):
+    """Final balance and totals per scenario, without building the schedules."""
+    r = rates / 100 / per_year
+    n = _periods(years, per_year)
+    final = principal * (1 + r) ** n + contribution * _annuity(r, n)
+    contributed = principal + contribution * n
+    return [
+        {"rate": rate, "years": term, "final_balance": balance, "contributed": paid, "interest_earned": earned}
+        for rate, term, balance, paid, earned in zip(
+            rates.tolist(), years.tolist(), _money(final), _money(contributed), _money(final - contributed),
+        )
+    ]
+
+
+def schedule_rows(columns, periods, per_year, detail):
+    """
+    Rows of one scenario's schedule. `columns` maps a name to (values, how)
+    where how is "sum" (flows) or "last" (balances) when grouping by year.
+    """
+    if detail == "periods":
+        index = np.arange(1, periods + 1)
+        data = {name: values[:periods] for name, (values, _) in columns.items()}
+        return [dict(zip(["period", *data], row)) for row in zip(index.tolist(), *map(_money, data.values()))]
+
+    starts = np.arange(0, periods, per_year)
+    ends = np.minimum(starts + per_year, periods) - 1
+    data = {}
+    for name, (values, how) in columns.items():
+        values = values[:periods]
+        data[name] = np.add.reduceat(values, starts) if how == "sum" else values[ends]
+    index = np.arange(1, len(starts) + 1)
+    return [dict(zip(["year", *data], row)) for row in zip(index.tolist(), *map(_money, data.values()))]
+
+
+def page(rows, number, size):
+    if size < 1:
+        raise ValueError("page_size must be at least 1")
+    pages = max(1, -(-len(rows) // size))
+    number = min(max(1, number), pages)
+    return {"page": number, "pages": pages, "rows": rows[(number - 1) * size:number * size]}
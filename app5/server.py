@@ -1,20 +1,66 @@
+import asyncio
+import os
+import sys
+
+import numpy as np
 from mcp.server.fastmcp import FastMCP
-import yfinance as yf
+# Modules shared by every app live in ../common
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common.instrumentation import ToolStats
+from common.offload import Offloader
+from indicators import compute_indicators
+from ohlcv_store import OHLCVStore
+from quotes import CSVSource, QuoteCache, YFinanceSource, quote_summary
+from risk import portfolio_risk_report
+import schedules
 # import pandas as pd
 
 mcp = FastMCP(name="Finance MCP Server")
+stats = ToolStats(mcp)
+offload = Offloader(mcp)
+
+# Set FINANCE_DATA_DIR to serve prices from local <TICKER>.csv files instead of Yahoo Finance
+DATA_DIR = os.environ.get("FINANCE_DATA_DIR")
+# Daily bars are kept on disk here and refreshed incrementally
+STORE_DIR = os.environ.get("FINANCE_STORE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "ohlcv_data"))
+STORE_REFRESH_AFTER = int(os.environ.get("FINANCE_STORE_REFRESH_AFTER", 60))
+
+upstream = CSVSource(DATA_DIR) if DATA_DIR else YFinanceSource()
+quotes = QuoteCache(OHLCVStore(STORE_DIR, upstream, refresh_after=STORE_REFRESH_AFTER))
 
 @mcp.tool()
-def get_stock_price(ticker: str) -> str:
+@stats.instrument
+async def get_stock_price(ticker: str) -> str:
     """Get the latest closing price for a given ticker."""
     try:
-        stock = yf.Ticker(ticker)
-        price = stock.history(period="1d")['Close'][0]
+        price = await quotes.latest_close(ticker)
         return f"The latest closing price of {ticker.upper()} is ${price:.2f}."
     except Exception as e:
         return f"Error fetching stock price for {ticker}: {e}"
 
 @mcp.tool()
+@stats.instrument
+async def get_stock_prices(tickers: list[str]) -> dict:
+    """
+    Get the latest price, previous close, change, day high/low and volume for
+    many tickers at once (one batched download). Unknown tickers are listed
+    under "missing".
+    """
+    try:
+        frames = await quotes.histories(tickers, "5d")
+        summary = quote_summary(frames).round(4)
+        # halted or partial bars can lack a volume (or a previous close): report those as null
+        summary["volume"] = summary["volume"].round().astype("Int64")
+        summary = summary.astype(object).where(summary.notna(), None)
+        return {
+            "quotes": [{"ticker": ticker, **row} for ticker, row in summary.to_dict("index").items()],
+            "missing": [ticker for ticker in frames if ticker not in summary.index],
+        }
+    except Exception as e:
+        return {"error": f"Error fetching stock prices for {', '.join(tickers)}: {e}"}
+
+@mcp.tool()
+@stats.instrument
 def calculate_interest(principal: float, rate: float, years: float) -> str:
     """Calculate simple interest."""
     try:
@@ -24,24 +70,95 @@ def calculate_interest(principal: float, rate: float, years: float) -> str:
     except Exception as e:
         return f"Error calculating interest: {e}"
 
+def _schedule_request(rate, years, rates, terms, detail, scenario, page_size):
+    if detail not in schedules.DETAILS:
+        raise ValueError(f"detail must be one of {', '.join(schedules.DETAILS)}")
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    rate_grid, term_grid = schedules.scenarios(rates or [rate], terms or [years])
+    if not 0 <= scenario < len(rate_grid):
+        raise ValueError(f"scenario must be between 0 and {len(rate_grid) - 1}")
+    return rate_grid, term_grid
+
 @mcp.tool()
+@stats.instrument
+@offload.tool(limit=4)
+def amortization_schedule(principal: float, rate: float, years: float, payments_per_year: int = 12,
+                          rates: list[float] = None, terms: list[float] = None, detail: str = "summary",
+                          scenario: int = 0, page: int = 1, page_size: int = 24) -> dict:
+    """
+    Level-payment loan schedule (rate in annual %). Pass `rates` and/or `terms`
+    (years) to compare every combination in one call. detail: 'summary' (payment
+    and totals per scenario), 'yearly' or 'periods' (the schedule of scenario
+    number `scenario`, `page_size` rows per page).
+    """
+    try:
+        rate_grid, term_grid = _schedule_request(rate, years, rates, terms, detail, scenario, page_size)
+        result = {"principal": principal,
+                  "scenarios": schedules.amortization_summary(principal, rate_grid, term_grid, payments_per_year)}
+        if detail != "summary":
+            # only the requested scenario's schedule is built
+            selected = slice(scenario, scenario + 1)
+            schedule = schedules.amortization(principal, rate_grid[selected], term_grid[selected], payments_per_year)
+            periods = schedule["periods"][0]
+            columns = {
+                "payment": (np.full(periods, schedule["payment"][0]), "sum"),
+                "interest": (schedule["interest"][0], "sum"),
+                "principal": (schedule["principal"][0], "sum"),
+                "balance": (schedule["balance"][0], "last"),
+            }
+            rows = schedules.schedule_rows(columns, periods, payments_per_year, detail)
+            result["schedule"] = {"scenario": scenario, "detail": detail, **schedules.page(rows, page, page_size)}
+        return result
+    except Exception as e:
+        return {"error": f"Error building amortization schedule: {e}"}
+
+@mcp.tool()
+@stats.instrument
+@offload.tool(limit=4)
+def compound_interest(principal: float, rate: float, years: float, compounds_per_year: int = 12,
+                      contribution: float = 0.0, rates: list[float] = None, terms: list[float] = None,
+                      detail: str = "summary", scenario: int = 0, page: int = 1, page_size: int = 24) -> dict:
+    """
+    Compound growth of a deposit (rate in annual %) with an optional contribution
+    every compounding period. Pass `rates` and/or `terms` (years) to compare every
+    combination in one call. detail: 'summary', 'yearly' or 'periods' (the schedule
+    of scenario number `scenario`, `page_size` rows per page).
+    """
+    try:
+        rate_grid, term_grid = _schedule_request(rate, years, rates, terms, detail, scenario, page_size)
+        result = {"principal": principal, "contribution": contribution,
+                  "scenarios": schedules.compound_summary(principal, rate_grid, term_grid, compounds_per_year,
+                                                          contribution)}
+        if detail != "summary":
+            selected = slice(scenario, scenario + 1)
+            schedule = schedules.compound(principal, rate_grid[selected], term_grid[selected], compounds_per_year,
+                                          contribution)
+            balance = schedule["balance"][0]
+            contributed = schedule["contributed"][0]
+            columns = {"contributed": (contributed, "last"), "interest_earned": (balance - contributed, "last"),
+                       "balance": (balance, "last")}
+            rows = schedules.schedule_rows(columns, schedule["periods"][0], compounds_per_year, detail)
+            result["schedule"] = {"scenario": scenario, "detail": detail, **schedules.page(rows, page, page_size)}
+        return result
+    except Exception as e:
+        return {"error": f"Error building compound interest schedule: {e}"}
+
+@mcp.tool()
+@stats.instrument
 def retrieve_compliance_docs(query: str) -> str:
     """Stub for compliance document retrieval."""
     return f"Compliance documents related to '{query}' would be retrieved here."
 
 @mcp.tool()
-def compare_stock(ticker1: str, ticker2: str) -> str:
+@stats.instrument
+async def compare_stock(ticker1: str, ticker2: str) -> str:
     """
     Compare the latest closing prices of two stocks.
     Returns a summary string.
     """
     try:
-        stock1 = yf.Ticker(ticker1)
-        stock2 = yf.Ticker(ticker2)
-        hist1 = stock1.history(period="1d")
-        hist2 = stock2.history(period="1d")
-        price1 = hist1['Close'][0]
-        price2 = hist2['Close'][0]
+        price1, price2 = await asyncio.gather(quotes.latest_close(ticker1), quotes.latest_close(ticker2))
         diff = price1 - price2
         diff_pct = (diff / price2) * 100 if price2 != 0 else 0
 
@@ -52,15 +169,15 @@ def compare_stock(ticker1: str, ticker2: str) -> str:
         return f"Error comparing stocks {ticker1} and {ticker2}: {e}"
 
 @mcp.tool()
-def historical_data(ticker: str, period: str = "1mo") -> str:
+@stats.instrument
+async def historical_data(ticker: str, period: str = "1mo") -> str:
     """
     Fetch historical stock data for a ticker over a given period.
     Period examples: '1d', '5d', '1mo', '3mo', '1y', '5y', 'max'
     Returns a summary of the data.
     """
     try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period=period)
+        hist = await quotes.history(ticker, period)
         if hist.empty:
             return f"No historical data found for {ticker} over period '{period}'."
         
@@ -70,5 +187,42 @@ def historical_data(ticker: str, period: str = "1mo") -> str:
     except Exception as e:
         return f"Error fetching historical data for {ticker}: {e}"
 
+@mcp.tool()
+@stats.instrument
+async def indicators(ticker: str, period: str = "1y", metrics: list[str] = None, window: int = 20) -> dict:
+    """
+    Technical indicators for a ticker over a period, as compact numbers.
+    metrics: any of 'returns', 'volatility' (rolling over `window` >= 2 days, annualized),
+    'sma' (20/50/200), 'ema' (12/26 and MACD), 'rsi' (14) and 'drawdown'; default all.
+    """
+    try:
+        hist = await quotes.history(ticker, period)
+        if hist.empty:
+            return {"error": f"No historical data found for {ticker} over period '{period}'."}
+        values = await offload.call("indicators", compute_indicators, hist, metrics, window)
+        return {"ticker": ticker.upper(), "period": period, **values}
+    except Exception as e:
+        return {"error": f"Error computing indicators for {ticker}: {e}"}
+
+@mcp.tool()
+@stats.instrument
+async def portfolio_risk(holdings: dict[str, float], period: str = "1y",
+                         confidence: float = 0.95, horizon_days: int = 1) -> dict:
+    """
+    Risk of a portfolio given as {ticker: position value}: annualized volatility,
+    historical and parametric VaR / expected shortfall at `confidence` (0-1) over
+    `horizon_days` (>= 1), average correlation and each holding's share of the risk.
+    """
+    try:
+        holdings = {ticker.upper(): value for ticker, value in holdings.items()}
+        frames = await quotes.histories(list(holdings), period)
+        missing = [ticker for ticker, hist in frames.items() if hist.empty]
+        if missing:
+            return {"error": f"No historical data for {', '.join(missing)} over period '{period}'."}
+        report = await offload.call("portfolio_risk", portfolio_risk_report, frames, holdings, confidence, horizon_days)
+        return {"period": period, **report}
+    except Exception as e:
+        return {"error": f"Error computing portfolio risk: {e}"}
+
 if __name__ == "__main__":
     mcp.run()
@@ -1,12 +1,16 @@
 from flask import Flask, Response, request, jsonify, render_template, send_from_directory, stream_with_context
 from llama_cpp import Llama
 from milvus_rag import MilvusRAG
-from mcp_client import MCPHealthcareClient, run_async
+from mcp_client import MCPHealthcareClient, TOOL_CACHE_TTLS, get_background_loop, run_async
 from agents import DiagnosisAgent, PrescriptionAgent, EducationAgent
 from rag_agent import RAGAgent
 import os
-import asyncio
+import sys
 import logging
+import threading
+# Modules shared by every app live in ../common
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common.tool_cache import ToolResultCache
 
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
@@ -42,14 +46,20 @@ for output in llm(prompt=prompt, max_tokens=50, stream=True):
     print(output['choices'][0]['text'].strip(), end="", flush=True)
 print()
 
-# Global MCP client instance
+# All MCP work runs on one long-lived background loop; sync handlers submit to it
+MCP_CALL_TIMEOUT = float(os.environ.get("MCP_CALL_TIMEOUT", 30))
+background_loop = get_background_loop()
+
+# Global MCP client instance, opened on the background loop
 mcp_client = None
+mcp_client_lock = threading.Lock()
 
-async def get_mcp_client():
+def get_mcp_client():
     global mcp_client
-    if mcp_client is None:
-        mcp_client = MCPHealthcareClient()
-        await mcp_client.__aenter__()
+    with mcp_client_lock:
+        if mcp_client is None:
+            client = MCPHealthcareClient(cache=ToolResultCache(TOOL_CACHE_TTLS))
+            mcp_client = background_loop.enter(client, timeout=MCP_CALL_TIMEOUT)
     return mcp_client
 
 # diagnosis_agent = DiagnosisAgent(mcp_client)
@@ -77,11 +87,10 @@ class MultiAgentOrchestrator:
 
 orchestrator = None
 
-async def get_orchestrator():
+def get_orchestrator():
     global orchestrator
     if orchestrator is None:
-        client = await get_mcp_client()
-        orchestrator = MultiAgentOrchestrator(client)
+        orchestrator = MultiAgentOrchestrator(get_mcp_client())
     return orchestrator
 
 
@@ -111,27 +120,27 @@ def index():
     return render_template("chat.html")
 
 @app.route('/diagnose', methods=['POST'])
-async def diagnose():
-    data = await request.get_json()
+def diagnose():
+    data = request.get_json()
     symptoms = data.get('symptoms')
     if not symptoms:
         return jsonify({"error": "Missing 'symptoms'"}), 400
 
     try:
-        client = await get_mcp_client()
-        response = await client.call_tool("diagnose_symptoms", symptoms)
+        client = get_mcp_client()
+        response = run_async(client.call_tool("diagnose_symptoms", symptoms), timeout=MCP_CALL_TIMEOUT)
         return jsonify({"diagnosis": response})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/shutdown', methods=['POST'])
-async def shutdown():
+def shutdown():
     global mcp_client, orchestrator
-    if orchestrator:
+    with mcp_client_lock:
         orchestrator = None
-    if mcp_client:
-        await mcp_client.__aexit__(None, None, None)
-        mcp_client = None
+        if mcp_client:
+            background_loop.exit(mcp_client, timeout=MCP_CALL_TIMEOUT)
+            mcp_client = None
     return jsonify({"status": "MCP client shutdown successfully"})
 
 
@@ -139,21 +148,7 @@ def stream_response(async_gen):
     """
     Convert async generator to sync generator for Flask streaming.
     """
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    agen = async_gen.__aiter__()
-
-    def gen():
-        try:
-            while True:
-                token = loop.run_until_complete(agen.__anext__())
-                yield token
-        except StopAsyncIteration:
-            pass
-        finally:
-            loop.close()
-
-    return gen()
+    return background_loop.iterate(async_gen, timeout=MCP_CALL_TIMEOUT)
 
 @app.route('/multiagent', methods=['POST'])
 def multiagent():
@@ -162,8 +157,9 @@ def multiagent():
     if not symptoms:
         return jsonify({"error": "Missing 'symptoms' field"}), 400
 
+    agent = get_orchestrator()
+
     async def generate():
-        agent = await get_orchestrator()
         # First stream diagnosis tokens
         diagnosis_tokens = []
         async for token in agent.diagnose_stream(symptoms):
@@ -173,10 +169,12 @@ def multiagent():
         diagnosis = ''.join(diagnosis_tokens)
 
         # Stream treatment tokens
+        yield "\n"
         async for token in agent.prescribe_stream(diagnosis):
             yield token
 
         # Stream specialist tokens
+        yield "\n"
         async for token in agent.suggest_specialist_stream(diagnosis):
             yield token
 
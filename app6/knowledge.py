@@ -0,0 +1,163 @@
+"""
+Symptom and condition knowledge for the healthcare tools, loaded once from a
+JSON file (data/conditions.json, or HEALTH_KNOWLEDGE_FILE).
+
+    kb = KnowledgeBase.load()
+    kb.diagnose("I have a fever and a dry cough", k=3)  # [(Condition, score), ...]
+    kb.first_condition("Possible diagnoses based on symptoms: flu, asthma")
+
+Symptom and condition names (with their synonyms and aliases) are found with
+one Aho-Corasick pass over the text, so matching costs the length of the text
+plus the number of hits, not the number of names. Conditions are scored
+through a sparse symptom x condition weight matrix in CSR form: only the rows
+of the symptoms found are read, so ranking costs the number of (symptom,
+condition) pairs touched, not the size of the table.
+"""
+
+import heapq
+import json
+import os
+from array import array
+from collections import deque
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "conditions.json")
+
+
+class AhoCorasick:
+    """Finds every occurrence of a set of phrases in one pass; matches are whole words."""
+
+    def __init__(self, phrases):
+        # phrases: iterable of (text, value); text is matched lower-cased
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]  # state -> [(length, value)] of phrases ending here
+        for text, value in phrases:
+            state = 0
+            for char in text.lower():
+                state = self._goto[state].get(char) or self._add_state(state, char)
+            self._out[state].append((len(text), value))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _add_state(self, state, char):
+        self._goto.append({})
+        self._fail.append(0)
+        self._out.append([])
+        self._goto[state][char] = len(self._goto) - 1
+        return len(self._goto) - 1
+
+    def find(self, text):
+        """(start, end, value) for each whole-word phrase occurrence in `text`."""
+        text = text.lower()
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, value in self._out[state]:
+                start = end - length
+                if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                    yield start, end, value
+
+
+class Condition:
+    def __init__(self, name, treatment=None, specialist=None):
+        self.name = name
+        self.treatment = treatment
+        self.specialist = specialist
+
+    def __repr__(self):
+        return f"Condition({self.name!r})"
+
+
+class KnowledgeBase:
+    def __init__(self, symptoms, conditions):
+        """
+        `symptoms` maps a symptom to its synonyms; `conditions` is a list of
+        dicts with name, optional aliases, symptoms ({symptom: weight}),
+        treatment and specialist. Earlier conditions win ties when ranking.
+        Names, synonyms and aliases must be non-empty (an empty phrase would
+        match everywhere).
+        """
+        for name, synonyms in symptoms.items():
+            if not all(phrase.strip() for phrase in [name, *synonyms]):
+                raise ValueError(f"Symptom {name!r} has an empty name or synonym")
+        for condition in conditions:
+            if not all(phrase.strip() for phrase in [condition["name"], *condition.get("aliases", [])]):
+                raise ValueError(f"Condition {condition['name']!r} has an empty name or alias")
+        symptom_ids = {name: i for i, name in enumerate(symptoms)}
+        self.symptoms = list(symptoms)
+        self.conditions = [Condition(c["name"], c.get("treatment"), c.get("specialist")) for c in conditions]
+
+        # CSR rows: symptom -> (condition, weight) pairs
+        rows = [[] for _ in self.symptoms]
+        for column, condition in enumerate(conditions):
+            for symptom, weight in condition.get("symptoms", {}).items():
+                if symptom not in symptom_ids:
+                    raise ValueError(f"Condition {condition['name']!r} uses unknown symptom {symptom!r}")
+                rows[symptom_ids[symptom]].append((column, float(weight)))
+        self.indptr = array("l", [0])
+        self.indices = array("l")
+        self.weights = array("d")
+        for row in rows:
+            for column, weight in row:
+                self.indices.append(column)
+                self.weights.append(weight)
+            self.indptr.append(len(self.indices))
+
+        self._symptom_matcher = AhoCorasick(
+            (phrase, symptom_ids[name]) for name, synonyms in symptoms.items() for phrase in [name, *synonyms]
+        )
+        self._condition_matcher = AhoCorasick(
+            (phrase, column)
+            for column, condition in enumerate(conditions)
+            for phrase in [condition["name"], *condition.get("aliases", [])]
+        )
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or os.environ.get("HEALTH_KNOWLEDGE_FILE") or DEFAULT_PATH
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["symptoms"], data["conditions"])
+
+    def match_symptoms(self, text):
+        """Ids of the symptoms mentioned in `text`, in order of first mention."""
+        return list(dict.fromkeys(value for _, _, value in self._symptom_matcher.find(text)))
+
+    def diagnose(self, text, k=5):
+        """Top `k` (Condition, score) for the symptoms in `text`, best first."""
+        scores = {}
+        for symptom in self.match_symptoms(text):
+            for i in range(self.indptr[symptom], self.indptr[symptom + 1]):
+                column = self.indices[i]
+                scores[column] = scores.get(column, 0.0) + self.weights[i]
+        best = heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.conditions[column], round(score, 3)) for column, score in best]
+
+    def conditions_in(self, text):
+        """Conditions named in `text` (by name or alias), in order of first mention."""
+        # the longest phrase wins where several start at the same place ("stomach flu" over "flu")
+        hits = sorted(self._condition_matcher.find(text), key=lambda hit: (hit[0], -hit[1]))
+        found, covered = [], 0
+        for start, end, column in hits:
+            if start >= covered:
+                found.append(column)
+                covered = end
+        return [self.conditions[column] for column in dict.fromkeys(found)]
+
+    def first_condition(self, text, field=None):
+        """First condition named in `text`; with `field`, the first that has it set."""
+        for condition in self.conditions_in(text):
+            if field is None or getattr(condition, field):
+                return condition
+        return None
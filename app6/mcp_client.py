@@ -1,28 +1,54 @@
 import asyncio
+import concurrent.futures
 import os
+import sys
+import threading
 import logging
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+# Modules shared by every app live in ../common
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common.tool_cache import MISSING
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The healthcare tools are pure lookups, so their results can be reused (seconds)
+TOOL_CACHE_TTLS = {
+    "diagnose_symptoms": 300,
+    "recommend_treatment": 300,
+    "suggest_specialist": 300,
+}
+
 class MCPHealthcareClient:
-    def __init__(self, command="python", args=None, timeout=30):
+    def __init__(self, command="python", args=None, timeout=30, max_concurrency=8, cache=None):
         if args is None:
             args = [os.path.abspath("mcp_server.py")]
         self.server_params = StdioServerParameters(command=command, args=args)
         self.session = None
         self._client_context = None
         self._timeout = timeout
+        self.cache = cache
+        # Responses are matched to requests by JSON-RPC id, so several calls can
+        # share the session; this caps how many are in flight at once.
+        self._in_flight = asyncio.Semaphore(max_concurrency)
+        self._input_params = {}
 
     async def __aenter__(self):
         logger.info("Starting MCP client connection...")
         self._client_context = stdio_client(self.server_params)
         try:
-            read, write = await asyncio.wait_for(self._client_context.__aenter__(), timeout=self._timeout)
-            self.session = ClientSession(read, write)
+            # The stdio task group must be entered by this task, so only the
+            # requests themselves are wrapped in wait_for.
+            read, write = await self._client_context.__aenter__()
+            self.session = await ClientSession(read, write).__aenter__()
             await asyncio.wait_for(self.session.initialize(), timeout=self._timeout)
+            tools = await asyncio.wait_for(self.session.list_tools(), timeout=self._timeout)
+            # Tools take a single text argument; remember its name per tool.
+            self._input_params = {
+                tool.name: next(iter(tool.inputSchema.get("properties", {})), None)
+                for tool in tools.tools
+            }
             logger.info("MCP client connected and initialized.")
             return self
         except asyncio.TimeoutError:
@@ -34,7 +60,7 @@ class MCPHealthcareClient:
         logger.info("Closing MCP client connection...")
         if self.session:
             try:
-                await self.session.close()
+                await self.session.__aexit__(exc_type, exc, tb)
             except Exception as e:
                 logger.warning(f"Error closing MCP session: {e}")
             self.session = None
@@ -46,28 +72,187 @@ class MCPHealthcareClient:
             self._client_context = None
         logger.info("MCP client closed.")
 
-    async def call_tool(self, tool_name: str, input_str: str):
+    def _arguments(self, tool_name: str, tool_input) -> dict:
+        if isinstance(tool_input, dict):
+            return tool_input
+        param = self._input_params.get(tool_name)
+        if param is None:
+            raise ValueError(f"Unknown MCP tool '{tool_name}'")
+        return {param: tool_input}
+
+    @staticmethod
+    def _result_text(tool_name: str, result) -> str:
+        text = "\n".join(block.text for block in result.content if hasattr(block, "text"))
+        if result.isError:
+            raise RuntimeError(f"MCP tool '{tool_name}' failed: {text}")
+        return text
+
+    async def _call(self, tool_name: str, arguments: dict, progress_callback=None):
         if not self.session:
             raise RuntimeError("Client session not initialized. Use 'async with MCPHealthcareClient()'.")
         try:
-            response = await self.session.call(tool_name, input_str)
-            return response
+            async with self._in_flight:
+                return await self.session.call_tool(
+                    tool_name, arguments, progress_callback=progress_callback
+                )
         except Exception as e:
             logger.error(f"Error calling MCP tool '{tool_name}': {e}")
             raise
 
+    def _cached(self, tool_name: str, arguments: dict):
+        if self.cache is None:
+            return MISSING, None
+        return self.cache.lookup(tool_name, arguments)
+
+    def _store(self, tool_name: str, arguments: dict, text: str, epoch):
+        if self.cache is not None:
+            self.cache.invalidate(tool_name)
+            self.cache.put(tool_name, arguments, text, epoch)
+
+    async def call_tool(self, tool_name: str, input_str):
+        arguments = self._arguments(tool_name, input_str)
+        cached, epoch = self._cached(tool_name, arguments)
+        if cached is not MISSING:
+            return cached
+        text = self._result_text(tool_name, await self._call(tool_name, arguments))
+        self._store(tool_name, arguments, text, epoch)
+        return text
+
+    async def stream_tool(self, tool_name: str, input_str):
+        """
+        Async iterator over a tool's output as it is produced.
+
+        Text chunks arrive as MCP progress notifications while the tool runs;
+        tools that don't stream yield their final result as a single chunk.
+        """
+        arguments = self._arguments(tool_name, input_str)
+        cached, epoch = self._cached(tool_name, arguments)
+        if cached is not MISSING:
+            yield cached
+            return
+
+        chunks = asyncio.Queue()
+
+        async def on_progress(progress, total, message):
+            if message:
+                chunks.put_nowait(message)
+
+        call = asyncio.create_task(self._call(tool_name, arguments, on_progress))
+        streamed = False
+        try:
+            while True:
+                next_chunk = asyncio.create_task(chunks.get())
+                done, _ = await asyncio.wait({next_chunk, call}, return_when=asyncio.FIRST_COMPLETED)
+                if next_chunk not in done:
+                    next_chunk.cancel()
+                    break
+                streamed = True
+                yield next_chunk.result()
+            # Progress notifications are delivered before the response, so
+            # whatever is still queued belongs to this call.
+            while not chunks.empty():
+                streamed = True
+                yield chunks.get_nowait()
+            text = self._result_text(tool_name, call.result())
+            self._store(tool_name, arguments, text, epoch)
+            if not streamed:
+                yield text
+        finally:
+            if not call.done():
+                call.cancel()
+
+    async def call_tools_many(self, calls, return_exceptions=False):
+        """
+        Run several tool calls concurrently over this session.
+
+        `calls` is an iterable of `(tool_name, input)` pairs; results come back
+        in the same order.
+        """
+        return await asyncio.gather(
+            *(self.call_tool(tool_name, tool_input) for tool_name, tool_input in calls),
+            return_exceptions=return_exceptions,
+        )
+
+class BackgroundLoop:
+    """
+    One long-lived asyncio loop in a daemon thread for sync (Flask) code.
+
+    MCP sessions are bound to the loop they were opened on, so they are all
+    opened, used and closed here. Coroutines and async generators are handed
+    over through futures; `timeout` applies per call and cancels the work on
+    the loop when it expires.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="mcp-loop", daemon=True)
+        self._thread.start()
+        self._held = {}
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro, timeout=None):
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def iterate(self, agen, timeout=None):
+        """Drive an async generator on the loop and yield its items synchronously."""
+        try:
+            while True:
+                try:
+                    yield self.run(agen.__anext__(), timeout)
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.run(agen.aclose(), timeout)
+
+    async def _hold(self, cm, ready, release):
+        # Enter and exit happen in this one task, as anyio's task groups require.
+        try:
+            async with cm as value:
+                ready.set_result(value)
+                await release.wait()
+        except Exception as e:
+            if ready.done():
+                raise
+            ready.set_exception(e)
+
+    def enter(self, cm, timeout=None):
+        """Enter an async context manager on the loop and keep it open until `exit`."""
+        async def start():
+            ready = self._loop.create_future()
+            release = asyncio.Event()
+            task = asyncio.create_task(self._hold(cm, ready, release))
+            value = await ready
+            self._held[id(value)] = (release, task)
+            return value
+
+        return self.run(start(), timeout)
+
+    def exit(self, value, timeout=None):
+        async def stop():
+            release, task = self._held.pop(id(value))
+            release.set()
+            await task
+
+        self.run(stop(), timeout)
+
+
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+def get_background_loop() -> BackgroundLoop:
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = BackgroundLoop()
+    return _background_loop
+
 # Helper to run async from sync code if needed
-def run_async(coro):
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-    if loop.is_running():
-        new_loop = asyncio.new_event_loop()
-        result = new_loop.run_until_complete(coro)
-        new_loop.close()
-        return result
-    else:
-        return loop.run_until_complete(coro)
+def run_async(coro, timeout=None):
+    return get_background_loop().run(coro, timeout)
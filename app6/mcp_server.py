@@ -1,51 +1,78 @@
+import os
 import sys
 import logging
-from fastmcp import FastMCP
+from fastmcp import FastMCP, Context
+# Modules shared by every app live in ../common
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common.instrumentation import ToolStats
+from knowledge import KnowledgeBase
 
 logging.basicConfig(stream=sys.stderr, level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 mcp = FastMCP("HealthcareAssistant")
+stats = ToolStats(mcp)
+
+# Symptoms, conditions, treatments and specialists (data/conditions.json)
+knowledge = KnowledgeBase.load()
+logger.info(f"Loaded {len(knowledge.conditions)} conditions and {len(knowledge.symptoms)} symptoms")
+
+
+class TextStream:
+    """
+    Sends text chunks to the client as MCP progress notifications while the
+    tool is still running, and keeps the full text for the final result.
+    Clients that did not ask for progress just get the return value.
+    """
+
+    def __init__(self, ctx: Context):
+        self.ctx = ctx
+        self.parts = []
+
+    async def send(self, chunk: str):
+        self.parts.append(chunk)
+        await self.ctx.report_progress(len(self.parts), None, chunk)
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
 
 @mcp.tool()
-def diagnose_symptoms(symptoms: str) -> str:
-    # Simulated diagnosis logic
-    mapping = {
-        "fever": "flu, COVID-19, malaria",
-        "cough": "bronchitis, asthma, COVID-19",
-        "headache": "migraine, tension headache, flu",
-    }
-    found = []
-    for symptom in mapping:
-        if symptom in symptoms.lower():
-            found.append(mapping[symptom])
-    if found:
-        return f"Possible diagnoses based on symptoms: {', '.join(set(', '.join(found).split(', ')))}"
-    return "No diagnosis found for given symptoms."
+@stats.instrument
+async def diagnose_symptoms(symptoms: str, ctx: Context, top_k: int = 5) -> str:
+    # Conditions ranked by how well they match the symptoms mentioned
+    stream = TextStream(ctx)
+    for i, (condition, _) in enumerate(knowledge.diagnose(symptoms, top_k)):
+        prefix = ", " if i else "Possible diagnoses based on symptoms: "
+        await stream.send(prefix + condition.name)
+    if not stream.parts:
+        await stream.send("No diagnosis found for given symptoms.")
+    return stream.text
 
 @mcp.tool()
-def recommend_treatment(diagnosis: str) -> str:
-    treatments = {
-        "flu": "rest, fluids, paracetamol",
-        "covid-19": "isolation, hydration, medical supervision",
-        "asthma": "inhalers, avoid triggers",
-    }
-    for key in treatments:
-        if key in diagnosis.lower():
-            return f"Recommended treatment for {key}: {treatments[key]}"
-    return "No treatment recommendations available."
+@stats.instrument
+async def recommend_treatment(diagnosis: str, ctx: Context) -> str:
+    stream = TextStream(ctx)
+    condition = knowledge.first_condition(diagnosis, "treatment")
+    if condition is None:
+        await stream.send("No treatment recommendations available.")
+        return stream.text
+    await stream.send(f"Recommended treatment for {condition.name}: ")
+    await stream.send(condition.treatment)
+    return stream.text
 
 @mcp.tool()
-def suggest_specialist(diagnosis: str) -> str:
-    specialists = {
-        "flu": "General Physician",
-        "covid-19": "Infectious Disease Specialist",
-        "asthma": "Pulmonologist",
-    }
-    for key in specialists:
-        if key in diagnosis.lower():
-            return f"Suggested specialist: {specialists[key]}"
-    return "No specialist suggestion available."
+@stats.instrument
+async def suggest_specialist(diagnosis: str, ctx: Context) -> str:
+    stream = TextStream(ctx)
+    condition = knowledge.first_condition(diagnosis, "specialist")
+    if condition is None:
+        await stream.send("No specialist suggestion available.")
+        return stream.text
+    await stream.send("Suggested specialist: ")
+    await stream.send(condition.specialist)
+    return stream.text
 
 if __name__ == "__main__":
     logger.info("Starting MCP server...")
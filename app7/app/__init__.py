@@ -1,6 +1,6 @@
 from flask import Flask
 from flask_migrate import Migrate
-from .extensions import db, bcrypt, login_manager
+from .extensions import db, bcrypt, login_manager, mcp_pool
 from .routes.main import main_bp
 from .routes.auth import auth_bp
 from .routes.quiz import quiz_bp
@@ -16,6 +16,7 @@ def create_app():
     db.init_app(app)
     bcrypt.init_app(app)
     login_manager.init_app(app)
+    mcp_pool.init_app(app)
     migrate = Migrate(app, db)
 
     # Import models to register tables
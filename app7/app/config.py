@@ -5,3 +5,10 @@ class Config:
     basedir = os.path.abspath(os.path.dirname(__file__))
     SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(basedir, 'database.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    MCP_POOL_SIZE = int(os.environ.get('MCP_POOL_SIZE', 4))
+    MCP_LEASE_TIMEOUT = float(os.environ.get('MCP_LEASE_TIMEOUT', 30))
+    MCP_HEALTH_CHECK_INTERVAL = float(os.environ.get('MCP_HEALTH_CHECK_INTERVAL', 30))
+    MCP_MAX_CONCURRENCY = int(os.environ.get('MCP_MAX_CONCURRENCY', 8))
+    # e.g. http://127.0.0.1:8000/mcp to share one `mcp_server.py --transport streamable-http`
+    MCP_SERVER_URL = os.environ.get('MCP_SERVER_URL')
+    MCP_CACHE_MAX_ENTRIES = int(os.environ.get('MCP_CACHE_MAX_ENTRIES', 1024))
@@ -1,6 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_login import LoginManager
+from .services.mcp_client import MCPSessionPool
 
 
 
@@ -9,6 +10,7 @@ bcrypt = Bcrypt()
 login_manager = LoginManager()
 login_manager.login_view = 'auth.login'
 login_manager.login_message_category = 'info'
+mcp_pool = MCPSessionPool()
 
 from .models.user import User  # noqa: E402
 
@@ -1,9 +1,8 @@
 from flask import Blueprint, request, jsonify, render_template
 from flask_login import login_required, current_user
 from ..models.chat import ChatMessage
-from ..extensions import db
+from ..extensions import db, mcp_pool
 from ..services.multi_agent import TodoAgent, CalculatorAgent, RAGAgent, AgentOrchestrator
-from ..services.mcp_client import MCPClientWrapper
 from ..services.service import llm
 import asyncio
 import logging
@@ -49,8 +48,8 @@ async def chat_message():
         conversation_history.append({"role": role, "content": msg.message})
 
     try:
-        # Initialize MCP client with async context manager
-        async with MCPClientWrapper() as mcp_client:
+        # Lease a long-lived MCP session from the shared pool
+        async with mcp_pool.lease() as mcp_client:
             # Instantiate agents with the MCP client and LLM callable
             todo_agent = TodoAgent(mcp_client)
             calculator_agent = CalculatorAgent(mcp_client)
@@ -1,23 +1,102 @@
 # app/services/mcp_client.py
 
 import asyncio
+import atexit
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager
+
 from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+
+# Modules shared by every app live in the repository's common/ package
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, os.pardir))
+from common.tool_cache import MISSING, ToolResultCache
+
+logger = logging.getLogger(__name__)
+
+# Read-only todo server tools and how long their results stay fresh (seconds)
+TOOL_CACHE_TTLS = {"list_todos": 5, "calculate": 300, "calculate_many": 300}
+# Mutating tools and the cached reads they make stale
+TOOL_CACHE_INVALIDATES = {
+    "add_todo": ["list_todos"],
+    "update_todo": ["list_todos"],
+    "delete_todo": ["list_todos"],
+    "add_todos": ["list_todos"],
+    "update_todos": ["list_todos"],
+    "delete_todos": ["list_todos"],
+}
+
+
+class MCPToolsMixin:
+    """Batch calls and todo server tool wrappers on top of `call_tool`."""
+
+    async def call_tools_many(self, calls, return_exceptions=False):
+        """
+        Issue several tool calls concurrently over the same session.
+
+        `calls` is an iterable of `(tool_name, params)` pairs. Results are
+        returned in the same order; in-flight requests are bounded by the
+        session's `max_concurrency`.
+        """
+        return await asyncio.gather(
+            *(self.call_tool(tool_name, params) for tool_name, params in calls),
+            return_exceptions=return_exceptions,
+        )
+
+    async def list_todos(self, query: str = None, limit: int = None, cursor: str = None,
+                         done: bool = None, fields: list = None):
+        params = {"query": query, "limit": limit, "cursor": cursor, "done": done, "fields": fields}
+        return await self.call_tool("list_todos", {k: v for k, v in params.items() if v is not None})
+
+    async def add_todo(self, task: str):
+        return await self.call_tool("add_todo", {"task": task})
+
+    async def calculate(self, expression: str):
+        return await self.call_tool("calculate", {"expression": expression})
+
 
+class MCPClientWrapper(MCPToolsMixin):
+    """
+    Client for the todo MCP server.
 
-class MCPClientWrapper:
-    def __init__(self, server_command="python", server_args=None):
+    By default it spawns `mcp_server.py` over stdio. Pass `server_url` to attach
+    to a shared server started with `--transport streamable-http` (or `sse`
+    when the URL ends in `/sse`) instead.
+    """
+
+    def __init__(self, server_command="python", server_args=None, max_concurrency=8,
+                 server_url=None, cache=None):
         if server_args is None:
             server_args = ["mcp_server.py"]
         self.server_params = StdioServerParameters(
             command=server_command, args=server_args
         )
+        self.server_url = server_url
+        self.cache = cache
         self.session = None
-        self._stdio_client = None
+        self._transport_context = None
+        # JSON-RPC requests are matched to responses by id, so many calls can be
+        # in flight on one session; this only caps how many.
+        self._in_flight = asyncio.Semaphore(max_concurrency)
+
+    def _transport(self):
+        if self.server_url is None:
+            return stdio_client(self.server_params)
+        if self.server_url.rstrip("/").endswith("/sse"):
+            return sse_client(self.server_url)
+        return streamablehttp_client(self.server_url)
 
     async def __aenter__(self):
-        self._stdio_client = await stdio_client(self.server_params).__aenter__()
-        reader, writer = self._stdio_client
+        self._transport_context = self._transport()
+        # streamablehttp_client also yields a session-id getter we don't need
+        reader, writer, *_ = await self._transport_context.__aenter__()
         self.session = await ClientSession(reader, writer).__aenter__()
         await self.session.initialize()
         return self
@@ -25,22 +104,257 @@ class MCPClientWrapper:
     async def __aexit__(self, exc_type, exc, tb):
         if self.session:
             await self.session.__aexit__(exc_type, exc, tb)
-        if self._stdio_client:
-            await self._stdio_client.__aexit__(exc_type, exc, tb)
+            self.session = None
+        if self._transport_context:
+            await self._transport_context.__aexit__(exc_type, exc, tb)
+            self._transport_context = None
 
     async def call_tool(self, tool_name: str, params: dict = None):
         if self.session is None:
             raise RuntimeError("MCPClientWrapper session is not initialized. Use 'async with MCPClientWrapper()'.")
         if params is None:
             params = {}
-        return await self.session.call_tool(tool_name, params)
+        if self.cache is not None:
+            cached, epoch = self.cache.lookup(tool_name, params)
+            if cached is not MISSING:
+                return cached
+        try:
+            async with self._in_flight:
+                result = await self.session.call_tool(tool_name, params)
+        finally:
+            # A mutation that failed in flight may still have been applied
+            if self.cache is not None:
+                self.cache.invalidate(tool_name)
+        if self.cache is not None and not result.isError:
+            self.cache.put(tool_name, params, result, epoch)
+        return result
 
-    async def list_todos(self, query: str = None):
-        params = {"query": query} if query else {}
-        return await self.call_tool("list_todos", params)
+    async def ping(self):
+        if self.session is None:
+            raise RuntimeError("MCPClientWrapper session is not initialized. Use 'async with MCPClientWrapper()'.")
+        await self.session.send_ping()
 
-    async def add_todo(self, task: str):
-        return await self.call_tool("add_todo", {"task": task})
 
-    async def calculate(self, expression: str):
-        return await self.call_tool("calculate", {"expression": expression})
+class _PooledSession:
+    """
+    One long-lived MCPClientWrapper owned by a task on the pool loop.
+
+    The stdio transport uses anyio task groups, so the client has to be entered
+    and exited by the same task; `_run` holds it open until `close` is called.
+    """
+
+    def __init__(self, client_factory):
+        self._client_factory = client_factory
+        self.client = None
+        self.last_checked = 0.0
+        self._ready = None
+        self._closing = None
+        self._task = None
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self._ready = loop.create_future()
+        self._closing = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        await self._ready
+        self.last_checked = time.monotonic()
+        return self
+
+    async def _run(self):
+        try:
+            async with self._client_factory() as client:
+                self.client = client
+                self._ready.set_result(None)
+                await self._closing.wait()
+        except Exception as e:
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            else:
+                logger.warning(f"Pooled MCP session exited: {e}")
+        finally:
+            self.client = None
+
+    @property
+    def alive(self) -> bool:
+        return self._task is not None and not self._task.done() and self.client is not None
+
+    async def healthy(self, check_interval: float, timeout: float) -> bool:
+        if not self.alive:
+            return False
+        if time.monotonic() - self.last_checked < check_interval:
+            return True
+        try:
+            await asyncio.wait_for(self.client.ping(), timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Pooled MCP session failed health check: {e}")
+            return False
+        self.last_checked = time.monotonic()
+        return True
+
+    async def close(self):
+        if self._task is None:
+            return
+        self._closing.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=5)
+        except Exception as e:
+            logger.warning(f"Error closing pooled MCP session: {e}")
+            self._task.cancel()
+
+
+class SessionLease(MCPToolsMixin):
+    """Handle to a pooled session, valid for the duration of `MCPSessionPool.lease()`."""
+
+    def __init__(self, pool, pooled):
+        self._pool = pool
+        self._pooled = pooled
+
+    async def _call(self, tool_name: str, params: dict = None):
+        # Runs on the pool loop, where the session's client is set and cleared
+        client = self._pooled.client
+        if not self._pooled.alive or client is None:
+            raise RuntimeError("Pooled MCP session is no longer connected")
+        return await client.call_tool(tool_name, params)
+
+    async def call_tool(self, tool_name: str, params: dict = None):
+        try:
+            return await self._pool.submit(self._call(tool_name, params))
+        except Exception as e:
+            if not isinstance(e, McpError):
+                # Transport-level failure: force a health check before the next lease.
+                self._pooled.last_checked = 0.0
+            raise
+
+
+class MCPSessionPool:
+    """
+    Process-wide pool of long-lived MCP sessions to `mcp_server.py`, either
+    spawned over stdio or connected to a shared server at `server_url`.
+
+    Flask runs every async view on its own short-lived event loop, so the pool
+    owns a dedicated loop in a daemon thread and all sessions live there.
+    Sessions are spawned lazily up to `size`, leased one per request, health
+    checked with a ping when they have been idle for `health_check_interval`
+    seconds and replaced when they turn out to be dead.
+    """
+
+    def __init__(self, size=4, server_command="python", server_args=None,
+                 lease_timeout=30, health_check_interval=30, max_concurrency=8,
+                 server_url=None, cache_max_entries=1024):
+        self.size = size
+        self.max_concurrency = max_concurrency
+        self.server_url = server_url
+        self.server_command = server_command
+        self.server_args = server_args
+        self.lease_timeout = lease_timeout
+        self.health_check_interval = health_check_interval
+        # Shared by every pooled session, so a write on one evicts reads on all
+        self.cache = ToolResultCache(TOOL_CACHE_TTLS, TOOL_CACHE_INVALIDATES, cache_max_entries)
+        self._loop = None
+        self._thread = None
+        self._idle = None
+        self._sessions = set()
+        self._spawning = 0
+
+    def init_app(self, app):
+        self.size = app.config.get("MCP_POOL_SIZE", self.size)
+        self.lease_timeout = app.config.get("MCP_LEASE_TIMEOUT", self.lease_timeout)
+        self.health_check_interval = app.config.get(
+            "MCP_HEALTH_CHECK_INTERVAL", self.health_check_interval
+        )
+        self.max_concurrency = app.config.get("MCP_MAX_CONCURRENCY", self.max_concurrency)
+        self.server_url = app.config.get("MCP_SERVER_URL", self.server_url)
+        self.cache.max_entries = app.config.get("MCP_CACHE_MAX_ENTRIES", self.cache.max_entries)
+        app.extensions["mcp_pool"] = self
+        self.start()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="mcp-session-pool", daemon=True
+        )
+        self._thread.start()
+        self._idle = asyncio.Queue()
+        atexit.register(self.close)
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the pool loop from synchronous code."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    async def submit(self, coro):
+        """Run a coroutine on the pool loop and await it from any other loop."""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    def _new_client(self):
+        return MCPClientWrapper(
+            self.server_command, self.server_args, self.max_concurrency, self.server_url, self.cache
+        )
+
+    async def _spawn(self):
+        self._spawning += 1
+        try:
+            pooled = await _PooledSession(self._new_client).start()
+        finally:
+            self._spawning -= 1
+        self._sessions.add(pooled)
+        return pooled
+
+    async def _discard(self, pooled):
+        self._sessions.discard(pooled)
+        await pooled.close()
+
+    async def _acquire(self):
+        while True:
+            if self._idle.empty() and len(self._sessions) + self._spawning < self.size:
+                return await self._spawn()
+            pooled = await asyncio.wait_for(self._idle.get(), timeout=self.lease_timeout)
+            if await pooled.healthy(self.health_check_interval, self.lease_timeout):
+                return pooled
+            logger.info("Replacing dead MCP session")
+            await self._discard(pooled)
+
+    async def _release(self, pooled):
+        if pooled.alive:
+            self._idle.put_nowait(pooled)
+        else:
+            await self._discard(pooled)
+
+    def _release_abandoned(self, future):
+        # The acquire may have completed after the caller gave up waiting.
+        if future.cancelled() or future.exception() is not None:
+            return
+        pooled = future.result()
+        self._loop.call_soon_threadsafe(lambda: self._loop.create_task(self._release(pooled)))
+
+    @asynccontextmanager
+    async def lease(self):
+        if self._thread is None:
+            self.start()
+        future = asyncio.run_coroutine_threadsafe(self._acquire(), self._loop)
+        try:
+            pooled = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(self._release_abandoned)
+            raise
+        try:
+            yield SessionLease(self, pooled)
+        finally:
+            await self.submit(self._release(pooled))
+
+    async def _close_all(self):
+        sessions = list(self._sessions)
+        self._sessions.clear()
+        await asyncio.gather(*(pooled.close() for pooled in sessions))
+
+    def close(self):
+        if self._thread is None:
+            return
+        try:
+            self.run(self._close_all(), timeout=10)
+        except Exception as e:
+            logger.warning(f"Error closing MCP session pool: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._thread = None
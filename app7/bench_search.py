@@ -0,0 +1,83 @@
+"""
+Search benchmark: FTS5 index vs the old `ilike('%q%')` scan for GET /tasks?q=.
+
+Builds a throwaway SQLite database with --rows generated tasks (through the
+triggers, so the index is maintained the way it is in production), then times
+each query three ways, all as GET /tasks requests through the Flask test
+client so routing and JSON costs are the same: the unpaginated ilike search
+(every match, as the old endpoint did), an ilike page of --limit rows in id
+order, and the ranked FTS page. The ilike runs switch the FTS index off.
+A limited ilike page is cheap when the term is common, since the scan stops
+early; rare or absent terms scan the whole table, which is where FTS wins.
+
+    python bench_search.py --rows 200000 --repeat 20
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+WORDS = (
+    "buy milk bread eggs call email write report review budget plan meeting book flight "
+    "hotel pay invoice rent renew passport clean garage fix bike walk dog water plants "
+    "update resume prepare slides team sync dentist doctor gym laundry groceries taxes "
+    "backup laptop order printer ink schedule interview birthday gift car service"
+).split()
+
+QUERIES = ["milk", "passport", "rep", "team sync", "dentist appointment", "zzz"]
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FTS5 vs ilike search on the todo table")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.environ["TODO_DATABASE_URI"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import flask_api  # noqa: E402
+    from flask_api import Todo, app, db  # noqa: E402
+
+    rng = random.Random(args.seed)
+    with app.app_context():
+        start = time.perf_counter()
+        for offset in range(0, args.rows, 10_000):
+            batch = min(10_000, args.rows - offset)
+            db.session.execute(
+                Todo.__table__.insert(),
+                [{"task": " ".join(rng.choices(WORDS, k=rng.randint(3, 8))), "done": rng.random() < 0.3}
+                 for _ in range(batch)],
+            )
+        db.session.commit()
+        print(f"Inserted {args.rows} tasks in {time.perf_counter() - start:.1f}s\n")
+
+        client = app.test_client()
+
+        def search(query, fts, **params):
+            flask_api.fts_enabled = fts
+            response = client.get("/tasks", query_string={"q": query, **params})
+            return response.get_json()
+
+        print(f"{'query':<22}{'ilike all':>11}{'ilike page':>12}{'fts page':>10}{'matches':>9}")
+        for query in QUERIES:
+            all_ms, matches = timed(lambda: search(query, False), args.repeat)
+            page_ms, _ = timed(lambda: search(query, False, limit=args.limit), args.repeat)
+            fts_ms, _ = timed(lambda: search(query, True, limit=args.limit), args.repeat)
+            print(f"{query:<22}{all_ms:>11.2f}{page_ms:>12.2f}{fts_ms:>10.2f}{len(matches):>9}")
+        print("\n(median ms per query)")
@@ -0,0 +1,131 @@
+"""
+Loopback benchmark: stdio vs streamable HTTP for the todo MCP server.
+
+Opens --workers client sessions, as that many Flask workers would, and has
+each one issue --calls sequential `calculate` calls (no Flask API needed).
+In stdio mode every session spawns its own mcp_server.py; in http mode one
+server is started and every session connects to it. Reports per-call latency
+and the summed RSS of the server processes.
+
+    python bench_transport.py --workers 8 --calls 200
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mcp_server.py")
+
+
+def rss_mb(pids):
+    if not pids:
+        return 0.0
+    out = subprocess.run(
+        ["ps", "-o", "rss=", "-p", ",".join(str(pid) for pid in pids)],
+        capture_output=True, text=True,
+    ).stdout
+    return sum(int(line) for line in out.split()) / 1024
+
+
+def child_pids():
+    out = subprocess.run(["pgrep", "-P", str(os.getpid())], capture_output=True, text=True).stdout
+    return [int(pid) for pid in out.split()]
+
+
+def wait_for_port(host, port, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"MCP server did not start listening on {host}:{port}")
+
+
+async def worker(session, calls, latencies):
+    for i in range(calls):
+        start = time.perf_counter()
+        await session.call_tool("calculate", {"expression": f"{i} * 2 + 1"})
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_sessions(transport_factory, workers, calls, server_pids):
+    async with AsyncExitStack() as stack:
+        sessions = []
+        for _ in range(workers):
+            read, write, *_ = await stack.enter_async_context(transport_factory())
+            session = await stack.enter_async_context(ClientSession(read, write))
+            await session.initialize()
+            sessions.append(session)
+
+        # Warm up every session before timing
+        await asyncio.gather(*(s.call_tool("calculate", {"expression": "1 + 1"}) for s in sessions))
+
+        latencies = []
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(s, calls, latencies) for s in sessions))
+        elapsed = time.perf_counter() - start
+        pids = server_pids()
+        return latencies, elapsed, len(pids), rss_mb(pids)
+
+
+def bench_stdio(workers, calls):
+    params = StdioServerParameters(command=sys.executable, args=[SERVER])
+    return asyncio.run(run_sessions(lambda: stdio_client(params), workers, calls, child_pids))
+
+
+def bench_http(workers, calls, port):
+    server = subprocess.Popen(
+        [sys.executable, SERVER, "--transport", "streamable-http", "--port", str(port)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port("127.0.0.1", port)
+        url = f"http://127.0.0.1:{port}/mcp"
+        return asyncio.run(
+            run_sessions(lambda: streamablehttp_client(url), workers, calls, lambda: [server.pid])
+        )
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def report(mode, workers, latencies, elapsed, processes, rss):
+    ms = sorted(latency * 1000 for latency in latencies)
+    if not ms:
+        print(f"{mode:<6} workers={workers:<3} calls=0")
+        return
+    # inclusive: percentiles stay within the observed latencies
+    pct = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else ms * 99
+    print(
+        f"{mode:<6} workers={workers:<3} calls={len(ms):<6} "
+        f"mean={statistics.fmean(ms):7.2f}ms p50={pct[49]:7.2f}ms "
+        f"p95={pct[94]:7.2f}ms p99={pct[98]:7.2f}ms "
+        f"throughput={len(ms) / elapsed:8.1f}/s "
+        f"server_procs={processes:<3} server_rss={rss:7.1f}MB"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=200, help="sequential calls per worker")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--mode", choices=["both", "stdio", "http"], default="both")
+    args = parser.parse_args()
+
+    if args.mode in ("both", "stdio"):
+        report("stdio", args.workers, *bench_stdio(args.workers, args.calls))
+    if args.mode in ("both", "http"):
+        report("http", args.workers, *bench_http(args.workers, args.calls, args.port))
@@ -1,8 +1,20 @@
+import logging
+import os
+import re
+import sys
+
 from flask import Flask, request, jsonify
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+# Modules shared by every app live in ../common
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common.pagination import encode_cursor, page_response, parse_list_args
+
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///todos.db"
+app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("TODO_DATABASE_URI", "sqlite:///todos.db")
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 db = SQLAlchemy(app)
 
@@ -16,14 +28,103 @@ class Todo(db.Model):
         return {"id": self.id, "task": self.task, "done": self.done}
 
 
+# Full-text search for GET /tasks?q=...: an FTS5 index over todo.task that
+# triggers keep in sync. Every word of the query is matched as a prefix and
+# results are ordered by bm25 rank, then id; search cursors carry both.
+FTS_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS todo_fts USING fts5(task, content='todo', content_rowid='id', prefix='2 3')",
+    """CREATE TRIGGER IF NOT EXISTS todo_fts_ai AFTER INSERT ON todo BEGIN
+        INSERT INTO todo_fts(rowid, task) VALUES (new.id, new.task);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS todo_fts_ad AFTER DELETE ON todo BEGIN
+        INSERT INTO todo_fts(todo_fts, rowid, task) VALUES ('delete', old.id, old.task);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS todo_fts_au AFTER UPDATE OF task ON todo BEGIN
+        INSERT INTO todo_fts(todo_fts, rowid, task) VALUES ('delete', old.id, old.task);
+        INSERT INTO todo_fts(rowid, task) VALUES (new.id, new.task);
+    END""",
+]
+
+fts_enabled = False
+
+
+def create_search_index():
+    """Create the FTS5 table and triggers; backfill it when it is new."""
+    global fts_enabled
+    try:
+        with db.engine.begin() as conn:
+            exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'todo_fts'")).first()
+            for statement in FTS_SCHEMA:
+                conn.execute(text(statement))
+            if not exists:
+                conn.execute(text("INSERT INTO todo_fts(todo_fts) VALUES ('rebuild')"))
+        fts_enabled = True
+    except OperationalError as e:
+        logger.warning(f"FTS5 unavailable, falling back to LIKE search: {e}")
+
+
+def fts_query(search_query):
+    """Turn free text into an FTS5 query: every word, as a quoted prefix."""
+    words = re.findall(r"\w+", search_query)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search_response(search_query, limit, after, done, fields):
+    match = fts_query(search_query)
+    if not match:
+        return jsonify([] if limit is None else {"tasks": [], "next_cursor": None})
+    conditions = []
+    params = {"match": match, "limit": -1 if limit is None else limit + 1}  # SQLite: -1 is no limit
+    if done is not None:
+        conditions.append("todo.done = :done")
+        params["done"] = done
+    if after is not None:
+        if "rank" not in after:
+            raise ValueError("Invalid cursor")
+        conditions.append("(hits.rank > :rank OR (hits.rank = :rank AND todo.id > :id))")
+        params.update(rank=after["rank"], id=after["id"])
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    columns = ", ".join(f"todo.{field}" for field in fields)  # fields are whitelisted
+    rows = db.session.execute(text(f"""
+        SELECT {columns}, hits.rank AS rank
+        FROM (SELECT rowid AS id, bm25(todo_fts) AS rank FROM todo_fts WHERE todo_fts MATCH :match) AS hits
+        JOIN todo ON todo.id = hits.id
+        {where}
+        ORDER BY hits.rank, todo.id
+        LIMIT :limit
+    """), params).all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(rank=last.rank, id=last.id)
+    tasks = []
+    for row in rows[:limit]:
+        task = {field: getattr(row, field) for field in fields}
+        if "done" in task:
+            task["done"] = bool(task["done"])
+        tasks.append(task)
+    if limit is None:
+        return jsonify(tasks)
+    return jsonify({"tasks": tasks, "next_cursor": next_cursor})
+
+
+# GET /tasks is paginated with keyset cursors, see common/pagination.py
 @app.route("/tasks", methods=["GET"])
 def get_tasks():
+    try:
+        page = parse_list_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     search_query = request.args.get("q", "").strip()
+    if search_query and fts_enabled:
+        try:
+            return search_response(search_query, *page)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+    query = Todo.query
     if search_query:
-        todos = Todo.query.filter(Todo.task.ilike(f"%{search_query}%")).all()
-    else:
-        todos = Todo.query.all()
-    return jsonify([todo.to_dict() for todo in todos])
+        query = query.filter(Todo.task.ilike(f"%{search_query}%"))
+    return page_response(query, Todo, *page)
 
 
 @app.route("/tasks", methods=["POST"])
@@ -62,8 +163,89 @@ def delete_task(task_id):
     return jsonify({"result": "Task deleted"})
 
 
+
+# Bulk operations: one request and one transaction for many tasks. If any id
+# is unknown nothing is changed and the missing ids are returned with a 404.
+
+def _bulk_items(data, key):
+    items = (data or {}).get(key)
+    if not isinstance(items, list) or not items:
+        return None
+    return items
+
+
+def _is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)  # True is an int too
+
+
+def _valid_update(item):
+    """An update object: an integer id, plus an optional non-empty task and boolean done."""
+    if not isinstance(item, dict) or not _is_id(item.get("id")):
+        return False
+    if "task" in item and not (isinstance(item["task"], str) and item["task"]):
+        return False
+    return "done" not in item or isinstance(item["done"], bool)
+
+
+def _missing_ids(ids, todos):
+    found = {todo.id for todo in todos}
+    return sorted(set(ids) - found)
+
+
+@app.route("/tasks/bulk", methods=["POST"])
+def add_tasks():
+    items = _bulk_items(request.get_json(silent=True), "tasks")
+    if items is None:
+        return jsonify({"error": "A non-empty 'tasks' list is required"}), 400
+    texts = [item.get("task") if isinstance(item, dict) else item for item in items]
+    if not all(isinstance(task_text, str) and task_text for task_text in texts):
+        return jsonify({"error": "Task content is required"}), 400
+    new_todos = [Todo(task=task_text) for task_text in texts]
+    db.session.add_all(new_todos)
+    db.session.commit()
+    return jsonify([todo.to_dict() for todo in new_todos]), 201
+
+
+@app.route("/tasks/bulk", methods=["PUT"])
+def update_tasks():
+    items = _bulk_items(request.get_json(silent=True), "tasks")
+    if items is None or not all(_valid_update(item) for item in items):
+        return jsonify({
+            "error": "A non-empty 'tasks' list of objects with an integer 'id' is required; "
+                     "'task' must be non-empty text and 'done' true or false"
+        }), 400
+    ids = [item["id"] for item in items]
+    todos = {todo.id: todo for todo in Todo.query.filter(Todo.id.in_(ids))}
+    missing = _missing_ids(ids, todos.values())
+    if missing:
+        return jsonify({"error": "Tasks not found", "missing": missing}), 404
+    for item in items:
+        todo = todos[item["id"]]
+        if "task" in item:
+            todo.task = item["task"]
+        if "done" in item:
+            todo.done = item["done"]
+    db.session.commit()
+    return jsonify([todos[task_id].to_dict() for task_id in dict.fromkeys(ids)])
+
+
+@app.route("/tasks/bulk", methods=["DELETE"])
+def delete_tasks():
+    ids = _bulk_items(request.get_json(silent=True), "ids")
+    if ids is None or not all(_is_id(task_id) for task_id in ids):
+        return jsonify({"error": "A non-empty 'ids' list of integers is required"}), 400
+    todos = Todo.query.filter(Todo.id.in_(ids)).all()
+    missing = _missing_ids(ids, todos)
+    if missing:
+        return jsonify({"error": "Tasks not found", "missing": missing}), 404
+    deleted = Todo.query.filter(Todo.id.in_(ids)).delete(synchronize_session=False)
+    db.session.commit()
+    return jsonify({"result": f"{deleted} tasks deleted", "deleted": deleted})
+
+
 with app.app_context():
     db.create_all()
+    create_search_index()
 
 if __name__ == "__main__":
     app.run(port=5001, debug=True)
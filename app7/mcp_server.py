@@ -1,72 +1,147 @@
-import asyncio
-import requests
+import argparse
+import os
+import sys
+
 from mcp.server.fastmcp import FastMCP
+# Modules shared by every app live in ../common
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common.http_api import APIClient
+from common.instrumentation import ToolStats
+from common.offload import Offloader
+from common.safe_eval import UnsafeExpression, evaluate, evaluate_many
+
+FLASK_API_URL = os.environ.get("FLASK_API_URL", "http://localhost:5001/tasks")
 
-mcp = FastMCP("TodoMCPServer")
+# Pooled keep-alive connections to the Flask API, closed with the last session
+api = APIClient(FLASK_API_URL)
 
-FLASK_API_URL = "http://localhost:5001/tasks"
+mcp = FastMCP("TodoMCPServer", lifespan=api.lifespan)
+stats = ToolStats(mcp)
+offload = Offloader(mcp)
 
 
 # MCP tool: list tasks by calling Flask API
 @mcp.tool()
-async def list_todos(query: str = None):
-    def fetch():
-        params = {}
-        if query:
-            params["q"] = query  # Assuming your Flask API supports a query param 'q' for filtering
-        resp = requests.get(FLASK_API_URL, params=params)
-        resp.raise_for_status()
-        return resp.json()
-
-    return await asyncio.to_thread(fetch)
+@stats.instrument
+async def list_todos(query: str = None, limit: int = 50, cursor: str = None,
+                     done: bool = None, fields: list[str] = None):
+    """
+    List tasks one page at a time, ordered by id. Pass the returned
+    `next_cursor` back as `cursor` to get the next page (it is null on the
+    last page). `limit` is capped at 200; `done` filters by status and
+    `fields` picks which of id, task, done to return (id is always included).
+    `query` runs a ranked full-text search, matching each word as a prefix.
+    """
+    params = {"limit": limit}
+    if cursor:
+        params["cursor"] = cursor
+    if done is not None:
+        params["done"] = "true" if done else "false"
+    if fields:
+        params["fields"] = ",".join(fields)
+    if query:
+        params["q"] = query
+    return await api.request("GET", params=params)
 
 
 @mcp.tool()
+@stats.instrument
 async def add_todo(task: str):
-    def post():
-        resp = requests.post(FLASK_API_URL, json={"task": task})
-        resp.raise_for_status()
-        return resp.json()
-
-    return await asyncio.to_thread(post)
+    return await api.request("POST", json={"task": task})
 
 
 # MCP tool: update a task
 @mcp.tool()
-def update_todo(task_id: int, task: str = None, done: bool = None):
+@stats.instrument
+async def update_todo(task_id: int, task: str = None, done: bool = None):
     data = {}
     if task is not None:
         data["task"] = task
     if done is not None:
         data["done"] = done
-    resp = requests.put(f"{FLASK_API_URL}/{task_id}", json=data)
-    resp.raise_for_status()
-    return resp.json()
+    return await api.request("PUT", f"/{task_id}", json=data)
 
 
 # MCP tool: delete a task
 @mcp.tool()
-def delete_todo(task_id: int):
-    resp = requests.delete(f"{FLASK_API_URL}/{task_id}")
-    resp.raise_for_status()
+@stats.instrument
+async def delete_todo(task_id: int):
+    await api.request("DELETE", f"/{task_id}")
     return {"result": "Task deleted"}
 
+# Bulk tools: one HTTP request and one database transaction for many tasks
+
+@mcp.tool()
+@stats.instrument
+async def add_todos(tasks: list[str]):
+    """Add several tasks at once."""
+    return await api.request("POST", "/bulk", json={"tasks": tasks})
+
+
+@mcp.tool()
+@stats.instrument
+async def update_todos(updates: list[dict]):
+    """
+    Update several tasks at once. Each update is {"id": ..., "task": ..., "done": ...};
+    "task" and "done" are optional. Nothing is changed if any id does not exist.
+    """
+    return await api.request("PUT", "/bulk", json={"tasks": updates})
+
+
+@mcp.tool()
+@stats.instrument
+async def delete_todos(task_ids: list[int]):
+    """Delete several tasks at once. Nothing is deleted if any id does not exist."""
+    return await api.request("DELETE", "/bulk", json={"ids": task_ids})
+
 # Other tools
 
 @mcp.tool()
+@stats.instrument
+@offload.tool()
 def calculate(expression: str) -> str:
     """
     Evaluate a simple arithmetic expression.
     """
-    import re
-    if not re.match(r'^[0-9+\-*/().\s]+$', expression):
-        return "Only basic arithmetic expressions are supported."
     try:
-        result = eval(expression, {"__builtins__": {}})
+        result = evaluate(expression)
         return f"The result is {result}."
+    except UnsafeExpression:
+        return "Only basic arithmetic expressions are supported."
+    except Exception:
+        return "Error evaluating expression."
+
+
+@mcp.tool()
+@stats.instrument
+@offload.tool(limit=4)
+def calculate_many(expression: str, variables: dict[str, list[float]]) -> str:
+    """
+    Evaluate one arithmetic expression over lists of inputs, e.g. "a * b + c"
+    with variables {"a": [1, 2], "b": [3, 4], "c": [0, 1]}.
+    """
+    try:
+        results = evaluate_many(expression, **variables)
+        return f"The results are {results}."
+    except UnsafeExpression:
+        return "Only basic arithmetic expressions are supported."
     except Exception:
         return "Error evaluating expression."
 
 
 if __name__ == "__main__":
-    asyncio.run(mcp.run(transport="stdio"))
+    # stdio gives every client a private server process; the HTTP transports
+    # let several Flask workers share one server over persistent connections.
+    parser = argparse.ArgumentParser(description="Todo MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "streamable-http", "sse"],
+        default=os.environ.get("MCP_TRANSPORT", "stdio"),
+    )
+    parser.add_argument("--host", default=os.environ.get("MCP_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("MCP_PORT", 8000)))
+    args = parser.parse_args()
+
+    mcp.settings.host = args.host
+    mcp.settings.port = args.port
+    mcp.run(transport=args.transport)
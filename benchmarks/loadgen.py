@@ -0,0 +1,214 @@
+"""
+Concurrent-session load generator for the MCP servers.
+
+Spawns a server over stdio (one process per session, as stdio is 1:1) or
+attaches to a running one over HTTP, opens --sessions client sessions and
+drives a weighted mix of tool calls for --duration seconds.
+
+With --rate > 0 calls arrive open-loop as a Poisson process at that total rate,
+and latency is measured from each call's scheduled start, so queueing inside
+the client or server is included. With --rate 0 every session issues
+--concurrency back-to-back calls (closed loop, max throughput).
+
+    # app2's Enhanced MCP Server, 8 sessions, 200 calls/s for 20 s
+    python benchmarks/loadgen.py --cwd app2 --server "python server.py" \\
+        --sessions 8 --rate 200 --duration 20
+
+    # attach to a shared HTTP server with a custom mix
+    python benchmarks/loadgen.py --url http://127.0.0.1:8000/mcp \\
+        --mix '[{"tool": "calculate", "args": {"expression": "2*21"}, "weight": 1}]'
+
+The mix is a JSON list (or @path to a JSON file) of {"tool", "args", "weight"}.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import shlex
+import statistics
+import time
+from collections import defaultdict
+from contextlib import AsyncExitStack
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+# Default mix for app2's Enhanced MCP Server
+APP2_MIX = [
+    {"tool": "add", "args": {"a": 2, "b": 3}, "weight": 3},
+    {"tool": "multiply", "args": {"a": 6, "b": 7}, "weight": 3},
+    {"tool": "divide", "args": {"a": 22, "b": 7}, "weight": 2},
+    {"tool": "chat", "args": {"message": "hello there", "session_id": "loadgen"}, "weight": 2},
+    {"tool": "weather", "args": {"location": "Lagos"}, "weight": 1},
+]
+
+
+class Results:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.started = None
+        self.finished = None
+
+    def record(self, tool, seconds, failed):
+        self.latencies[tool].append(seconds)
+        if failed:
+            self.errors[tool] += 1
+
+    @staticmethod
+    def _summary(latencies, errors, elapsed):
+        ms = sorted(latency * 1000 for latency in latencies)
+        # inclusive: percentiles stay within the observed latencies
+        pct = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else ms * 99
+        return {
+            "calls": len(ms),
+            "errors": errors,
+            "error_rate": round(errors / len(ms), 4) if ms else 0.0,
+            "throughput": round(len(ms) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(statistics.fmean(ms), 3) if ms else 0.0,
+            "p50_ms": round(pct[49], 3) if ms else 0.0,
+            "p95_ms": round(pct[94], 3) if ms else 0.0,
+            "p99_ms": round(pct[98], 3) if ms else 0.0,
+            "max_ms": round(ms[-1], 3) if ms else 0.0,
+        }
+
+    def summary(self):
+        elapsed = self.finished - self.started
+        everything = [latency for latencies in self.latencies.values() for latency in latencies]
+        return {
+            "elapsed_sec": round(elapsed, 3),
+            "total": self._summary(everything, sum(self.errors.values()), elapsed),
+            "tools": {
+                tool: self._summary(latencies, self.errors[tool], elapsed)
+                for tool, latencies in sorted(self.latencies.items())
+            },
+        }
+
+
+def load_mix(value):
+    if value is None:
+        return APP2_MIX
+    if value.startswith("@"):
+        with open(value[1:]) as f:
+            return json.load(f)
+    return json.loads(value)
+
+
+def transport_factory(args):
+    if args.url:
+        if args.url.rstrip("/").endswith("/sse"):
+            return lambda: sse_client(args.url)
+        return lambda: streamablehttp_client(args.url)
+    command, *server_args = shlex.split(args.server)
+    params = StdioServerParameters(command=command, args=server_args, cwd=args.cwd)
+    return lambda: stdio_client(params)
+
+
+async def timed_call(session, call, scheduled, results):
+    failed = True
+    try:
+        result = await session.call_tool(call["tool"], call.get("args", {}))
+        failed = result.isError
+    except Exception:
+        pass
+    results.record(call["tool"], time.perf_counter() - scheduled, failed)
+
+
+async def open_loop(sessions, mix, weights, args, results, rng):
+    in_flight = asyncio.Semaphore(args.max_in_flight)
+    tasks = set()
+
+    async def fire(session, call, scheduled):
+        async with in_flight:
+            await timed_call(session, call, scheduled, results)
+
+    deadline = results.started + args.duration
+    scheduled = results.started
+    i = 0
+    while True:
+        scheduled += rng.expovariate(args.rate)
+        if scheduled >= deadline:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        call = rng.choices(mix, weights)[0]
+        task = asyncio.create_task(fire(sessions[i % len(sessions)], call, scheduled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        i += 1
+    await asyncio.gather(*tasks)
+
+
+async def closed_loop(sessions, mix, weights, args, results, rng):
+    deadline = results.started + args.duration
+
+    async def worker(session):
+        while time.perf_counter() < deadline:
+            await timed_call(session, rng.choices(mix, weights)[0], time.perf_counter(), results)
+
+    await asyncio.gather(*(worker(s) for s in sessions for _ in range(args.concurrency)))
+
+
+async def run(args):
+    mix = load_mix(args.mix)
+    weights = [call.get("weight", 1) for call in mix]
+    rng = random.Random(args.seed)
+    results = Results()
+    factory = transport_factory(args)
+
+    async with AsyncExitStack() as stack:
+        sessions = []
+        for _ in range(args.sessions):
+            read, write, *_ = await stack.enter_async_context(factory())
+            session = await stack.enter_async_context(ClientSession(read, write))
+            await session.initialize()
+            await session.list_tools()  # warm up
+            sessions.append(session)
+
+        results.started = time.perf_counter()
+        if args.rate > 0:
+            await open_loop(sessions, mix, weights, args, results, rng)
+        else:
+            await closed_loop(sessions, mix, weights, args, results, rng)
+        results.finished = time.perf_counter()
+    return results.summary()
+
+
+def print_summary(summary):
+    header = f"{'tool':<20}{'calls':>8}{'err%':>8}{'calls/s':>10}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"
+    print(header)
+    print("-" * len(header))
+    rows = list(summary["tools"].items()) + [("TOTAL", summary["total"])]
+    for tool, s in rows:
+        print(
+            f"{tool:<20}{s['calls']:>8}{s['error_rate'] * 100:>7.2f}%{s['throughput']:>10.1f}"
+            f"{s['mean_ms']:>10.2f}{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}{s['p99_ms']:>10.2f}{s['max_ms']:>10.2f}"
+        )
+    print(f"(latencies in ms over {summary['elapsed_sec']} s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--server", default="python server.py", help="command that starts a stdio server")
+    target.add_argument("--url", help="attach to a streamable-http (or /sse) server instead")
+    parser.add_argument("--cwd", default=None, help="working directory for --server")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=0, help="total calls/s; 0 runs closed loop")
+    parser.add_argument("--concurrency", type=int, default=1, help="in-flight calls per session (closed loop)")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="cap on outstanding calls (open loop)")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--mix", default=None, help="JSON list or @file; defaults to an app2 mix")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", default=None, help="also write the summary to this file")
+    args = parser.parse_args()
+
+    summary = asyncio.run(run(args))
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
@@ -0,0 +1,4 @@
+"""
+Modules shared by the example apps. Each app's server puts the repository
+root on `sys.path` and imports them as `common.<module>`.
+"""
@@ -0,0 +1,76 @@
+"""
+Pooled async HTTP access to a JSON API for MCP servers.
+
+    api = APIClient("http://localhost:5001/tasks")
+    mcp = FastMCP("TodoMCPServer", lifespan=api.lifespan)
+
+    @mcp.tool()
+    async def list_todos():
+        return await api.request("GET")
+
+One keep-alive connection pool is shared by every tool call (and every
+session when served over HTTP). The transport retries failed connects;
+idempotent requests are also retried on transient errors and 502/503/504
+responses, with exponential backoff.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30)
+HTTP_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+HTTP_RETRIES = 3
+HTTP_RETRY_BACKOFF = 0.2
+HTTP_RETRY_STATUSES = {502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "PUT", "DELETE"}
+
+
+class APIClient:
+    def __init__(self, base_url, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT, retries=HTTP_RETRIES,
+                 backoff=HTTP_RETRY_BACKOFF, transport=None):
+        self.base_url = base_url
+        self.limits = limits
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._transport = transport  # e.g. httpx.MockTransport in tests
+        self._http = None
+        self._sessions = 0
+
+    def client(self) -> httpx.AsyncClient:
+        """The shared client, created on first use (and again after it was closed)."""
+        if self._http is None or self._http.is_closed:
+            # the pool limits belong to the transport; AsyncClient ignores its
+            # own `limits` when a transport is passed
+            transport = self._transport or httpx.AsyncHTTPTransport(retries=self.retries, limits=self.limits)
+            self._http = httpx.AsyncClient(timeout=self.timeout, transport=transport)
+        return self._http
+
+    @asynccontextmanager
+    async def lifespan(self, server):
+        # FastMCP enters the lifespan once per client session; close the pool
+        # when the last session ends.
+        self._sessions += 1
+        try:
+            yield
+        finally:
+            self._sessions -= 1
+            if self._sessions == 0 and self._http is not None:
+                await self._http.aclose()
+
+    async def request(self, method: str, path: str = "", **kwargs):
+        attempts = self.retries + 1 if method in IDEMPOTENT_METHODS else 1
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                resp = await self.client().request(method, self.base_url + path, **kwargs)
+            except httpx.TransportError:
+                if last:
+                    raise
+            else:
+                if resp.status_code not in HTTP_RETRY_STATUSES or last:
+                    resp.raise_for_status()
+                    return resp.json()
+            await asyncio.sleep(self.backoff * 2 ** attempt)
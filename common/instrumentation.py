@@ -0,0 +1,146 @@
+"""
+Per-tool latency and throughput statistics for FastMCP servers.
+
+    mcp = FastMCP("My Server")
+    stats = ToolStats(mcp)  # also registers the `server_stats` tool
+
+    @mcp.tool()
+    @stats.instrument
+    def my_tool(...): ...
+
+Set MCP_STATS_FILE (or pass `dump_path`) to write the final numbers as JSON
+when the server exits.
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Histogram bucket upper bounds in seconds: 10 us doubling up to ~168 s
+LATENCY_BUCKETS = tuple(1e-5 * 2 ** i for i in range(25))
+
+
+class ToolMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, seconds: float, failed: bool):
+        self.calls += 1
+        if failed:
+            self.errors += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Estimate the q-th quantile by interpolating inside its histogram bucket."""
+        rank = q * self.calls
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            if count and seen + count >= rank:
+                lower = LATENCY_BUCKETS[i - 1] if i else 0.0
+                upper = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.max_seconds
+                upper = min(upper, self.max_seconds)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return 0.0
+
+    def snapshot(self, uptime: float) -> dict:
+        def ms(seconds):
+            return round(seconds * 1000, 3)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "calls_per_sec": round(self.calls / uptime, 3) if uptime else 0.0,
+            "mean_ms": ms(self.total_seconds / self.calls) if self.calls else 0.0,
+            "p50_ms": ms(self.percentile(0.50)),
+            "p95_ms": ms(self.percentile(0.95)),
+            "p99_ms": ms(self.percentile(0.99)),
+            "max_ms": ms(self.max_seconds),
+        }
+
+
+class ToolStats:
+    """Call counts, error counts, latency histograms and in-flight gauges per tool."""
+
+    def __init__(self, mcp=None, dump_path=None):
+        self.tools = {}
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        if mcp is not None:
+            self.register(mcp)
+        dump_path = dump_path or os.environ.get("MCP_STATS_FILE")
+        if dump_path:
+            atexit.register(self.dump, dump_path)
+
+    def _begin(self, name: str):
+        with self._lock:
+            metrics = self.tools.setdefault(name, ToolMetrics())
+            metrics.in_flight += 1
+        return time.perf_counter()
+
+    def _end(self, name: str, start: float, failed: bool):
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            metrics = self.tools[name]
+            metrics.in_flight -= 1
+            metrics.observe(elapsed, failed)
+
+    def instrument(self, fn):
+        """Wrap a tool function; put it under `@mcp.tool()`."""
+        name = fn.__name__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = self._begin(name)
+                failed = True
+                try:
+                    result = await fn(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    self._end(name, start, failed)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = self._begin(name)
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                self._end(name, start, failed)
+
+        return wrapper
+
+    def snapshot(self) -> dict:
+        uptime = time.monotonic() - self.started
+        with self._lock:
+            tools = {name: metrics.snapshot(uptime) for name, metrics in sorted(self.tools.items())}
+        return {"uptime_sec": round(uptime, 3), "tools": tools}
+
+    def register(self, mcp):
+        @mcp.tool()
+        def server_stats() -> dict:
+            """Per-tool call counts, error counts, latency percentiles and in-flight calls."""
+            return self.snapshot()
+
+    def dump(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
@@ -0,0 +1,138 @@
+"""
+Run blocking tool functions off the server's event loop.
+
+    offload = Offloader(mcp)  # also registers the `offload_stats` tool
+
+    @mcp.tool()
+    @stats.instrument
+    @offload.tool(limit=4)
+    def slow_tool(...): ...
+
+Sync tools normally run on the event loop itself, so one slow call stalls
+every other request. Decorated tools become async and run in a shared thread
+pool (OFFLOAD_THREADS workers). `limit` caps how many calls of one tool run at
+once; the rest wait in a queue. Async tools can hand a blocking step to the
+pool with `await offload.call(name, fn, *args)`.
+
+`offload_stats` reports per tool: running calls, queued calls, the deepest the
+queue has been and the time calls spent waiting for a slot.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import os
+import threading
+import time
+
+
+class OffloadMetrics:
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.calls = 0
+        self.running = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit,
+            "calls": self.calls,
+            "running": self.running,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "mean_wait_ms": round(self.wait_seconds / self.calls * 1000, 3) if self.calls else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+        }
+
+
+class Offloader:
+    """A bounded thread pool for blocking tools, with per-tool limits."""
+
+    def __init__(self, mcp=None, threads=None):
+        self.threads = threads or int(os.environ.get("OFFLOAD_THREADS", min(32, (os.cpu_count() or 1) + 4)))
+        self.tools = {}
+        self._limits = {}
+        self._pool = None
+        self._lock = threading.Lock()
+        if mcp is not None:
+            self.register(mcp)
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = concurrent.futures.ThreadPoolExecutor(self.threads, thread_name_prefix="offload")
+            return self._pool
+
+    def _metrics(self, name: str, limit=None):
+        with self._lock:
+            metrics = self.tools.get(name)
+            if metrics is None:
+                metrics = self.tools[name] = OffloadMetrics(limit)
+                self._limits[name] = asyncio.Semaphore(limit) if limit else None
+            return metrics, self._limits[name]
+
+    def tool(self, limit=None):
+        """Decorator: run a sync tool in the pool; put it under `@stats.instrument`."""
+        def decorator(fn):
+            self._metrics(fn.__name__, limit)
+
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                return await self.call(fn.__name__, functools.partial(fn, *args, **kwargs))
+
+            return wrapper
+
+        return decorator
+
+    async def call(self, name: str, fn, *args):
+        """Run `fn(*args)` in the pool, counted against tool `name`'s limit."""
+        metrics, limit = self._metrics(name)
+        loop = asyncio.get_running_loop()
+        waited = 0.0
+        if limit is not None and limit.locked():
+            queued_at = time.perf_counter()
+            with self._lock:
+                metrics.queued += 1
+                metrics.max_queued = max(metrics.max_queued, metrics.queued)
+            try:
+                await limit.acquire()
+            finally:
+                waited = time.perf_counter() - queued_at
+                with self._lock:
+                    metrics.queued -= 1
+        elif limit is not None:
+            await limit.acquire()
+        with self._lock:
+            metrics.calls += 1
+            metrics.running += 1
+            metrics.wait_seconds += waited
+            metrics.max_wait_seconds = max(metrics.max_wait_seconds, waited)
+
+        def done(_):
+            # the slot is held until the work really ends, even if the caller gave up
+            with self._lock:
+                metrics.running -= 1
+            if limit is not None and not loop.is_closed():
+                loop.call_soon_threadsafe(limit.release)
+
+        try:
+            future = self._executor().submit(fn, *args)
+        except BaseException:
+            done(None)
+            raise
+        future.add_done_callback(done)
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            tools = {name: metrics.snapshot() for name, metrics in sorted(self.tools.items())}
+        return {"threads": self.threads, "tools": tools}
+
+    def register(self, mcp):
+        @mcp.tool()
+        def offload_stats() -> dict:
+            """Per-tool running and queued offloaded calls, peak queue depth and wait times."""
+            return self.snapshot()
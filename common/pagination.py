@@ -0,0 +1,81 @@
+"""
+Keyset pagination for the todo APIs' GET /tasks (app3, app7).
+
+    page = parse_list_args(request.args)      # 400 on ValueError
+    return page_response(Todo.query, Todo, *page)
+
+Pages are ordered by id and the opaque cursor carries the last id served, so
+each page is an index range scan. Without `limit` or `cursor` the response is
+the plain list of every matching task, as before pagination was added.
+"""
+
+import base64
+import json
+
+from flask import jsonify
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+TASK_FIELDS = ("id", "task", "done")
+
+
+def encode_cursor(**position):
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        position["id"] = int(position["id"])
+        if "rank" in position:
+            position["rank"] = float(position["rank"])
+        return position
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def parse_list_args(args):
+    """
+    Return (limit, after, done, fields) from the query string; raise ValueError
+    on bad input. limit is None when the request is not paginated; above
+    MAX_PAGE_SIZE it is capped.
+    """
+    cursor = args.get("cursor")
+    after = decode_cursor(cursor) if cursor else None
+    limit = args.get("limit")
+    if limit is not None:
+        if not limit.isdigit() or int(limit) < 1:
+            raise ValueError("limit must be a positive integer")
+        limit = min(int(limit), MAX_PAGE_SIZE)
+    elif cursor:
+        limit = DEFAULT_PAGE_SIZE
+
+    done = args.get("done")
+    if done is not None:
+        if done.lower() not in ("true", "false", "1", "0"):
+            raise ValueError("done must be true or false")
+        done = done.lower() in ("true", "1")
+
+    fields = args.get("fields")
+    fields = [field.strip() for field in fields.split(",") if field.strip()] if fields else list(TASK_FIELDS)
+    unknown = set(fields) - set(TASK_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    if "id" not in fields:
+        fields.insert(0, "id")  # the cursor needs it
+    return limit, after, done, fields
+
+
+def page_response(query, model, limit, after, done, fields):
+    """One page (or, with limit None, all) of `query`'s `model` rows as JSON."""
+    if done is not None:
+        query = query.filter(model.done == done)
+    if after is not None:
+        query = query.filter(model.id > after["id"])
+    columns = [getattr(model, field) for field in fields]
+    query = query.order_by(model.id).with_entities(*columns)
+    if limit is None:
+        return jsonify([row._asdict() for row in query.all()])
+    rows = query.limit(limit + 1).all()
+    next_cursor = encode_cursor(id=rows[limit - 1].id) if len(rows) > limit else None
+    return jsonify({"tasks": [row._asdict() for row in rows[:limit]], "next_cursor": next_cursor})
@@ -0,0 +1,151 @@
+"""
+Safe arithmetic expression evaluator for the `calculate` tools.
+
+    evaluate("2 * (3 + 4) ** 2")              -> 98
+    evaluate("sqrt(x) + 1", x=16)             -> 5.0
+    evaluate_many("a * b", a=[1, 2], b=[3, 4]) -> [3.0, 8.0]
+
+Expressions are parsed once, checked against a whitelist of AST nodes
+(numbers, arithmetic operators, a few math functions and named variables),
+compiled to a code object and cached by their normalized text, so repeat
+calls skip parsing and compiling. Exponentiation goes through `safe_pow`,
+which refuses results too large to compute quickly; `evaluate_many` raises
+to powers in float64, where an oversized result is just inf.
+"""
+
+import ast
+import functools
+import math
+
+try:
+    import numpy as np
+except ImportError:  # evaluate_many falls back to a per-row loop
+    np = None
+
+MAX_POW_BITS = 10_000  # refuse integer powers with a result longer than this
+CACHE_SIZE = 1024
+
+FUNCTIONS = {
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "log": math.log,
+    "log10": math.log10,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+}
+CONSTANTS = {"pi": math.pi, "e": math.e}
+
+# NumPy versions of FUNCTIONS for evaluate_many over arrays (min/max are variadic)
+ARRAY_FUNCTIONS = {
+    "abs": "abs", "round": "round", "sqrt": "sqrt",
+    "exp": "exp", "log": "log", "log10": "log10", "sin": "sin", "cos": "cos", "tan": "tan",
+}
+
+ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load, ast.Call,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.UAdd, ast.USub,
+)
+
+
+class UnsafeExpression(ValueError):
+    pass
+
+
+def safe_pow(base, exponent):
+    if isinstance(base, int) and isinstance(exponent, int) and abs(base) > 1:
+        if exponent * math.log2(abs(base)) > MAX_POW_BITS:
+            raise UnsafeExpression("Exponent too large")
+    return base ** exponent
+
+
+class _PowToCall(ast.NodeTransformer):
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            call = ast.Call(func=ast.Name(id="__pow__", ctx=ast.Load()), args=[node.left, node.right], keywords=[])
+            return ast.copy_location(call, node)
+        return node
+
+
+class CompiledExpression:
+    """A validated expression compiled once; call it with variable values."""
+
+    def __init__(self, text, code, names):
+        self.text = text
+        self.code = code
+        self.names = names  # free variables, in order of appearance
+
+    def __call__(self, **variables):
+        missing = [name for name in self.names if name not in variables]
+        if missing:
+            raise UnsafeExpression(f"Missing value for {', '.join(missing)}")
+        scope = {"__pow__": safe_pow, **FUNCTIONS, **CONSTANTS, **variables}
+        return eval(self.code, {"__builtins__": {}}, scope)
+
+    def many(self, **columns):
+        """Evaluate over equal-length lists of inputs, as arrays when NumPy is available."""
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise UnsafeExpression("All input lists must have the same length")
+        if np is None:
+            rows = zip(*columns.values()) if columns else [()]
+            return [self(**dict(zip(columns, row))) for row in rows]
+        scope = {name: getattr(np, function) for name, function in ARRAY_FUNCTIONS.items()}
+        scope["min"] = lambda *values: functools.reduce(np.minimum, values)
+        scope["max"] = lambda *values: functools.reduce(np.maximum, values)
+        arrays = {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()}
+        missing = [name for name in self.names if name not in arrays]
+        if missing:
+            raise UnsafeExpression(f"Missing value for {', '.join(missing)}")
+        scope.update(CONSTANTS)
+        # float_power: np.power refuses integer constants to negative powers (2 ** -1)
+        scope.update(arrays, __pow__=np.float_power)
+        with np.errstate(all="ignore"):
+            result = eval(self.code, {"__builtins__": {}}, scope)
+        return np.broadcast_to(result, (lengths.pop() if lengths else 1,)).tolist()
+
+
+def normalize(expression):
+    return " ".join(expression.split())
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _compile(text):
+    try:
+        tree = ast.parse(text, mode="eval")
+    except SyntaxError as e:
+        raise UnsafeExpression(f"Invalid expression: {e.msg}") from None
+    names = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise UnsafeExpression(f"Unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and (isinstance(node.value, bool) or not isinstance(node.value, (int, float))):
+            raise UnsafeExpression("Only numbers are allowed")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+                raise UnsafeExpression("Unsupported function call")
+        elif isinstance(node, ast.Name) and node.id not in FUNCTIONS and node.id not in CONSTANTS:
+            if node.id.startswith("_"):
+                raise UnsafeExpression(f"Invalid name: {node.id}")
+            if node.id not in names:
+                names.append(node.id)
+    tree = ast.fix_missing_locations(_PowToCall().visit(tree))
+    return CompiledExpression(text, compile(tree, "<expression>", "eval"), tuple(names))
+
+
+def compile_expression(expression):
+    """Validated, compiled and cached form of `expression`."""
+    return _compile(normalize(expression))
+
+
+def evaluate(expression, **variables):
+    return compile_expression(expression)(**variables)
+
+
+def evaluate_many(expression, **columns):
+    return compile_expression(expression).many(**columns)
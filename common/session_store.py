@@ -0,0 +1,219 @@
+"""
+Bounded chat history per session id, for the chat tools.
+
+    sessions = SessionStore.from_env()
+    sessions.append(session_id, "User: hi", "Assistant: hello")
+    sessions.history(session_id)  # -> ["User: hi", "Assistant: hello"]
+
+Memory stays bounded three ways:
+
+- each session keeps at most `max_messages` (a ring buffer, oldest dropped),
+- sessions idle for longer than `idle_ttl` seconds are evicted,
+- when all histories together exceed `max_bytes`, the least recently used
+  sessions are evicted until they fit.
+
+With `spill_path` set, evicted sessions are written to a SQLite file instead
+of being dropped and are loaded back on their next use; spilled sessions are
+purged after `spill_ttl` seconds. The sessions still in memory are spilled
+by `close()`, which runs at interpreter exit.
+
+Environment: CHAT_HISTORY_MAX_MESSAGES, CHAT_SESSION_TTL, CHAT_HISTORY_MAX_BYTES,
+CHAT_HISTORY_SPILL (SQLite path) and CHAT_HISTORY_SPILL_TTL.
+"""
+
+import atexit
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+SPILL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    total INTEGER NOT NULL,
+    spilled_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+);
+"""
+
+
+class _Session:
+    __slots__ = ("messages", "bytes", "total", "last_seen")
+
+    def __init__(self, max_messages, messages=(), total=0):
+        self.messages = deque(messages, maxlen=max_messages)
+        self.bytes = sum(map(sys.getsizeof, self.messages))
+        self.total = total or len(self.messages)  # messages ever appended
+        self.last_seen = 0.0
+
+
+class SessionStore:
+    def __init__(self, max_messages=200, idle_ttl=3600.0, max_bytes=16 * 1024 * 1024,
+                 spill_path=None, spill_ttl=7 * 24 * 3600.0, clock=time.monotonic):
+        if max_messages < 1:
+            raise ValueError(f"max_messages must be at least 1, got {max_messages}")
+        self.max_messages = max_messages
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+        self.spill_ttl = spill_ttl
+        self.clock = clock
+        self.bytes = 0
+        self.evictions = {"ttl": 0, "memory": 0}
+        self._sessions = OrderedDict()  # least recently used first
+        self._lock = threading.Lock()
+        self._db = None
+        if spill_path:
+            self._db = sqlite3.connect(spill_path, check_same_thread=False)
+            self._db.executescript(SPILL_SCHEMA)
+            # keep the in-memory sessions when the server shuts down
+            atexit.register(self.close)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_messages=int(os.environ.get("CHAT_HISTORY_MAX_MESSAGES", 200)),
+            idle_ttl=float(os.environ.get("CHAT_SESSION_TTL", 3600)),
+            max_bytes=int(os.environ.get("CHAT_HISTORY_MAX_BYTES", 16 * 1024 * 1024)),
+            spill_path=os.environ.get("CHAT_HISTORY_SPILL") or None,
+            spill_ttl=float(os.environ.get("CHAT_HISTORY_SPILL_TTL", 7 * 24 * 3600)),
+        )
+
+    def append(self, session_id, *messages):
+        """Add messages to a session; returns how many it has ever received."""
+        with self._lock:
+            session = self._touch(session_id)
+            for message in messages:
+                if len(session.messages) == session.messages.maxlen:
+                    dropped = sys.getsizeof(session.messages[0])
+                    session.bytes -= dropped
+                    self.bytes -= dropped
+                session.messages.append(message)
+                size = sys.getsizeof(message)
+                session.bytes += size
+                self.bytes += size
+            session.total += len(messages)
+            self._fit(session_id)
+            return session.total
+
+    def history(self, session_id):
+        with self._lock:
+            return list(self._touch(session_id).messages)
+
+    def count(self, session_id):
+        """Messages ever appended to the session, including ones since dropped."""
+        with self._lock:
+            return self._touch(session_id).total
+
+    def clear(self, session_id):
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self.bytes -= session.bytes
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                    self._db.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+
+    def stats(self):
+        with self._lock:
+            spilled = self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] if self._db else 0
+            return {
+                "sessions": len(self._sessions),
+                "bytes": self.bytes,
+                "spilled_sessions": spilled,
+                "evictions": dict(self.evictions),
+            }
+
+    def close(self):
+        """Spill every in-memory session (when spilling is enabled) and close the file."""
+        with self._lock:
+            while self._sessions:
+                self._evict(*self._sessions.popitem(last=False))
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+                atexit.unregister(self.close)
+
+    def _touch(self, session_id):
+        now = self.clock()
+        self._expire(now)
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._load(session_id) or _Session(self.max_messages)
+            self._sessions[session_id] = session
+            self.bytes += session.bytes
+            self._fit(session_id)
+        else:
+            self._sessions.move_to_end(session_id)
+        session.last_seen = now
+        return session
+
+    def _expire(self, now):
+        # LRU order is also last-seen order, so expired sessions are at the front
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_seen <= self.idle_ttl:
+                break
+            del self._sessions[session_id]
+            self.evictions["ttl"] += 1
+            self._evict(session_id, session)
+
+    def _fit(self, current):
+        # `current` was just touched, so it is the last one left
+        while self.bytes > self.max_bytes and len(self._sessions) > 1:
+            session_id, session = self._sessions.popitem(last=False)
+            self.evictions["memory"] += 1
+            self._evict(session_id, session)
+        session = self._sessions.get(current)
+        # a single session larger than the budget keeps only its newest messages
+        while session is not None and self.bytes > self.max_bytes and len(session.messages) > 1:
+            dropped = sys.getsizeof(session.messages.popleft())
+            session.bytes -= dropped
+            self.bytes -= dropped
+
+    def _evict(self, session_id, session):
+        self.bytes -= session.bytes
+        if self._db is None:
+            return
+        with self._db:
+            self._db.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+            self._db.executemany(
+                "INSERT INTO messages (session_id, seq, text) VALUES (?, ?, ?)",
+                [(session_id, seq, text) for seq, text in enumerate(session.messages)],
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, total, spilled_at) VALUES (?, ?, ?)",
+                (session_id, session.total, time.time()),
+            )
+            cutoff = time.time() - self.spill_ttl
+            self._db.execute(
+                "DELETE FROM messages WHERE session_id IN (SELECT session_id FROM sessions WHERE spilled_at < ?)",
+                (cutoff,),
+            )
+            self._db.execute("DELETE FROM sessions WHERE spilled_at < ?", (cutoff,))
+
+    def _load(self, session_id):
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT total, spilled_at FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        total, spilled_at = row
+        with self._db:
+            messages = [text for (text,) in self._db.execute(
+                "SELECT text FROM messages WHERE session_id = ? ORDER BY seq", (session_id,)
+            )]
+            self._db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            self._db.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+        if time.time() - spilled_at > self.spill_ttl:
+            return None
+        return _Session(self.max_messages, messages, total)
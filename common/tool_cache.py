@@ -0,0 +1,90 @@
+"""
+Client-side cache for MCP tool results, shared by the healthcare (app6) and
+todo (app7) clients.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class ToolResultCache:
+    """
+    Client-side cache for MCP tool results.
+
+    Entries are keyed by tool name plus the canonical JSON of the arguments.
+    Only tools listed in `ttls` are cached, each for its own number of seconds,
+    and at most `max_entries` results are kept (least recently used go first).
+    `invalidates` maps a mutating tool to the cached tools it makes stale, e.g.
+    {"add_todo": ["list_todos"]}.
+    """
+
+    def __init__(self, ttls, invalidates=None, max_entries=1024, clock=time.monotonic):
+        self.ttls = dict(ttls)
+        self.invalidates = {tool: tuple(targets) for tool, targets in (invalidates or {}).items()}
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._epochs = {}  # tool -> invalidation count, guards against stale fills
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(tool_name, arguments):
+        canonical = json.dumps(arguments or {}, sort_keys=True, separators=(",", ":"), default=str)
+        return tool_name, canonical
+
+    def lookup(self, tool_name, arguments):
+        """
+        Return `(value, epoch)`; value is MISSING on a miss. Pass the epoch back
+        to `put` so a result fetched before an invalidation is not stored.
+        """
+        with self._lock:
+            epoch = self._epochs.get(tool_name, 0)
+            if tool_name not in self.ttls:
+                return MISSING, epoch
+            key = self.key(tool_name, arguments)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return MISSING, epoch
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], epoch
+
+    def put(self, tool_name, arguments, value, epoch=None):
+        ttl = self.ttls.get(tool_name)
+        if ttl is None:
+            return
+        with self._lock:
+            if epoch is not None and epoch != self._epochs.get(tool_name, 0):
+                return
+            key = self.key(tool_name, arguments)
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tool_name):
+        """Evict the cached results made stale by a call to `tool_name`."""
+        targets = self.invalidates.get(tool_name)
+        if not targets:
+            return
+        with self._lock:
+            for target in targets:
+                self._epochs[target] = self._epochs.get(target, 0) + 1
+            for key in [key for key in self._entries if key[0] in targets]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,23 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def add_app_path(*parts):
+    """Make an app's modules importable the way its own scripts import them."""
+    path = str(ROOT.joinpath(*parts))
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def load_module(name, *parts):
+    """Import one file as module `name`, without importing the package around it."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, ROOT.joinpath(*parts))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,94 @@
+import asyncio
+import concurrent.futures
+import threading
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from tests.support import load_module
+
+mcp_client = load_module("app6_mcp_client", "app6", "mcp_client.py")
+BackgroundLoop = mcp_client.BackgroundLoop
+
+
+@pytest.fixture(scope="module")
+def loop():
+    return BackgroundLoop()
+
+
+def test_run_returns_result_from_loop_thread(loop):
+    async def where():
+        return threading.current_thread().name
+
+    assert loop.run(where()) == "mcp-loop"
+
+
+def test_run_timeout_cancels_work_on_loop(loop):
+    cancelled = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(concurrent.futures.TimeoutError):
+        loop.run(slow(), timeout=0.05)
+    assert cancelled.wait(1)
+
+
+def test_run_async_times_out():
+    with pytest.raises(concurrent.futures.TimeoutError):
+        mcp_client.run_async(asyncio.sleep(10), timeout=0.05)
+    assert mcp_client.run_async(asyncio.sleep(0, "ok"), timeout=1) == "ok"
+
+
+def test_iterate_yields_items_and_closes_generator_when_abandoned(loop):
+    closed = threading.Event()
+
+    async def numbers():
+        try:
+            for i in range(10):
+                yield i
+        finally:
+            closed.set()
+
+    assert list(loop.iterate(numbers())) == list(range(10))
+
+    closed.clear()
+    items = loop.iterate(numbers())
+    assert [next(items), next(items)] == [0, 1]
+    items.close()
+    assert closed.is_set()
+
+
+def test_enter_and_exit_run_in_one_task(loop):
+    tasks = []
+
+    class Resource:
+        async def __aenter__(self):
+            tasks.append(asyncio.current_task())
+            return self
+
+        async def __aexit__(self, *exc):
+            tasks.append(asyncio.current_task())
+
+    resource = loop.enter(Resource(), timeout=1)
+    assert len(tasks) == 1
+    loop.exit(resource, timeout=1)
+    assert len(tasks) == 2 and tasks[0] is tasks[1]
+    assert loop._held == {}
+
+
+def test_enter_failure_is_raised_to_caller(loop):
+    class Broken:
+        async def __aenter__(self):
+            raise ConnectionError("server did not start")
+
+        async def __aexit__(self, *exc):
+            pass
+
+    with pytest.raises(ConnectionError, match="did not start"):
+        loop.enter(Broken(), timeout=1)
@@ -0,0 +1,50 @@
+import asyncio
+import json
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("mcp")
+
+from tests.support import add_app_path, load_module
+
+add_app_path("app5")  # the server's own imports (quotes, schedules, ...)
+server = load_module("app5_server", "app5", "server.py")
+
+from quotes import CSVSource, QuoteCache  # noqa: E402
+
+
+def write_csv(directory, ticker, volumes):
+    index = pd.bdate_range(end="2024-06-28", periods=len(volumes), name="Date")
+    close = [100.0 + i for i in range(len(volumes))]
+    frame = pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": volumes}, index=index)
+    frame.to_csv(directory / f"{ticker}.csv")
+
+
+@pytest.fixture
+def quotes(tmp_path, monkeypatch):
+    cache = QuoteCache(CSVSource(str(tmp_path)))
+    monkeypatch.setattr(server, "quotes", cache)
+    write_csv(tmp_path, "AAPL", [1000, 2000, 3000])
+    write_csv(tmp_path, "HALT", [1000, 2000, float("nan")])
+    write_csv(tmp_path, "NEW", [500])
+    return cache
+
+
+def test_get_stock_prices_many_tickers(quotes):
+    result = asyncio.run(server.get_stock_prices(["aapl", "halt", "new", "nope"]))
+    json.dumps(result)  # must be serializable: no NaN or NumPy scalars
+    rows = {row["ticker"]: row for row in result["quotes"]}
+    assert result["missing"] == ["NOPE"]
+    assert rows["AAPL"] == {
+        "ticker": "AAPL", "price": 102.0, "previous_close": 101.0, "change": 1.0,
+        "change_pct": 0.9901, "high": 102.0, "low": 102.0, "volume": 3000, "date": "2024-06-28",
+    }
+    assert rows["HALT"]["price"] == 102.0 and rows["HALT"]["volume"] is None
+    assert rows["NEW"]["volume"] == 500
+    assert rows["NEW"]["previous_close"] is None and rows["NEW"]["change"] is None
+    assert type(rows["AAPL"]["volume"]) is int
+
+
+def test_get_stock_prices_only_missing(quotes):
+    assert asyncio.run(server.get_stock_prices(["nope"])) == {"quotes": [], "missing": ["NOPE"]}
@@ -0,0 +1,118 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from common.tool_cache import ToolResultCache
+from tests.support import load_module
+
+MCPHealthcareClient = load_module("app6_mcp_client", "app6", "mcp_client.py").MCPHealthcareClient
+
+
+def result(text, is_error=False):
+    return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)], isError=is_error)
+
+
+class FakeSession:
+    """Sends `chunks` as progress notifications, then waits for `release` before responding."""
+
+    def __init__(self, chunks=(), text="done"):
+        self.chunks = list(chunks)
+        self.text = text
+        self.release = asyncio.Event()
+        self.calls = []
+        self.cancelled = 0
+
+    async def call_tool(self, tool_name, arguments, progress_callback=None):
+        self.calls.append((tool_name, arguments))
+        try:
+            for i, chunk in enumerate(self.chunks):
+                if progress_callback is not None:
+                    await progress_callback(i + 1, None, chunk)
+                await asyncio.sleep(0)
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return result(self.text)
+
+
+def make_client(session, **kwargs):
+    client = MCPHealthcareClient(args=["unused"], **kwargs)
+    client.session = session
+    client._input_params = {"diagnose_symptoms": "symptoms"}
+    return client
+
+
+def test_chunks_arrive_before_the_call_finishes():
+    async def run():
+        session = FakeSession(["Possible ", "conditions: ", "cold"], text="Possible conditions: cold")
+        stream = make_client(session).stream_tool("diagnose_symptoms", "cough")
+        first = await stream.__anext__()
+        second = await stream.__anext__()
+        assert not session.release.is_set()  # the tool is still running
+        session.release.set()
+        rest = [chunk async for chunk in stream]
+        return [first, second] + rest, session
+
+    chunks, session = asyncio.run(run())
+    assert chunks == ["Possible ", "conditions: ", "cold"]
+    assert session.calls == [("diagnose_symptoms", {"symptoms": "cough"})]
+
+
+def test_tool_without_progress_yields_its_result_once():
+    async def run():
+        session = FakeSession(text="Possible conditions: cold")
+        session.release.set()
+        return [chunk async for chunk in make_client(session).stream_tool("diagnose_symptoms", "cough")]
+
+    assert asyncio.run(run()) == ["Possible conditions: cold"]
+
+
+def test_cache_hit_yields_full_text_without_calling():
+    cache = ToolResultCache({"diagnose_symptoms": 300})
+
+    async def run():
+        session = FakeSession(["Possible ", "conditions: cold"], text="Possible conditions: cold")
+        session.release.set()
+        client = make_client(session, cache=cache)
+        streamed = [chunk async for chunk in client.stream_tool("diagnose_symptoms", "cough")]
+        cached = [chunk async for chunk in client.stream_tool("diagnose_symptoms", "cough")]
+        return streamed, cached, session
+
+    streamed, cached, session = asyncio.run(run())
+    assert streamed == ["Possible ", "conditions: cold"]
+    assert cached == ["Possible conditions: cold"]
+    assert len(session.calls) == 1
+
+
+def test_abandoned_stream_cancels_call_and_frees_the_session():
+    async def run():
+        session = FakeSession(["Possible ", "conditions: cold"])
+        client = make_client(session, max_concurrency=1)
+        stream = client.stream_tool("diagnose_symptoms", "cough")
+        assert await stream.__anext__() == "Possible "
+        await stream.aclose()
+        await asyncio.sleep(0)
+
+        session.chunks = []
+        session.release.set()
+        text = await asyncio.wait_for(client.call_tool("diagnose_symptoms", "fever"), 1)
+        return text, session
+
+    text, session = asyncio.run(run())
+    assert session.cancelled == 1
+    assert text == "done"
+    assert session.calls[-1] == ("diagnose_symptoms", {"symptoms": "fever"})
+
+
+def test_failed_tool_raises_from_stream():
+    async def run():
+        session = FakeSession()
+        session.call_tool = lambda *args, **kwargs: asyncio.sleep(0, result("no such symptom", is_error=True))
+        return [chunk async for chunk in make_client(session).stream_tool("diagnose_symptoms", "?")]
+
+    with pytest.raises(RuntimeError, match="no such symptom"):
+        asyncio.run(run())
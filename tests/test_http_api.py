@@ -0,0 +1,56 @@
+import asyncio
+
+import httpx
+import pytest
+
+from common.http_api import APIClient
+
+
+def api_with(responses, calls):
+    def handler(request):
+        calls.append(request.method)
+        return responses.pop(0)
+
+    return APIClient("http://api/tasks", backoff=0, transport=httpx.MockTransport(handler))
+
+
+def test_idempotent_requests_retry_transient_statuses():
+    calls = []
+    api = api_with([httpx.Response(503), httpx.Response(502), httpx.Response(200, json=[1])], calls)
+    assert asyncio.run(api.request("GET")) == [1]
+    assert calls == ["GET", "GET", "GET"]
+
+
+def test_non_idempotent_requests_are_not_retried():
+    calls = []
+    api = api_with([httpx.Response(503), httpx.Response(201, json={})], calls)
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(api.request("POST", json={"task": "x"}))
+    assert calls == ["POST"]
+
+
+def test_retries_give_up_with_the_last_error():
+    calls = []
+    api = api_with([httpx.Response(504)] * 4, calls)
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(api.request("DELETE", "/1"))
+    assert len(calls) == 4
+
+
+def test_client_is_closed_when_the_last_session_ends():
+    api = APIClient("http://api/tasks", transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+
+    async def sessions():
+        async with api.lifespan(None):
+            async with api.lifespan(None):
+                client = api.client()
+            assert not client.is_closed
+        return client
+
+    assert asyncio.run(sessions()).is_closed
+
+
+def test_pool_limits_are_applied_to_the_transport():
+    limits = httpx.Limits(max_connections=3, max_keepalive_connections=1)
+    pool = APIClient("http://api", limits=limits).client()._transport._pool
+    assert pool._max_connections == 3 and pool._max_keepalive_connections == 1
@@ -0,0 +1,56 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from tests.support import add_app_path
+
+add_app_path("app5")
+
+from indicators import compute_indicators, rolling_mean, rolling_std  # noqa: E402
+
+
+def history(close):
+    index = pd.bdate_range(end="2024-06-28", periods=len(close), name="Date")
+    return pd.DataFrame({"Close": np.asarray(close, dtype=float)}, index=index)
+
+
+@pytest.fixture
+def hist():
+    rng = np.random.default_rng(7)
+    return history(100 * np.exp(np.cumsum(rng.normal(0, 0.01, 300))))
+
+
+@pytest.mark.parametrize("window", [0, 1, -5])
+def test_window_below_two_is_rejected(hist, window):
+    with pytest.raises(ValueError, match="window must be at least 2"):
+        compute_indicators(hist, ["volatility"], window=window)
+
+
+def test_rolling_windows_match_pandas(hist):
+    values = hist["Close"].to_numpy()
+    expected = hist["Close"].rolling(20)
+    np.testing.assert_allclose(rolling_mean(values, 20), expected.mean().dropna().to_numpy())
+    np.testing.assert_allclose(rolling_std(values, 20), expected.std().dropna().to_numpy())
+    assert len(rolling_mean(values[:5], 20)) == 0
+
+
+def test_volatility_uses_window(hist):
+    result = compute_indicators(hist, ["volatility"], window=2)["volatility"]
+    assert result["window"] == 2
+    assert result["rolling_min_pct"] <= result["rolling_latest_pct"] <= result["rolling_max_pct"]
+
+
+def test_rising_prices():
+    result = compute_indicators(history(np.arange(1.0, 61.0)), ["returns", "rsi", "drawdown"])
+    assert result["bars"] == 60
+    assert result["returns"]["total_pct"] == 5900.0
+    assert result["rsi"] == {"period": 14, "latest": 100.0, "state": "overbought"}
+    assert result["drawdown"]["max_pct"] == 0.0
+
+
+def test_unknown_metric_and_short_history(hist):
+    with pytest.raises(ValueError, match="Unknown metrics: beta"):
+        compute_indicators(hist, ["beta"])
+    with pytest.raises(ValueError, match="two bars"):
+        compute_indicators(history([1.0]))
@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+import pytest
+
+from common.instrumentation import ToolMetrics, ToolStats
+
+
+def test_counts_calls_errors_and_latency():
+    stats = ToolStats()
+
+    @stats.instrument
+    def ok(x):
+        return x * 2
+
+    @stats.instrument
+    def broken():
+        raise ValueError("boom")
+
+    assert ok(2) == 4
+    with pytest.raises(ValueError):
+        broken()
+    tools = stats.snapshot()["tools"]
+    assert tools["ok"]["calls"] == 1 and tools["ok"]["errors"] == 0
+    assert tools["broken"]["errors"] == 1
+    assert tools["ok"]["in_flight"] == 0
+    assert tools["ok"]["p50_ms"] <= tools["ok"]["max_ms"]
+
+
+def test_async_tools_are_tracked_while_in_flight():
+    stats = ToolStats()
+    seen = {}
+
+    @stats.instrument
+    async def slow():
+        seen["in_flight"] = stats.snapshot()["tools"]["slow"]["in_flight"]
+        await asyncio.sleep(0)
+        return "done"
+
+    assert asyncio.run(slow()) == "done"
+    assert seen["in_flight"] == 1
+    assert stats.snapshot()["tools"]["slow"]["calls"] == 1
+
+
+def test_percentiles_stay_within_observed_range():
+    stats = ToolStats()
+    metrics = stats.tools.setdefault("t", ToolMetrics())
+    for seconds in (0.001, 0.002, 0.004, 0.1):
+        metrics.observe(seconds, failed=False)
+    assert 0 < metrics.percentile(0.5) <= metrics.percentile(0.99) <= 0.1
+
+
+def test_dump_writes_snapshot(tmp_path):
+    stats = ToolStats()
+    stats.instrument(lambda: None)()
+    path = tmp_path / "stats.json"
+    stats.dump(str(path))
+    assert json.loads(path.read_text())["tools"]["<lambda>"]["calls"] == 1
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from tests.support import add_app_path
+
+add_app_path("app2")
+
+from intents import ARITHMETIC_COMMANDS, IntentRouter, command_router  # noqa: E402
+
+
+@pytest.fixture
+def router():
+    return command_router()
+
+
+@pytest.mark.parametrize("message, name, args", [
+    ("add 2 and 3", "add", {"a": "2", "b": "3"}),
+    ("Divide 10 and 5", "divide", {"a": "10", "b": "5"}),
+    ("multiply 7 and 6 please", "multiply", {"a": "7", "b": "6"}),
+    ("weather in New York", "weather", {"location": "new york"}),
+])
+def test_command_router_matches(router, message, name, args):
+    found = router.match(message)
+    assert (found.name, found.args) == (name, args)
+
+
+@pytest.mark.parametrize("message", ["please add 2 and 3", "add two and three", "hello", ""])
+def test_command_router_misses(router, message):
+    assert router.match(message) is None
+
+
+def test_every_arithmetic_command_is_registered(router):
+    for command in ARITHMETIC_COMMANDS:
+        assert router.match(f"{command} 1 and 2").name == command
+
+
+def test_argument_names_may_repeat_across_intents():
+    router = IntentRouter()
+    router.register("first", r"one (?P<value>\d+)")
+    router.register("second", r"two (?P<value>\w+)")
+    assert router.match("one 1").args == {"value": "1"}
+    assert router.match("two x").args == {"value": "x"}
+
+
+def test_earlier_registration_wins_and_later_ones_recompile():
+    router = IntentRouter()
+    router.register("specific", r"stats today")
+    router.register("general", r"stats(?: (?P<day>\w+))?")
+    assert router.match("stats today").name == "specific"
+    assert router.match("stats monday").args == {"day": "monday"}
+    assert router.match("stats").args == {}
+    router.register("ping", r"ping\b")
+    assert router.match("ping").name == "ping"
+
+
+@pytest.mark.parametrize("name", ["not valid", "a__b", "1st"])
+def test_invalid_intent_names(name):
+    with pytest.raises(ValueError):
+        IntentRouter().register(name, "x")
+
+
+def test_dispatch_runs_sync_and_async_handlers(router):
+    async def weather(location):
+        return f"sunny in {location}"
+
+    router.bind("add", lambda a, b: int(a) + int(b))
+    router.bind("weather", weather)
+
+    async def run():
+        return [
+            await router.dispatch("add 2 and 3"),
+            await router.dispatch("weather in paris"),
+            await router.dispatch("what now", default=lambda message: f"echo: {message}"),
+            await router.dispatch("subtract 3 and 1", default=lambda message: "unbound"),
+            await router.dispatch("what now"),
+        ]
+
+    assert asyncio.run(run()) == [5, "sunny in paris", "echo: what now", "unbound", None]
+
+
+def test_on_decorator_registers_handler():
+    router = IntentRouter()
+
+    @router.on("greet", r"(?:hi|hello)\b")
+    def greet():
+        return "Hello!"
+
+    assert asyncio.run(router.dispatch("Hello there")) == "Hello!"
+    assert router.match("hiking") is None
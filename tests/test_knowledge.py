@@ -0,0 +1,97 @@
+import pytest
+
+from tests.support import add_app_path
+
+add_app_path("app6")
+
+from knowledge import AhoCorasick, KnowledgeBase  # noqa: E402
+
+SYMPTOMS = {
+    "fever": ["feverish", "high temperature"],
+    "ache": ["aches"],
+    "headache": ["head pain"],
+    "cough": ["dry cough"],
+}
+CONDITIONS = [
+    {"name": "flu", "aliases": ["influenza"], "symptoms": {"fever": 1.0, "cough": 0.8, "ache": 0.5},
+     "treatment": "rest", "specialist": "General Physician"},
+    {"name": "stomach flu", "aliases": ["gastroenteritis"], "symptoms": {"fever": 0.5, "ache": 1.0},
+     "treatment": "fluids"},
+    {"name": "migraine", "symptoms": {"headache": 1.5}, "specialist": "Neurologist"},
+    {"name": "cold", "symptoms": {"cough": 1.0, "fever": 0.3}},
+    {"name": "bronchitis", "symptoms": {"cough": 1.0, "fever": 0.3}},
+]
+
+
+@pytest.fixture
+def kb():
+    return KnowledgeBase(SYMPTOMS, CONDITIONS)
+
+
+def names(kb, ids):
+    return [kb.symptoms[i] for i in ids]
+
+
+def test_matches_whole_words_only(kb):
+    assert names(kb, kb.match_symptoms("I have a headache")) == ["headache"]
+    assert names(kb, kb.match_symptoms("a dull ache, no headaches")) == ["ache"]
+    assert kb.match_symptoms("coughing and feverishness") == []
+
+
+def test_synonyms_resolve_to_their_symptom(kb):
+    found = kb.match_symptoms("HIGH TEMPERATURE with head pain, feverish, aches")
+    assert names(kb, found) == ["fever", "headache", "ache"]
+
+
+def test_overlapping_phrases_all_match():
+    matcher = AhoCorasick([("dry cough", "dry"), ("cough", "cough"), ("he", "he"), ("she", "she")])
+    assert sorted(value for _, _, value in matcher.find("she has a dry cough")) == ["cough", "dry", "she"]
+
+
+def test_longest_alias_wins(kb):
+    assert [c.name for c in kb.conditions_in("maybe stomach flu, or just flu")] == ["stomach flu", "flu"]
+    assert [c.name for c in kb.conditions_in("Influenza")] == ["flu"]
+    assert kb.conditions_in("influenzas") == []
+
+
+def test_scores_rank_conditions(kb):
+    ranked = [(condition.name, score) for condition, score in kb.diagnose("fever, cough and aches", k=3)]
+    assert ranked == [("flu", 2.3), ("stomach flu", 1.5), ("cold", 1.3)]
+
+
+def test_ties_go_to_the_earlier_condition(kb):
+    ranked = [(condition.name, score) for condition, score in kb.diagnose("a cough", k=5)]
+    assert ranked == [("cold", 1.0), ("bronchitis", 1.0), ("flu", 0.8)]
+    assert [condition.name for condition, _ in kb.diagnose("a cough", k=1)] == ["cold"]
+
+
+def test_no_symptoms_no_diagnosis(kb):
+    assert kb.diagnose("nothing relevant here") == []
+    assert kb.diagnose("") == []
+
+
+def test_first_condition_with_field(kb):
+    text = "Possible diagnoses: stomach flu, migraine"
+    assert kb.first_condition(text).name == "stomach flu"
+    assert kb.first_condition(text, "specialist").name == "migraine"
+    assert kb.first_condition("none", "treatment") is None
+
+
+def test_unknown_symptom_is_rejected():
+    with pytest.raises(ValueError, match="unknown symptom 'rash'"):
+        KnowledgeBase(SYMPTOMS, [{"name": "measles", "symptoms": {"rash": 1.0}}])
+
+
+@pytest.mark.parametrize("symptoms, conditions", [
+    ({"fever": [""]}, []),
+    ({" ": []}, []),
+    (SYMPTOMS, [{"name": "flu", "aliases": [" "]}]),
+])
+def test_empty_phrases_are_rejected(symptoms, conditions):
+    with pytest.raises(ValueError, match="empty"):
+        KnowledgeBase(symptoms, conditions)
+
+
+def test_bundled_knowledge_loads():
+    kb = KnowledgeBase.load()
+    assert kb.diagnose("fever and a dry cough", k=1)
@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from tests.support import load_module
+
+mcp_client = load_module("app7_mcp_client", "app7", "app", "services", "mcp_client.py")
+
+
+class FakeClient:
+    """Stands in for MCPClientWrapper: an async context manager with ping and call_tool."""
+
+    def __init__(self, number):
+        self.number = number
+        self.open = False
+        self.dead = False
+
+    async def __aenter__(self):
+        self.open = True
+        return self
+
+    async def __aexit__(self, *exc):
+        self.open = False
+
+    async def ping(self):
+        if self.dead:
+            raise ConnectionError("server process exited")
+
+    async def call_tool(self, tool_name, params=None):
+        return f"{tool_name} on client {self.number}"
+
+
+class FakePool(mcp_client.MCPSessionPool):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.clients = []
+
+    def _new_client(self):
+        client = FakeClient(len(self.clients) + 1)
+        self.clients.append(client)
+        return client
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**kwargs):
+        pool = FakePool(**kwargs)
+        pool.start()
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def idle(pool):
+    return pool._idle.qsize()
+
+
+def test_lease_calls_and_returns_the_session(make_pool):
+    pool = make_pool(size=2)
+
+    async def run():
+        async with pool.lease() as lease:
+            first = await lease.call_tool("list_todos")
+        async with pool.lease() as lease:
+            second = await lease.call_tool("list_todos")
+        return first, second
+
+    assert asyncio.run(run()) == ("list_todos on client 1", "list_todos on client 1")
+    assert len(pool.clients) == 1 and idle(pool) == 1
+
+
+def test_concurrent_leases_spawn_up_to_size(make_pool):
+    pool = make_pool(size=2)
+
+    async def run():
+        async with pool.lease() as a, pool.lease() as b:
+            return await asyncio.gather(a.call_tool("x"), b.call_tool("x"))
+
+    assert sorted(asyncio.run(run())) == ["x on client 1", "x on client 2"]
+    assert idle(pool) == 2
+
+
+def test_dead_session_is_replaced_on_health_check(make_pool):
+    pool = make_pool(size=1, health_check_interval=0)
+
+    async def call():
+        async with pool.lease() as lease:
+            return await lease.call_tool("ping_me")
+
+    assert asyncio.run(call()) == "ping_me on client 1"
+    pool.clients[0].dead = True
+    assert asyncio.run(call()) == "ping_me on client 2"
+    assert not pool.clients[0].open
+    assert len(pool._sessions) == 1
+
+
+def test_lease_times_out_when_every_session_is_busy(make_pool):
+    pool = make_pool(size=1, lease_timeout=0.05)
+
+    async def run():
+        async with pool.lease():
+            with pytest.raises(asyncio.TimeoutError):
+                async with pool.lease():
+                    pass
+
+    asyncio.run(run())
+    assert idle(pool) == 1
+
+
+def test_abandoned_lease_returns_its_session(make_pool):
+    pool = make_pool(size=1, lease_timeout=1)
+
+    async def run():
+        async with pool.lease():
+            waiter = asyncio.ensure_future(pool.lease().__aenter__())
+            await asyncio.sleep(0.05)
+            waiter.cancel()  # the caller gives up while the acquire is still queued
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        # the queued acquire got the session once it was released, then gave it back
+        await asyncio.sleep(0.05)
+        async with pool.lease() as lease:
+            return await lease.call_tool("again")
+
+    assert asyncio.run(run()) == "again on client 1"
+    assert len(pool.clients) == 1 and idle(pool) == 1
+
+
+def test_lease_refuses_calls_once_the_session_is_gone(make_pool):
+    pool = make_pool(size=1)
+
+    async def run():
+        async with pool.lease() as lease:
+            await pool.submit(lease._pooled.close())
+            with pytest.raises(RuntimeError, match="no longer connected"):
+                await lease.call_tool("x")
+
+    asyncio.run(run())
+    assert idle(pool) == 0 and not pool._sessions
+
+
+def test_close_closes_every_session(make_pool):
+    pool = make_pool(size=2)
+
+    async def run():
+        async with pool.lease(), pool.lease():
+            pass
+
+    asyncio.run(run())
+    pool.close()
+    assert [client.open for client in pool.clients] == [False, False]
+    assert pool._thread is None
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from tests.support import add_app_path
+
+add_app_path("app5")
+
+from mcp_supervisor import MCPSessionSupervisor  # noqa: E402
+
+
+class FakeSession:
+    def __init__(self, number):
+        self.number = number
+        self.dead = False
+        self.closed = False
+
+    async def send_ping(self):
+        if self.dead:
+            raise ConnectionError("server process exited")
+
+    async def call_tool(self, tool_name, args):
+        if self.dead:
+            raise ConnectionError("server process exited")
+        return f"{tool_name}({args}) on session {self.number}"
+
+
+class FakeSupervisor(MCPSessionSupervisor):
+    def __init__(self, **kwargs):
+        super().__init__(None, health_check_interval=0.01, call_timeout=2, initial_backoff=0.01, **kwargs)
+        self.sessions = []
+        self.opened = threading.Event()
+
+    @asynccontextmanager
+    async def _open_session(self):
+        session = FakeSession(len(self.sessions) + 1)
+        self.sessions.append(session)
+        self.opened.set()
+        try:
+            yield session
+        finally:
+            session.closed = True
+
+
+@pytest.fixture
+def supervisor():
+    supervisor = FakeSupervisor()
+    supervisor.start()
+    yield supervisor
+    supervisor.stop()
+
+
+def test_calls_run_on_the_live_session(supervisor):
+    assert supervisor.call_tool("get_stock_price", {"ticker": "AAPL"}) == \
+        "get_stock_price({'ticker': 'AAPL'}) on session 1"
+
+
+def test_reconnects_after_the_session_dies(supervisor):
+    supervisor.call_tool("ping")
+    supervisor.sessions[0].dead = True  # the next health check fails
+    for _ in range(200):
+        if len(supervisor.sessions) > 1:
+            break
+        threading.Event().wait(0.01)
+    assert supervisor.call_tool("ping") == "ping({}) on session 2"
+    assert supervisor.sessions[0].closed
+
+
+def test_call_waits_for_reconnect_when_session_dropped_after_wakeup(supervisor):
+    supervisor.call_tool("ping")
+    replacement = FakeSession(99)
+
+    async def race():
+        # connected is still set, but the session is already gone
+        supervisor._session = None
+        asyncio.get_running_loop().call_later(0.05, setattr, supervisor, "_session", replacement)
+        return await supervisor._call_tool("ping", {})
+
+    result = asyncio.run_coroutine_threadsafe(race(), supervisor._loop).result(2)
+    assert result == "ping({}) on session 99"
+
+
+def test_stop_closes_the_session_and_refuses_calls():
+    supervisor = FakeSupervisor()
+    supervisor.start()
+    supervisor.call_tool("ping")
+    supervisor.stop()
+    assert supervisor.sessions[-1].closed
+    with pytest.raises(RuntimeError, match="not started"):
+        supervisor.call_tool("ping")
+    supervisor.stop()  # stopping twice is harmless
+
+
+def test_stop_while_reconnecting():
+    class Unreachable(FakeSupervisor):
+        @asynccontextmanager
+        async def _open_session(self):
+            self.opened.set()
+            raise ConnectionError("no server")
+            yield
+
+    supervisor = Unreachable()
+    supervisor.start()
+    assert supervisor.opened.wait(2)
+    with pytest.raises(TimeoutError):
+        supervisor.call_tool("ping", timeout=0.05)
+    supervisor.stop()
+    assert supervisor._thread is None
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+
+import pytest
+
+from common.offload import Offloader
+
+
+def test_tool_runs_off_the_event_loop():
+    offload = Offloader(threads=2)
+
+    @offload.tool()
+    def where(value):
+        return value, threading.current_thread().name
+
+    value, thread = asyncio.run(where(7))
+    assert value == 7
+    assert thread.startswith("offload")
+    assert where.__name__ == "where"
+    assert offload.snapshot()["tools"]["where"]["calls"] == 1
+
+
+def test_limit_queues_extra_calls():
+    offload = Offloader(threads=4)
+    release = threading.Event()
+    running = []
+
+    @offload.tool(limit=1)
+    def slow(i):
+        running.append(i)
+        release.wait(5)
+        return i
+
+    async def run():
+        calls = [asyncio.ensure_future(slow(i)) for i in range(3)]
+        await asyncio.sleep(0.05)
+        stats = offload.snapshot()["tools"]["slow"]
+        release.set()
+        return stats, await asyncio.gather(*calls)
+
+    stats, results = asyncio.run(run())
+    assert results == [0, 1, 2]
+    assert (stats["limit"], stats["running"], stats["queued"], stats["max_queued"]) == (1, 1, 2, 2)
+    assert running == [0, 1, 2]
+    final = offload.snapshot()["tools"]["slow"]
+    assert (final["calls"], final["running"], final["queued"]) == (3, 0, 0)
+    assert final["max_wait_ms"] > 0
+
+
+def test_errors_propagate_and_release_the_slot():
+    offload = Offloader(threads=2)
+
+    @offload.tool(limit=1)
+    def fail():
+        raise ValueError("boom")
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(ValueError, match="boom"):
+                await fail()
+
+    asyncio.run(run())
+    assert offload.snapshot()["tools"]["fail"]["running"] == 0
+
+
+def test_call_counts_against_a_named_tool():
+    offload = Offloader(threads=2)
+    assert asyncio.run(offload.call("sum", sum, [1, 2, 3])) == 6
+    snapshot = offload.snapshot()
+    assert snapshot["threads"] == 2
+    assert snapshot["tools"]["sum"]["limit"] is None
+    assert snapshot["tools"]["sum"]["calls"] == 1
+
+
+def test_threads_from_env(monkeypatch):
+    monkeypatch.setenv("OFFLOAD_THREADS", "3")
+    assert Offloader().threads == 3
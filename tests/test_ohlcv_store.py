@@ -0,0 +1,130 @@
+import json
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from tests.support import add_app_path
+
+add_app_path("app5")
+
+from ohlcv_store import OHLCVStore  # noqa: E402
+from quotes import CSVSource  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingSource(CSVSource):
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.calls = []
+
+    def history(self, ticker, period="1mo", start=None):
+        self.calls.append((ticker, period, start))
+        return super().history(ticker, period, start=start)
+
+
+def write_csv(directory, ticker, end, days):
+    # stale data: the last bar is long before today
+    index = pd.bdate_range(end=end, periods=days, name="Date")
+    close = [100.0 + i for i in range(days)]
+    frame = pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1000.0}, index=index)
+    frame.to_csv(directory / f"{ticker}.csv")
+    return frame
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def csv_dir(tmp_path):
+    directory = tmp_path / "csv"
+    directory.mkdir()
+    return directory
+
+
+@pytest.fixture
+def source(csv_dir):
+    return CountingSource(str(csv_dir))
+
+
+@pytest.fixture
+def store(tmp_path, source, clock):
+    return OHLCVStore(str(tmp_path / "store"), source, refresh_after=60, clock=clock)
+
+
+def assert_same_bars(got, want):
+    assert list(got.index) == list(want.index)
+    assert list(got["Close"]) == list(want["Close"])
+
+
+def test_short_then_long_request_on_stale_data(store, source, csv_dir):
+    write_csv(csv_dir, "AAPL", "2023-06-30", 800)
+    reference = CSVSource(str(csv_dir))
+    assert len(store.history("AAPL", "5d")) == 5
+    for period in ["1y", "2y", "6mo"]:
+        assert_same_bars(store.history("aapl", period), reference.history("AAPL", period))
+    # 1y and 2y each had to reach further back; 6mo was already covered
+    assert [call[1] for call in source.calls] == ["5d", "1y", "2y"]
+
+
+def test_covered_period_is_not_fetched_again(store, source, csv_dir):
+    write_csv(csv_dir, "AAPL", "2023-06-30", 800)
+    store.history("AAPL", "2y")
+    store.history("AAPL", "1y")
+    store.history("AAPL", "5d")
+    assert source.calls == [("AAPL", "2y", None)]
+
+
+def test_stale_store_appends_new_bars_and_rewrites_last(store, source, csv_dir, clock):
+    frame = write_csv(csv_dir, "AAPL", "2023-06-30", 300)
+    store.history("AAPL", "1y")
+    rows = json.loads((csv_dir.parent / "store" / "AAPL" / "meta.json").read_text())["rows"]
+
+    # the last stored bar was a partial day; two more sessions have closed since
+    newer = write_csv(csv_dir, "AAPL", "2023-07-04", 302)
+    newer.loc["2023-06-30", "Close"] = 1.0
+    newer.to_csv(csv_dir / "AAPL.csv")
+    assert store.history("AAPL", "1y").index[-1] == frame.index[-1]  # still fresh
+    clock.now = 60
+    hist = store.history("AAPL", "1y")
+
+    assert source.calls[-1] == ("AAPL", "1mo", pd.Timestamp("2023-06-30").date())
+    assert hist.index[-1] == pd.Timestamp("2023-07-04")
+    assert hist.loc["2023-06-30", "Close"] == 1.0
+    meta = json.loads((csv_dir.parent / "store" / "AAPL" / "meta.json").read_text())
+    assert meta["rows"] == rows + 2
+    assert meta["refreshed_at"] == 60
+
+
+def test_read_by_date_range(store, csv_dir):
+    frame = write_csv(csv_dir, "AAPL", "2023-06-30", 300)
+    store.history("AAPL", "max")
+    got = store.read("AAPL", start="2023-01-01", end="2023-01-31")
+    assert_same_bars(got, frame.loc["2023-01-01":"2023-01-31"])
+
+
+def test_start_before_stored_data_rewrites(store, source, csv_dir):
+    frame = write_csv(csv_dir, "AAPL", "2023-06-30", 800)
+    store.history("AAPL", "1mo")
+    hist = store.history("AAPL", start="2021-01-01")
+    assert_same_bars(hist, frame.loc["2021-01-01":])
+    assert store.history("AAPL", start="2022-01-01").index[0] == pd.Timestamp("2022-01-03")
+    assert len(source.calls) == 2
+
+
+def test_download_matches_history(store, csv_dir):
+    write_csv(csv_dir, "AAPL", "2023-06-30", 400)
+    write_csv(csv_dir, "MSFT", "2023-06-30", 400)
+    store.history("AAPL", "5d")
+    data = store.download(["aapl", "MSFT"], "1y")
+    for ticker in ["AAPL", "MSFT"]:
+        assert_same_bars(data.xs(ticker, axis=1, level=1).dropna(how="all"), store.history(ticker, "1y"))
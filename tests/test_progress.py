@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from tests.support import add_app_path, load_module
+
+add_app_path("app2")
+
+server = load_module("app2_server", "app2", "server.py")
+client = load_module("app2_client", "app2", "client.py")
+
+
+class FakeContext:
+    def __init__(self):
+        self.progress = []
+
+    async def report_progress(self, progress, total=None, message=None):
+        self.progress.append((progress, total, message))
+
+
+def test_weather_reports_progress_before_result(monkeypatch):
+    async def fetch_weather(location):
+        return f"The weather in {location} is sunny, 25°C."
+
+    monkeypatch.setattr(server, "fetch_weather", fetch_weather)
+    ctx = FakeContext()
+    content, structured = asyncio.run(server.weather.fn("Paris", ctx=ctx))
+    assert ctx.progress == [
+        (1, 2, "Fetching the weather for Paris..."),
+        (2, 2, "The weather in Paris is sunny, 25°C."),
+    ]
+    assert content[0].text == structured["report"] == "The weather in Paris is sunny, 25°C."
+
+
+def test_stream_count_reports_each_chunk():
+    ctx = FakeContext()
+    content, structured = asyncio.run(server.stream_count.fn(3, ctx=ctx))
+    assert ctx.progress == [(1, 3, "Count: 1"), (2, 3, "Count: 2"), (3, 3, "Count: 3")]
+    assert [block.text for block in content] == ["Count: 1", "Count: 2", "Count: 3"]
+    assert structured == {"counted_to": 3}
+
+
+def test_progress_printer_prints_chunks_as_they_arrive(capsys):
+    on_progress = client.progress_printer()
+
+    async def run():
+        await on_progress(1, 2, "Count: 1")
+        first = capsys.readouterr().out
+        await on_progress(1.5, 2, None)  # progress without text is not shown
+        await on_progress(2, 2, "Count: 2")
+        return first, capsys.readouterr().out
+
+    first, rest = asyncio.run(run())
+    assert first == "\n--- Human-readable output ---\nCount: 1\n"
+    assert rest == "Count: 2\n"
+    assert on_progress.chunks == ["Count: 1", "Count: 2"]
+
+
+def test_streamed_text_is_not_repeated(capsys):
+    content, structured = server.echo_reply("hi")
+    asyncio.run(client.display_tool_result((content, structured), streamed=["Echo: hi"]))
+    assert capsys.readouterr().out == "\n--- Structured data ---\n{'message': 'hi'}\n"
@@ -0,0 +1,173 @@
+import asyncio
+import threading
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from tests.support import add_app_path
+
+add_app_path("app5")
+
+from quotes import QuoteCache, quote_summary, slice_period  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def bars(end="2024-06-28", days=300, close=100.0):
+    index = pd.bdate_range(end=end, periods=days, name="Date")
+    frame = pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1000.0}, index=index)
+    frame["Close"] += range(days)
+    return frame
+
+
+class SlowSource:
+    """Counts upstream calls; each one blocks until `release` is set."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def history(self, ticker, period="1mo", start=None):
+        self.calls.append(("history", ticker, period))
+        self.release.wait(5)
+        return slice_period(bars(), period)
+
+    def download(self, tickers, period="1mo", start=None):
+        self.calls.append(("download", tuple(tickers), period))
+        self.release.wait(5)
+        frames = {ticker: slice_period(bars(), period) for ticker in tickers}
+        return pd.concat(frames, axis=1).swaplevel(axis=1).sort_index(axis=1)
+
+
+@pytest.fixture
+def source():
+    return SlowSource()
+
+
+def test_concurrent_requests_share_one_fetch(source):
+    cache = QuoteCache(source)
+
+    async def run():
+        waiters = [asyncio.ensure_future(cache.history("aapl", "1mo")) for _ in range(10)]
+        await asyncio.sleep(0.05)
+        source.release.set()
+        return await asyncio.gather(*waiters)
+
+    results = asyncio.run(run())
+    assert source.calls == [("history", "AAPL", "1mo")]
+    assert all(result is results[0] for result in results)
+    assert (cache.fetches, cache.misses, cache.hits) == (1, 10, 0)
+
+
+def test_cancelled_caller_does_not_cancel_shared_fetch(source):
+    cache = QuoteCache(source)
+
+    async def run():
+        first = asyncio.ensure_future(cache.history("AAPL", "5d"))
+        second = asyncio.ensure_future(cache.history("AAPL", "5d"))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        source.release.set()
+        return await second
+
+    assert len(asyncio.run(run())) == 5
+    assert len(source.calls) == 1
+
+
+def test_entries_expire_by_period_ttl(source):
+    source.release.set()
+    clock = Clock()
+    cache = QuoteCache(source, ttls={"1d": 60, "1y": 3600}, clock=clock)
+
+    async def run():
+        await cache.history("AAPL", "1d")
+        await cache.history("AAPL", "1y")
+        clock.now = 61
+        await cache.history("AAPL", "1d")
+        await cache.history("AAPL", "1y")
+
+    asyncio.run(run())
+    assert [call[2] for call in source.calls] == ["1d", "1y", "1d"]
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_histories_batches_only_missing_tickers(source):
+    source.release.set()
+    cache = QuoteCache(source)
+
+    async def run():
+        await cache.history("AAPL", "1mo")
+        return await cache.histories(["aapl", "MSFT", "GOOG", "msft"], "1mo")
+
+    frames = asyncio.run(run())
+    assert list(frames) == ["AAPL", "MSFT", "GOOG"]
+    assert source.calls[1] == ("download", ("MSFT", "GOOG"), "1mo")
+    assert len(source.calls) == 2
+    assert frames["MSFT"]["Close"].iloc[-1] == bars()["Close"].iloc[-1]
+
+
+def test_histories_joins_inflight_single_fetch(source):
+    cache = QuoteCache(source)
+
+    async def run():
+        single = asyncio.ensure_future(cache.history("AAPL", "1mo"))
+        await asyncio.sleep(0)
+        batch = asyncio.ensure_future(cache.histories(["AAPL", "MSFT"], "1mo"))
+        await asyncio.sleep(0.05)
+        source.release.set()
+        return await single, await batch
+
+    single, batch = asyncio.run(run())
+    assert batch["AAPL"] is single
+    assert sorted(source.calls) == [("download", ("MSFT",), "1mo"), ("history", "AAPL", "1mo")]
+
+
+def test_batch_failure_reaches_every_waiter():
+    class Failing:
+        def download(self, tickers, period="1mo", start=None):
+            raise ConnectionError("upstream down")
+
+    cache = QuoteCache(Failing())
+    with pytest.raises(ConnectionError):
+        asyncio.run(cache.histories(["AAPL", "MSFT"]))
+    assert cache._inflight == {}
+
+
+def test_latest_close_without_data_raises():
+    class Empty:
+        def history(self, ticker, period="1mo", start=None):
+            return pd.DataFrame(columns=["Close"])
+
+    with pytest.raises(LookupError, match="ZZZZ"):
+        asyncio.run(QuoteCache(Empty()).latest_close("zzzz"))
+
+
+def test_quote_summary_per_ticker_over_different_calendars():
+    aapl = bars(end="2024-06-28", days=5)
+    msft = bars(end="2024-06-27", days=3, close=200.0)  # no bar on the last day
+    summary = quote_summary({"AAPL": aapl, "MSFT": msft, "GONE": aapl.iloc[0:0]})
+    assert list(summary.index) == ["AAPL", "MSFT"]
+    assert summary.loc["AAPL", ["price", "previous_close", "change"]].tolist() == [104.0, 103.0, 1.0]
+    assert summary.loc["AAPL", "change_pct"] == pytest.approx(100 / 103)
+    assert summary.loc["MSFT", ["price", "previous_close", "date"]].tolist() == [202.0, 201.0, "2024-06-27"]
+
+
+def test_quote_summary_keeps_nan_fields():
+    hist = bars(days=3)
+    hist.loc[hist.index[-1], "Volume"] = float("nan")
+    single = bars(days=1)
+    summary = quote_summary({"HALT": hist, "NEW": single})
+    assert summary.loc["HALT", "price"] == 102.0
+    assert pd.isna(summary.loc["HALT", "volume"])
+    assert pd.isna(summary.loc["NEW", "previous_close"]) and pd.isna(summary.loc["NEW", "change"])
+
+
+def test_quote_summary_without_data():
+    assert quote_summary({"A": bars().iloc[0:0]}).empty
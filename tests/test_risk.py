@@ -0,0 +1,57 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from tests.support import add_app_path
+
+add_app_path("app5")
+
+from risk import portfolio_risk_report  # noqa: E402
+
+
+def frames(days=250, seed=3):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end="2024-06-28", periods=days, name="Date")
+    common = rng.normal(0, 0.01, days)
+    return {
+        ticker: pd.DataFrame({"Close": 100 * np.exp(np.cumsum(common + rng.normal(0, noise, days)))}, index=index)
+        for ticker, noise in [("AAPL", 0.01), ("MSFT", 0.005)]
+    }
+
+
+HOLDINGS = {"AAPL": 6000.0, "MSFT": 4000.0}
+
+
+@pytest.mark.parametrize("confidence", [0, 1, 1.5, -0.2, 95])
+def test_confidence_must_be_a_probability(confidence):
+    with pytest.raises(ValueError, match="confidence must be between 0 and 1"):
+        portfolio_risk_report(frames(), HOLDINGS, confidence=confidence)
+
+
+@pytest.mark.parametrize("horizon_days", [0, -1])
+def test_horizon_must_be_positive(horizon_days):
+    with pytest.raises(ValueError, match="horizon_days must be at least 1"):
+        portfolio_risk_report(frames(), HOLDINGS, horizon_days=horizon_days)
+
+
+@pytest.mark.parametrize("days, horizon_days", [(2, 1), (10, 9), (10, 20)])
+def test_short_history_is_reported_not_indexerror(days, horizon_days):
+    with pytest.raises(ValueError, match="Not enough overlapping price history"):
+        portfolio_risk_report(frames(days), HOLDINGS, horizon_days=horizon_days)
+
+
+def test_report_is_consistent():
+    report = portfolio_risk_report(frames(), HOLDINGS, confidence=0.99, horizon_days=10)
+    assert report["observations"] == 249
+    assert report["total_value"] == 10000.0
+    assert [asset["weight"] for asset in report["assets"]] == [0.6, 0.4]
+    assert sum(asset["risk_contribution_pct"] for asset in report["assets"]) == pytest.approx(100, abs=1e-3)
+    assert report["historical_es"]["pct"] >= report["historical_var"]["pct"] > 0
+    assert report["parametric_es"]["pct"] >= report["parametric_var"]["pct"] > 0
+    assert 0 < report["average_correlation"] < 1
+
+
+def test_shortest_history_for_horizon():
+    report = portfolio_risk_report(frames(12), HOLDINGS, horizon_days=10)
+    assert report["observations"] == 11
@@ -0,0 +1,84 @@
+import math
+
+import pytest
+
+from common import safe_eval
+from common.safe_eval import UnsafeExpression, compile_expression, evaluate, evaluate_many
+
+
+def test_arithmetic_and_functions():
+    assert evaluate("2 * (3 + 4) ** 2") == 98
+    assert evaluate("sqrt(x) + 1", x=16) == 5.0
+    assert evaluate("max(1, 7, 3) - min(4, 2)") == 5
+    assert evaluate("2 * pi") == 2 * math.pi
+    assert evaluate("2 ** -1") == 0.5
+
+
+def test_whitespace_variants_share_one_compiled_expression():
+    assert compile_expression("1 +  2") is compile_expression(" 1 + 2 ")
+
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os')",
+    "().__class__",
+    "x.real",
+    "[1, 2]",
+    "'a' * 3",
+    "True + 1",
+    "open('f')",
+    "round(2.5, ndigits=1)",
+    "_secret + 1",
+    "lambda: 1",
+    "1 if 2 else 3",
+])
+def test_rejects_unsafe_syntax(expression):
+    with pytest.raises(UnsafeExpression):
+        evaluate(expression, x=1)
+
+
+def test_invalid_and_missing():
+    with pytest.raises(UnsafeExpression, match="Invalid expression"):
+        evaluate("2 +")
+    with pytest.raises(UnsafeExpression, match="Missing value for y"):
+        evaluate("x + y", x=1)
+
+
+def test_huge_integer_powers_are_refused():
+    with pytest.raises(UnsafeExpression, match="Exponent too large"):
+        evaluate("9 ** 9 ** 9")
+    assert evaluate("2 ** 64") == 2 ** 64
+    assert evaluate("1 ** 10000000") == 1
+
+
+def test_many_matches_scalar():
+    columns = {"a": [1, 2, 3, 4], "b": [0.5, -1, 2, 3]}
+    expected = [evaluate("a * b + sqrt(a) - max(a, b) ** 2", a=a, b=b) for a, b in zip(*columns.values())]
+    assert evaluate_many("a * b + sqrt(a) - max(a, b) ** 2", **columns) == pytest.approx(expected)
+
+
+def test_many_negative_and_fractional_powers():
+    assert evaluate_many("2 ** -x", x=[1, 2, 3]) == [0.5, 0.25, 0.125]
+    assert evaluate_many("x ** -1 + 2 ** -2", x=[1, 4]) == [1.25, 0.5]
+    assert evaluate_many("x ** 0.5", x=[4, 9]) == [2.0, 3.0]
+
+
+def test_many_huge_powers_overflow_to_inf():
+    pytest.importorskip("numpy")
+    assert evaluate_many("x ** 9 ** 9", x=[10]) == [math.inf]
+    assert evaluate_many("9 ** 9 ** 9", x=[1, 2]) == [math.inf, math.inf]
+
+
+def test_many_broadcasts_constants_and_checks_lengths():
+    assert evaluate_many("1 + 1", x=[1, 2, 3]) == [2.0, 2.0, 2.0]
+    assert evaluate_many("3 * 3") == [9.0]
+    with pytest.raises(UnsafeExpression, match="same length"):
+        evaluate_many("a + b", a=[1, 2], b=[1])
+    with pytest.raises(UnsafeExpression, match="Missing value for b"):
+        evaluate_many("a + b", a=[1, 2])
+
+
+def test_many_without_numpy_loops_rows(monkeypatch):
+    monkeypatch.setattr(safe_eval, "np", None)
+    assert evaluate_many("a ** 2 + b", a=[1, 2], b=[10, 20]) == [11, 24]
+    with pytest.raises(UnsafeExpression, match="Exponent too large"):
+        evaluate_many("a ** 9 ** 9", a=[9])
@@ -0,0 +1,104 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from tests.support import add_app_path
+
+add_app_path("app5")
+
+import schedules  # noqa: E402
+
+
+def loop_amortization(principal, rate, periods, per_year):
+    """Period-by-period reference schedule."""
+    r = rate / 100 / per_year
+    payment = principal / periods if r == 0 else principal * r / (1 - (1 + r) ** -periods)
+    balance, rows = principal, []
+    for _ in range(periods):
+        interest = balance * r
+        balance -= payment - interest
+        rows.append((interest, payment - interest, balance))
+    return payment, np.array(rows)
+
+
+def loop_compound(principal, rate, periods, per_year, contribution):
+    r = rate / 100 / per_year
+    balance, rows = principal, []
+    for _ in range(periods):
+        balance = balance * (1 + r) + contribution
+        rows.append(balance)
+    return np.array(rows)
+
+
+@pytest.mark.parametrize("rate, years, per_year", [(6.0, 30, 12), (0.0, 5, 12), (4.5, 2.5, 4), (12.0, 1, 52)])
+def test_amortization_matches_loop(rate, years, per_year):
+    schedule = schedules.amortization(1000.0, np.array([rate]), np.array([years], dtype=float), per_year)
+    payment, rows = loop_amortization(1000.0, rate, int(round(years * per_year)), per_year)
+    assert schedule["payment"][0] == pytest.approx(payment)
+    np.testing.assert_allclose(schedule["interest"][0], rows[:, 0], atol=1e-8)
+    np.testing.assert_allclose(schedule["principal"][0], rows[:, 1], atol=1e-8)
+    np.testing.assert_allclose(schedule["balance"][0], rows[:, 2], atol=1e-6)
+    assert schedule["balance"][0][-1] == 0.0
+
+
+def test_shorter_terms_are_masked():
+    rates, years = schedules.scenarios([5.0, 7.0], [1, 2])
+    schedule = schedules.amortization(1000.0, rates, years, 12)
+    assert schedule["periods"].tolist() == [12, 24, 12, 24]
+    assert np.isnan(schedule["balance"][0, 12:]).all()
+    assert not np.isnan(schedule["balance"][1]).any()
+
+
+def test_amortization_summary_matches_schedules():
+    rates, years = schedules.scenarios([0.0, 3.0, 6.5], [10, 15, 30])
+    summary = schedules.amortization_summary(250_000.0, rates, years, 12)
+    schedule = schedules.amortization(250_000.0, rates, years, 12)
+    for row, n, interest in zip(summary, schedule["periods"], np.nansum(schedule["interest"], axis=1)):
+        payment, _ = loop_amortization(250_000.0, row["rate"], n, 12)
+        assert row["payment"] == round(payment, 2)
+        assert row["total_interest"] == pytest.approx(interest, abs=0.05)
+        assert row["total_paid"] == pytest.approx(250_000.0 + interest, abs=0.05)
+    assert summary[0] == {"rate": 0.0, "years": 10.0, "payment": 2083.33, "total_interest": 0.0, "total_paid": 250000.0}
+
+
+@pytest.mark.parametrize("rate, contribution", [(5.0, 0.0), (7.0, 100.0), (0.0, 50.0)])
+def test_compound_matches_loop(rate, contribution):
+    schedule = schedules.compound(1000.0, np.array([rate]), np.array([10.0]), 12, contribution)
+    expected = loop_compound(1000.0, rate, 120, 12, contribution)
+    np.testing.assert_allclose(schedule["balance"][0], expected)
+    (row,) = schedules.compound_summary(1000.0, np.array([rate]), np.array([10.0]), 12, contribution)
+    assert row["final_balance"] == round(expected[-1], 2)
+    assert row["contributed"] == 1000.0 + contribution * 120
+    assert row["interest_earned"] == pytest.approx(expected[-1] - row["contributed"], abs=0.01)
+
+
+def test_yearly_rows_sum_flows_and_keep_last_balance():
+    schedule = schedules.amortization(1200.0, np.array([0.0]), np.array([2.5]), 12)
+    columns = {"interest": (schedule["interest"][0], "sum"), "balance": (schedule["balance"][0], "last")}
+    rows = schedules.schedule_rows(columns, 30, 12, "yearly")
+    assert rows == [
+        {"year": 1, "interest": 0.0, "balance": 720.0},
+        {"year": 2, "interest": 0.0, "balance": 240.0},
+        {"year": 3, "interest": 0.0, "balance": 0.0},
+    ]
+
+
+def test_pages():
+    rows = list(range(50))
+    assert schedules.page(rows, 1, 24) == {"page": 1, "pages": 3, "rows": rows[:24]}
+    assert schedules.page(rows, 9, 24)["rows"] == rows[48:]
+    assert schedules.page([], 1, 24) == {"page": 1, "pages": 1, "rows": []}
+    with pytest.raises(ValueError, match="page_size"):
+        schedules.page(rows, 1, 0)
+
+
+def test_oversized_grids_are_rejected_before_building():
+    too_many = schedules.MAX_SCENARIOS + 1
+    with pytest.raises(ValueError, match="scenarios"):
+        schedules.scenarios(np.linspace(1, 10, too_many).tolist(), [30])
+    with pytest.raises(ValueError, match="at most"):
+        schedules.amortization_summary(1000.0, np.array([5.0]), np.array([100.0]), 365)
+    with pytest.raises(ValueError, match="at most"):
+        schedules.compound(1000.0, np.array([5.0]), np.array([float("inf")]), 12)
+    with pytest.raises(ValueError, match="at least one period"):
+        schedules.amortization(1000.0, np.array([5.0]), np.array([0.01]), 12)
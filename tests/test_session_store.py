@@ -0,0 +1,112 @@
+import atexit
+import sys
+
+import pytest
+
+from common.session_store import SessionStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_ring_buffer_keeps_newest_messages(clock):
+    store = SessionStore(max_messages=3, clock=clock)
+    assert store.append("s", "1", "2") == 2
+    assert store.append("s", "3", "4", "5") == 5
+    assert store.history("s") == ["3", "4", "5"]
+    assert store.count("s") == 5
+    assert store.bytes == sum(map(sys.getsizeof, ["3", "4", "5"]))
+
+
+@pytest.mark.parametrize("max_messages", [0, -1])
+def test_max_messages_must_be_positive(max_messages):
+    with pytest.raises(ValueError, match="max_messages must be at least 1"):
+        SessionStore(max_messages=max_messages)
+
+
+def test_idle_sessions_expire(clock):
+    store = SessionStore(idle_ttl=10, clock=clock)
+    store.append("old", "a")
+    clock.now = 5
+    store.append("new", "b")
+    clock.now = 11
+    store.history("new")
+    assert store.stats()["sessions"] == 1
+    assert store.evictions == {"ttl": 1, "memory": 0}
+    assert store.history("old") == []
+
+
+def test_least_recently_used_sessions_evicted_over_budget(clock):
+    size = sys.getsizeof("x" * 100)
+    store = SessionStore(max_bytes=size * 2, clock=clock)
+    store.append("a", "x" * 100)
+    store.append("b", "y" * 100)
+    store.history("a")  # b is now least recently used
+    store.append("c", "z" * 100)
+    assert store.stats()["sessions"] == 2
+    assert store.evictions["memory"] == 1
+    assert store.history("a") == ["x" * 100]
+    assert store.history("b") == []
+
+
+def test_single_session_over_budget_keeps_newest(clock):
+    size = sys.getsizeof("x" * 100)
+    store = SessionStore(max_bytes=size * 2, clock=clock)
+    store.append("a", "1" * 100, "2" * 100, "3" * 100)
+    assert store.history("a") == ["2" * 100, "3" * 100]
+    assert store.bytes == size * 2
+
+
+def test_evicted_sessions_spill_and_load_back(tmp_path, clock):
+    store = SessionStore(max_messages=2, idle_ttl=10, spill_path=str(tmp_path / "spill.db"), clock=clock)
+    store.append("s", "1", "2", "3")
+    clock.now = 11
+    store.history("other")
+    assert store.stats()["spilled_sessions"] == 1
+    assert store.history("s") == ["2", "3"]
+    assert store.count("s") == 3
+    assert store.stats()["spilled_sessions"] == 0
+    store.clear("s")
+    assert store.history("s") == []
+    store.close()
+
+
+def test_close_spills_sessions_in_memory(tmp_path, clock):
+    path = str(tmp_path / "spill.db")
+    store = SessionStore(spill_path=path, clock=clock)
+    store.append("s", "hello")
+    store.close()
+    store.close()  # closing twice is harmless
+    reopened = SessionStore(spill_path=path, clock=clock)
+    assert reopened.history("s") == ["hello"]
+    reopened.close()
+
+
+def test_spilling_store_closes_at_exit(tmp_path, monkeypatch):
+    registered, unregistered = [], []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    monkeypatch.setattr(atexit, "unregister", unregistered.append)
+    SessionStore()
+    assert registered == []
+    store = SessionStore(spill_path=str(tmp_path / "spill.db"))
+    assert registered == [store.close]
+    store.close()
+    assert unregistered == [store.close]
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("CHAT_HISTORY_MAX_MESSAGES", "5")
+    monkeypatch.setenv("CHAT_SESSION_TTL", "30")
+    monkeypatch.delenv("CHAT_HISTORY_SPILL", raising=False)
+    store = SessionStore.from_env()
+    assert (store.max_messages, store.idle_ttl, store._db) == (5, 30.0, None)
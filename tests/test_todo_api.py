@@ -0,0 +1,189 @@
+import base64
+import json
+import os
+
+import pytest
+
+from tests.support import add_app_path
+
+pytest.importorskip("flask_sqlalchemy")
+os.environ["TODO_DATABASE_URI"] = "sqlite://"  # in memory; never the apps' own todos.db
+
+add_app_path("app3")
+add_app_path("app7")
+
+import api as app3_api  # noqa: E402
+import flask_api as app7_api  # noqa: E402
+from common.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor  # noqa: E402
+
+
+@pytest.fixture(params=[app3_api, app7_api], ids=["app3", "app7"])
+def module(request):
+    return request.param
+
+
+@pytest.fixture
+def client(module):
+    with module.app.app_context():
+        module.Todo.query.delete()
+        module.db.session.commit()
+    return module.app.test_client()
+
+
+def add(client, *tasks):
+    return [client.post("/tasks", json={"task": task}).get_json()["id"] for task in tasks]
+
+
+def test_unpaginated_list_keeps_the_original_shape(client):
+    ids = add(client, *[f"task {i}" for i in range(DEFAULT_PAGE_SIZE + 5)])
+    body = client.get("/tasks").get_json()
+    assert isinstance(body, list)
+    assert [task["id"] for task in body] == ids
+
+
+def test_pages_follow_the_cursor_to_the_end(client):
+    ids = add(client, *[f"task {i}" for i in range(7)])
+    seen, cursor = [], None
+    while True:
+        query = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/tasks", query_string=query).get_json()
+        seen += [task["id"] for task in body["tasks"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ids
+
+
+def test_filters_and_fields(client):
+    first, second = add(client, "a", "b")
+    client.put(f"/tasks/{second}", json={"done": True})
+    body = client.get("/tasks", query_string={"limit": 10, "done": "true", "fields": "task"}).get_json()
+    assert body == {"tasks": [{"id": second, "task": "b"}], "next_cursor": None}
+    assert client.get("/tasks", query_string={"done": "false"}).get_json() == [{"id": first, "task": "a", "done": False}]
+
+
+def test_limit_is_capped(client):
+    add(client, *[f"t{i}" for i in range(MAX_PAGE_SIZE + 1)])
+    body = client.get("/tasks", query_string={"limit": 10_000}).get_json()
+    assert len(body["tasks"]) == MAX_PAGE_SIZE and body["next_cursor"]
+
+
+@pytest.mark.parametrize("query", [
+    {"cursor": "not-a-cursor"},
+    {"done": "maybe"},
+    {"fields": "id,owner"},
+    {"limit": "abc"},
+    {"limit": "0"},
+    {"limit": "-5"},
+    {"limit": ""},
+])
+def test_bad_arguments_are_rejected(client, query):
+    response = client.get("/tasks", query_string=query)
+    assert response.status_code == 400 and "error" in response.get_json()
+
+
+def test_cursor_helpers_round_trip():
+    cursor = encode_cursor(id=42)
+    assert decode_cursor(cursor)["id"] == 42
+    assert json.loads(base64.urlsafe_b64decode(cursor)) == {"id": 42}
+    assert decode_cursor(encode_cursor(rank=-1.5, id=3)) == {"rank": -1.5, "id": 3}
+
+
+@pytest.fixture
+def app7_client():
+    with app7_api.app.app_context():
+        app7_api.Todo.query.delete()
+        app7_api.db.session.commit()
+    return app7_api.app.test_client()
+
+
+def test_bulk_add_update_delete(app7_client):
+    created = app7_client.post("/tasks/bulk", json={"tasks": ["a", {"task": "b"}]})
+    assert created.status_code == 201
+    ids = [task["id"] for task in created.get_json()]
+
+    updated = app7_client.put("/tasks/bulk", json={"tasks": [{"id": ids[0], "done": True}, {"id": ids[1], "task": "B"}]})
+    assert [(task["task"], task["done"]) for task in updated.get_json()] == [("a", True), ("B", False)]
+
+    deleted = app7_client.delete("/tasks/bulk", json={"ids": ids})
+    assert deleted.get_json()["deleted"] == 2
+    assert app7_client.get("/tasks").get_json() == []
+
+
+def test_bulk_changes_nothing_when_an_id_is_missing(app7_client):
+    (task_id,) = [task["id"] for task in app7_client.post("/tasks/bulk", json={"tasks": ["keep"]}).get_json()]
+    response = app7_client.put("/tasks/bulk", json={"tasks": [{"id": task_id, "done": True}, {"id": task_id + 99}]})
+    assert response.status_code == 404 and response.get_json()["missing"] == [task_id + 99]
+    response = app7_client.delete("/tasks/bulk", json={"ids": [task_id, task_id + 99]})
+    assert response.status_code == 404
+    assert app7_client.get("/tasks").get_json() == [{"id": task_id, "task": "keep", "done": False}]
+
+
+@pytest.mark.parametrize("method, body", [
+    ("post", {"tasks": []}),
+    ("post", {"tasks": [""]}),
+    ("put", {"tasks": [{"task": "no id"}]}),
+    ("put", {"tasks": [{"id": True, "done": True}]}),
+    ("put", {"tasks": [{"id": 1, "task": ""}]}),
+    ("put", {"tasks": [{"id": 1, "task": 7}]}),
+    ("put", {"tasks": [{"id": 1, "task": None}]}),
+    ("put", {"tasks": [{"id": 1, "done": "yes"}]}),
+    ("put", {"tasks": [{"id": 1, "done": None}]}),
+    ("delete", {"ids": ["1"]}),
+    ("delete", {"ids": [True]}),
+    ("delete", None),
+])
+def test_bulk_rejects_malformed_bodies(app7_client, method, body):
+    app7_client.post("/tasks/bulk", json={"tasks": ["keep"]})
+    before = app7_client.get("/tasks").get_json()
+    response = getattr(app7_client, method)("/tasks/bulk", json=body)
+    assert response.status_code == 400
+    assert app7_client.get("/tasks").get_json() == before
+
+
+def search(client, q, **params):
+    return client.get("/tasks", query_string={"q": q, **params}).get_json()
+
+
+def test_search_matches_word_prefixes_and_follows_updates(app7_client):
+    if not app7_api.fts_enabled:
+        pytest.skip("SQLite built without FTS5")
+    milk, report, _ = [task["id"] for task in app7_client.post(
+        "/tasks/bulk", json={"tasks": ["buy milk", "write the report", "walk dog"]}).get_json()]
+    assert [task["id"] for task in search(app7_client, "rep")] == [report]
+    assert [task["id"] for task in search(app7_client, "Buy MILK!")] == [milk]
+    assert search(app7_client, "milk report") == []  # every word has to match
+
+    app7_client.put(f"/tasks/{milk}", json={"task": "buy bread"})
+    assert search(app7_client, "milk") == []
+    assert [task["id"] for task in search(app7_client, "bread")] == [milk]
+    app7_client.delete(f"/tasks/{milk}")
+    assert search(app7_client, "bread") == []
+
+
+def test_search_pages_by_rank(app7_client):
+    if not app7_api.fts_enabled:
+        pytest.skip("SQLite built without FTS5")
+    app7_client.post("/tasks/bulk", json={"tasks": [f"team sync {'team ' * (i % 3)}{i}" for i in range(7)] + ["other"]})
+    everything = [task["id"] for task in search(app7_client, "team")]
+    seen, cursor = [], None
+    while True:
+        body = search(app7_client, "team", limit=3, **({"cursor": cursor} if cursor else {}))
+        seen += [task["id"] for task in body["tasks"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == everything and len(seen) == 7
+
+
+def test_search_rejects_a_list_cursor(app7_client):
+    if not app7_api.fts_enabled:
+        pytest.skip("SQLite built without FTS5")
+    response = app7_client.get("/tasks", query_string={"q": "x", "cursor": app7_api.encode_cursor(id=1)})
+    assert response.status_code == 400
+
+
+def test_search_falls_back_to_ilike_without_fts(app7_client, monkeypatch):
+    monkeypatch.setattr(app7_api, "fts_enabled", False)
+    app7_client.post("/tasks/bulk", json={"tasks": ["reporting", "other"]})
+    assert [task["task"] for task in search(app7_client, "port")] == ["reporting"]
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from common.tool_cache import MISSING, ToolResultCache
+from tests.support import load_module
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(clock):
+    return ToolResultCache({"list_todos": 5, "calculate": 60}, {"add_todo": ["list_todos"]}, clock=clock)
+
+
+def test_hit_until_ttl_expires(cache, clock):
+    value, epoch = cache.lookup("list_todos", {"query": "a"})
+    assert value is MISSING
+    cache.put("list_todos", {"query": "a"}, ["task"], epoch)
+    assert cache.lookup("list_todos", {"query": "a"})[0] == ["task"]
+    clock.now = 5.0
+    assert cache.lookup("list_todos", {"query": "a"})[0] is MISSING
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_key_ignores_argument_order(cache):
+    cache.put("calculate", {"a": 1, "b": 2}, "3")
+    assert cache.lookup("calculate", {"b": 2, "a": 1})[0] == "3"
+
+
+def test_uncached_tools_are_never_stored(cache):
+    cache.put("add_todo", {"task": "x"}, "ok")
+    assert cache.lookup("add_todo", {"task": "x"})[0] is MISSING
+    assert len(cache) == 0
+
+
+def test_mutation_invalidates_targets_only(cache):
+    cache.put("list_todos", {}, ["a"])
+    cache.put("calculate", {"e": "1+1"}, "2")
+    cache.invalidate("add_todo")
+    assert cache.lookup("list_todos", {})[0] is MISSING
+    assert cache.lookup("calculate", {"e": "1+1"})[0] == "2"
+
+
+def test_fill_started_before_invalidation_is_dropped(cache):
+    _, epoch = cache.lookup("list_todos", {})
+    cache.invalidate("add_todo")
+    cache.put("list_todos", {}, ["stale"], epoch)
+    assert cache.lookup("list_todos", {})[0] is MISSING
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    cache = ToolResultCache({"calculate": 60}, max_entries=2, clock=clock)
+    for expression in ("1", "2"):
+        cache.put("calculate", {"e": expression}, expression)
+    cache.lookup("calculate", {"e": "1"})
+    cache.put("calculate", {"e": "3"}, "3")
+    assert cache.lookup("calculate", {"e": "2"})[0] is MISSING
+    assert cache.lookup("calculate", {"e": "1"})[0] == "1"
+
+
+def test_client_invalidates_when_mutation_fails_in_flight(cache):
+    # loaded from its file: the app package's __init__ builds the whole Flask app
+    MCPClientWrapper = load_module("app7_mcp_client", "app7", "app", "services", "mcp_client.py").MCPClientWrapper
+
+    class Session:
+        async def call_tool(self, tool_name, params):
+            raise TimeoutError("applied on the server, but the reply was lost")
+
+    client = MCPClientWrapper(cache=cache)
+    client.session = Session()
+    cache.put("list_todos", {}, ["stale"])
+    with pytest.raises(TimeoutError):
+        asyncio.run(client.call_tool("add_todo", {"task": "x"}))
+    assert cache.lookup("list_todos", {})[0] is MISSING